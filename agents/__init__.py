@@ -0,0 +1,19 @@
+"""
+Phase agents for the multi-agent flow (engine/flows/multi_agent.py).
+
+One module per phase, named ``phase<N>_<slug>.py``; engine/phase_agents.py
+finds them by file name and imports each on first use. A module defines:
+
+    PHASE_ID            int, the phase number
+    PHASE_NAME          shown to the coordinator
+    PHASE_PROMPT        the phase guide appended to the shared system prompt
+    RUBRIC              optional, what the evaluator scores the phase on
+    PROFILE             optional, llm.chat options for this phase (model, temperature, max_tokens, ...)
+    EVALUATE_EACH_TURN  optional, score every turn alongside the reply instead of on Next Phase
+    REQUIRED_FIELDS, MIN_TURNS, MAX_TURNS, ENDS_ON
+                        optional, when the phase is complete in unattended sessions (engine/completion.py)
+    is_complete(state, messages)
+                        optional, True / False / None (can't tell) from this phase's messages
+    run_phase(messages, profile)
+                        optional, replaces the default ``llm.chat(messages, **profile)`` call
+"""
@@ -4,16 +4,26 @@
 PHASE_ID = 1
 PHASE_NAME = "Greeting & Rapport"
 PHASE_PROMPT = (
-    "You are the Phase-1 agent (Greeting & Rapport) for Shiksha Mitra."
-    " Always be warm and friendly. Goal: establish rapport, check audio/video comfort,"
-    " do light small talk (location/day), reassure this is casual. Ask ONE question at a time."
-    " End phase only when you have at least one clear volunteer response and the volunteer seems comfortable."
+    "Goalis to develop a rapport with the volunteer getting screened, start with a Warm greeting, "
+    "understan if they are comfortable,have a light small talk (location/how their day is going/are "
+    "they comfortable). Reassure them that 'this is a casual'. Ask one thing at a time, try to wrap "
+    "up the conversation with 4 or 5 questions."
 )
+RUBRIC = "Rate comfort, clarity, and engagement (1-5)."
+PROFILE = {"temperature": 0.8, "max_tokens": 200}
 
-def run_phase(client, model, history):
-    # history: list of {'role':..,'content':..}
-    messages = [{"role":"system","content":PHASE_PROMPT}] + history
-    reply, raw = chat_completion(client, model, messages)
-    # simple heuristic: include phase_complete tag text for controller to parse
-    # we'll format an answer asking next question; controller will decide to advance
-    return {"reply": reply, "phase_complete": False, "raw": raw}
\ No newline at end of file
+DISCOMFORT = ("can't hear", "cannot hear", "not comfortable", "uncomfortable", "nervous", "breaking up")
+MIN_REPLIES = 3
+REQUIRED_FIELDS = ("name",)
+MIN_TURNS = 2
+MAX_TURNS = 5
+
+
+def is_complete(state, messages):
+    # End phase only when there is at least one clear volunteer response and the volunteer seems comfortable
+    replies = [m["content"].lower() for m in messages if m["role"] == "user"]
+    if any(word in reply for reply in replies[-2:] for word in DISCOMFORT):
+        return False
+    if len(replies) >= MIN_REPLIES and any(len(reply.split()) >= 3 for reply in replies):
+        return True
+    return None
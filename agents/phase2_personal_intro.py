@@ -0,0 +1,15 @@
+# ----------------------------
+# File: agents/phase2_personal_intro.py
+# ----------------------------
+PHASE_ID = 2
+PHASE_NAME = "Personal Intro"
+PHASE_PROMPT = (
+    "Learn background (work/study), connection to children, motivation, strengths, concerns. One "
+    "question at a time."
+)
+RUBRIC = "Rate motivation, empathy, and stability (1-5)."
+PROFILE = {"temperature": 0.7, "max_tokens": 250}
+# score every turn alongside the reply, so Next Phase doesn't wait on it
+EVALUATE_EACH_TURN = True
+REQUIRED_FIELDS = ("experience", "motivation")
+MIN_TURNS = 2
@@ -0,0 +1,17 @@
+# ----------------------------
+# File: agents/phase3_explain_serve.py
+# ----------------------------
+PHASE_ID = 3
+PHASE_NAME = "Explain SERVE"
+PHASE_PROMPT = (
+    "How the organization runs Smart-classes has just been explained to the volunteer in a fixed "
+    "message (TV in schools, mostly rural, 30-45min sessions, 1-2 classes per week, lesson plans and "
+    "orientation as support, connection to children & patience more than teaching expertise). Do not "
+    "repeat the explanation; answer follow-up doubts briefly and check it is clear. One thing at a "
+    "time."
+)
+RUBRIC = "Rate understanding of program and comfort with idea of teaching (1-5)."
+PROFILE = {"temperature": 0.4, "max_tokens": 250}
+# "yes, that's clear" closes the phase
+ENDS_ON = ("AFFIRM",)
+MAX_TURNS = 4
@@ -0,0 +1,15 @@
+# ----------------------------
+# File: agents/phase4_commitment.py
+# ----------------------------
+PHASE_ID = 4
+PHASE_NAME = "Commitment & Availability"
+PHASE_PROMPT = (
+    "Ask preferred days/times, how they'll maintain consistency, handling sudden events, prior "
+    "experience with kids, and communication responsibility. One question at a time."
+)
+RUBRIC = "Rate availability consistency, reliability, and communication responsibility (1-5)."
+PROFILE = {"temperature": 0.5, "max_tokens": 250}
+# score every turn alongside the reply, so Next Phase doesn't wait on it
+EVALUATE_EACH_TURN = True
+REQUIRED_FIELDS = ("availability",)
+MIN_TURNS = 2
@@ -0,0 +1,12 @@
+# ----------------------------
+# File: agents/phase5_faqs_close.py
+# ----------------------------
+PHASE_ID = 5
+PHASE_NAME = "FAQs & Close"
+PHASE_PROMPT = (
+    "Invite volunteer questions and answer succinctly. Close warmly and explain next steps."
+)
+RUBRIC = "Rate clarity of questions and comfort asking doubts (1-5)."
+PROFILE = {"temperature": 0.3, "max_tokens": 300}
+# "no more questions" closes the interview
+ENDS_ON = ("NEGATE",)
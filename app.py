@@ -1,13 +1,13 @@
 import streamlit as st
-from openai import OpenAI
-import os
+
+from ui.chat import transcript
+from ui.resources import openai_client
 
 # ---------------------------------------
 # OpenRouter Client
 # ---------------------------------------
-client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",api_key=os.getenv("OPENAI_API_KEY")
-)
+# built once per process, not on every rerun
+client = openai_client("https://openrouter.ai/api/v1")
 
 # ---------------------------------------
 # System prompt for the bot
@@ -32,10 +32,7 @@ if "history" not in st.session_state:
 
 st.title("Volunteer Screening Bot (Llama 3.2 3B Instruct)")
 # Initialize messages with default welcome message
-
-
-with st.chat_message("ai"):
-    st.write("Hi! 👋 It’s so nice to meet you. I’m here to help you get started with your volunteer journey. I’ll ask a few simple questions about your background, interests, and availability so we can find the best match for you. Take your time — and feel free to share anything you’re comfortable with. Ready whenever you are!")
+WELCOME = "Hi! 👋 It’s so nice to meet you. I’m here to help you get started with your volunteer journey. I’ll ask a few simple questions about your background, interests, and availability so we can find the best match for you. Take your time — and feel free to share anything you’re comfortable with. Ready whenever you are!"
 
 # ---------------------------------------
 # Chat container CSS
@@ -54,40 +51,35 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ---------------------------------------
-# CHAT DISPLAY
+# CHAT DISPLAY + INPUT
 # ---------------------------------------
-chat_container = st.container()
+# A message reruns only this fragment, and the transcript component sends the
+# browser only the new messages instead of redrawing the whole history.
+@st.fragment
+def chat():
+    chat_container = st.container()
+    user_input = st.chat_input("Type your message here...")
 
-with chat_container:
-    #st.markdown('<div class="chat-box">', unsafe_allow_html=True)
-    
-    # Show all messages except system
-    
-    for msg in st.session_state.history[1:]:
-        st.chat_message(msg["role"]).markdown(msg["content"])
+    if user_input:
+        # Add user message
+        st.session_state.history.append({"role": "user", "content": user_input})
 
-    #st.markdown('</div>', unsafe_allow_html=True)
-
-# ---------------------------------------
-# ---------------------------------------
-user_input = st.chat_input("Type your message here...")
+        # Call LLM
+        response = client.chat.completions.create(
+            model="meta-llama/llama-3.2-3b-instruct",
+            messages=st.session_state.history
+        )
 
-if user_input:
-    # Add user message
-    st.session_state.history.append({"role": "user", "content": user_input})
+        bot_reply = response.choices[0].message.content
 
-    # Call LLM
-    response = client.chat.completions.create(
-        model="meta-llama/llama-3.2-3b-instruct",
-        messages=st.session_state.history
-    )
+        # Add bot message
+        st.session_state.history.append(
+            {"role": "assistant", "content": bot_reply}
+        )
 
-    bot_reply = response.choices[0].message.content
+    with chat_container:
+        # Show all messages except system, after the welcome message
+        transcript([{"role": "assistant", "content": WELCOME}] + st.session_state.history[1:])
 
-    # Add bot message
-    st.session_state.history.append(
-        {"role": "assistant", "content": bot_reply}
-    )
 
-    # Refresh UI to show latest messages
-    st.rerun()
+chat()
@@ -0,0 +1,79 @@
+"""
+Burst-message benchmark for the webhook server.
+
+Every simulated volunteer sends ``--bursts`` bursts of ``--fragments``
+messages ("hi", "I'm Priya", "I work in IT") ``--gap`` seconds apart, then
+waits for the replies. Runs once answering every message (quiet window 0)
+and once with ``--quiet-window``; a final late fragment arrives while the
+reply is being written to exercise superseding (its LLM call is aborted).
+Reports the LLM calls, how many replies the volunteer saw and the
+coalescing and cancellation metrics.
+
+    python benchmarks/bench_bursts.py --sessions 200 --fragments 3 --quiet-window 0.3
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import distill, llm, tasks  # noqa: E402
+from engine.mock import MockLLM  # noqa: E402
+from engine.server import ScreeningServer  # noqa: E402
+from engine.store import SessionStore  # noqa: E402
+
+
+async def volunteer(server, idx, args):
+    session_id = f"+9100000{idx:05d}"
+    replies = 0
+    for b in range(args.bursts):
+        sends = []
+        for f in range(args.fragments):
+            sends.append(asyncio.ensure_future(server.handle_message(session_id, f"{idx}: burst {b} part {f}", "phase")))
+            await asyncio.sleep(args.gap)
+        if b == args.bursts - 1 and args.quiet_window:
+            # one more thought while the reply is being written
+            await asyncio.sleep(args.quiet_window + args.latency / 2)
+            sends.append(asyncio.ensure_future(server.handle_message(session_id, f"{idx}: burst {b} late", "phase")))
+        replies += sum(len(r["replies"]) for r in await asyncio.gather(*sends))
+    return replies
+
+
+async def run(args, quiet_window):
+    mock = MockLLM(args.latency)
+    llm.set_backend(mock)
+    distill.LABEL_LOG = ""
+    server = ScreeningServer(store=SessionStore(tempfile.mkdtemp(prefix="bench_bursts_")),
+                             quiet_window=quiet_window)
+    args.quiet_window = quiet_window
+    started = time.perf_counter()
+    replies = await asyncio.gather(*(volunteer(server, i, args) for i in range(args.sessions)))
+    elapsed = time.perf_counter() - started
+    metrics = dict(server.metrics, **tasks.stats())
+    server.close()
+    keys = ("messages", "turns", "merged_messages", "superseded_turns", "llm_calls_saved", "llm_calls_wasted",
+            "llm_calls_cancelled", "streams_aborted")
+    print(f"quiet_window={quiet_window:.2f}s: llm calls {mock.calls:6}, replies/volunteer "
+          f"{sum(replies) / args.sessions:5.1f}, elapsed {elapsed:5.2f}s | "
+          + ", ".join(f"{k} {metrics[k]}" for k in keys))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--bursts", type=int, default=3)
+    parser.add_argument("--fragments", type=int, default=3)
+    parser.add_argument("--gap", type=float, default=0.05, help="seconds between fragments of a burst")
+    parser.add_argument("--quiet-window", type=float, default=0.3)
+    parser.add_argument("--latency", type=float, default=0.2, help="mock LLM latency")
+    args = parser.parse_args()
+    quiet_window = args.quiet_window
+    for window in (0.0, quiet_window):
+        asyncio.run(run(args, window))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Unattended phase-progression benchmark for the phase flows.
+
+Plays scripted volunteers through the scored, phase and multi-agent flows
+with auto-advance on and the mock LLM, and reports per flow the average
+volunteer turns per interview (until the last phase is complete), how many
+completion checks the rules settled versus the YES/NO model check, and the
+LLM calls per interview. For comparison it plays the same volunteers with
+every phase held for ``--fixed`` turns, standing in for an unattended
+session that only moves on by a turn limit.
+
+    python benchmarks/bench_completion.py --interviews 20
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import completion, llm, tasks  # noqa: E402
+from engine.flows import multi_agent, phase, scored  # noqa: E402
+from engine.mock import MockLLM  # noqa: E402
+
+# replies a volunteer gives in each phase, in order; the last line repeats
+SCRIPT = {
+    1: ["Hi, my name is Asha.", "I'm good, thanks! Sound is clear.", "I'm in Pune, the day has been busy.",
+        "Sure, that helps."],
+    2: ["I work as an accountant.", "I love children and want to help them learn maths.",
+        "My niece says I explain things well.", "Hmm, let me think."],
+    3: ["Yes, that is clear.", "Okay."],
+    4: ["Saturday mornings work best, maybe Wednesday evenings too.", "I'll block the time in my calendar.",
+        "I'd tell the coordinator a day before.", "Fine."],
+    5: ["No, nothing else, thank you.", "Thanks."],
+    6: ["Nothing more, thank you!", "Bye."],
+}
+TANGENTS = ["Sorry, one sec — the doorbell.", "Could you say that again?", "What time is it there?"]
+FLOWS = {"scored": scored, "phase": phase, "multi_agent": multi_agent}
+
+
+def volunteer(rng, pid, n):
+    lines = SCRIPT[pid]
+    if rng.random() < 0.2:
+        return rng.choice(TANGENTS)
+    return lines[min(n, len(lines) - 1)]
+
+
+def play(flow, rng, fixed=None, cap=60):
+    """Volunteer turns until the interview is complete (or ``fixed`` turns per phase)."""
+    state = flow.new_state()
+    state.options["auto_advance"] = fixed is None
+    n_phases = len(flow.PHASES)
+    in_phase = turns = 0
+    current = state.phase
+    while turns < cap:
+        flow.step(state, volunteer(rng, state.phase, in_phase))
+        turns += 1
+        in_phase += 1
+        if fixed is not None and in_phase >= fixed:
+            if state.phase == n_phases:
+                break
+            flow.next_phase(state)
+        if state.meta.get("interview_complete"):
+            break
+        if state.phase != current:
+            current, in_phase = state.phase, 0
+    tasks.wait(state.session_id)
+    return turns
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--interviews", type=int, default=20)
+    parser.add_argument("--fixed", type=int, default=6, help="turns per phase when advancing by turn limit only")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    mock = MockLLM()
+    llm.set_backend(mock)
+    for name, flow in FLOWS.items():
+        results = {}
+        for mode, fixed in (("auto-advance", None), (f"every {args.fixed} turns", args.fixed)):
+            rng = random.Random(args.seed)
+            before, calls = completion.stats(), mock.calls
+            turns = [play(flow, rng, fixed) for _ in range(args.interviews)]
+            after = completion.stats()
+            checks = {k: after[k] - before[k] for k in ("checks", "by_rules", "by_llm")}
+            results[mode] = (sum(turns) / len(turns), (mock.calls - calls) / len(turns), checks)
+        (auto_turns, auto_calls, checks), (fixed_turns, fixed_calls, _) = results.values()
+        print(f"{name:12} auto-advance: {auto_turns:5.1f} turns, {auto_calls:5.1f} LLM calls per interview "
+              f"({checks['by_rules']}/{checks['checks']} checks by rules, {checks['by_llm']} asked the model) | "
+              f"every {args.fixed} turns: {fixed_turns:5.1f} turns, {fixed_calls:5.1f} LLM calls")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Classifier context benchmark: last-6 window vs relevance-based selection.
+
+Builds KNOWING_VOLUNTEER conversations where the volunteer mentions a signal
+early, chats a while, and is then asked a long follow-up question. Reports
+history tokens per call, how often the question being answered is in the
+context, and how often the early relevant answer is still there.
+
+    python benchmarks/bench_context.py --conversations 1000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.context import select_context  # noqa: E402
+from engine.flows import selection as flow  # noqa: E402
+from engine.llm import estimate_tokens  # noqa: E402
+
+SMALL_TALK = [
+    ("assistant", "Haha, that sounds like a fun weekend! 😊"),
+    ("user", "yes it was great, we went to my aunt's place and had lots of food"),
+    ("assistant", "Lovely! Family time is the best."),
+    ("user", "true, and the weather was nice too, not too hot for once"),
+    ("assistant", "That's wonderful to hear 🌤️"),
+    ("user", "anyway sorry for the long message, got distracted"),
+]
+EARLY = ("user", "I tutored maths to kids in my colony during covid")
+QUESTION = ("assistant", "Thank you for sharing all that 😊 Since you mentioned helping out before, "
+                         "which age group of children would you feel most comfortable teaching?")
+
+
+def conversation(rng):
+    history = [{"role": "assistant", "content": flow.FIRST_QUESTION}, {"role": EARLY[0], "content": EARLY[1]}]
+    for r, c in rng.sample(SMALL_TALK, k=rng.randint(3, len(SMALL_TALK))):
+        history.append({"role": r, "content": c})
+    history.append({"role": QUESTION[0], "content": QUESTION[1]})
+    return history
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--conversations", type=int, default=1000)
+    parser.add_argument("--budget", type=int, default=flow.CONTEXT_BUDGET)
+    args = parser.parse_args()
+    rng = random.Random(0)
+    profile = flow.VolunteerProfile()
+    keywords = [k for s in flow.missing_signals(profile) for k in flow.SIGNAL_KEYWORDS[s]]
+
+    for label, pick in (("last-6  ", lambda h: h[-6:]),
+                        ("selected", lambda h: select_context(h, args.budget, keywords))):
+        tokens, has_question, has_early = [], 0, 0
+        for _ in range(args.conversations):
+            history = conversation(rng)
+            ctx = pick(history)
+            tokens.append(estimate_tokens(ctx))
+            has_question += ctx[-1]["content"] == QUESTION[1]
+            has_early += any(m["content"] == EARLY[1] for m in ctx)
+        n = args.conversations
+        print(f"{label}: {statistics.mean(tokens):5.1f} history tokens/call, "
+              f"question kept {has_question / n:.0%}, early answer kept {has_early / n:.0%}")
+
+
+if __name__ == "__main__":
+    main()
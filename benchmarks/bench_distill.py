@@ -0,0 +1,103 @@
+"""
+Distilled intent classifier benchmark.
+
+Without ``--labels`` it builds a synthetic label log from phrase templates
+(stand-in for logged LLM labels). One phrasing per (state, intent) is held
+out, so the model is scored on wording it never saw in training rather than
+on new fills of the templates it learned. Prints held-out accuracy,
+confident-subset accuracy/coverage and per-message latency; "seen phrasings"
+(new fills of the training templates) is the optimistic upper bound.
+With ``--labels`` the log is split by message, as ``python -m engine.distill``
+does.
+
+    python benchmarks/bench_distill.py
+    python benchmarks/bench_distill.py --labels records/intent_labels.jsonl
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import distill  # noqa: E402
+
+KV = "KNOWING_VOLUNTEER"
+WC = "WEEKLY_COMMITMENT"
+TEMPLATES = {
+    (KV, "MOTIVATION_SHARED"): ["I want to {give} to society", "I love helping kids {learn}", "I want to {give}",
+                                "mujhe bachchon ki madad karni hai", "it feels good to {give}"],
+    (KV, "EXPERIENCE_SHARED"): ["I taught {subject} for {n} years", "I used to tutor my cousins in {subject}",
+                                "I was a {job} for {n} years", "maine {n} saal {subject} padhaya"],
+    (KV, "NO_EXPERIENCE"): ["I have never taught before", "no teaching experience", "not really, never taught",
+                            "koi experience nahi hai", "this would be my first time teaching"],
+    (KV, "COMFORT_SHARED"): ["I am comfortable with {age} kids", "I get along well with children",
+                             "{age} students would be best for me", "a bit nervous with small kids"],
+    (KV, "QUERY"): ["what will I teach?", "how do sessions work?", "kab se shuru hoga?", "is it online?"],
+    (KV, "AMBIGUOUS"): ["hmm", "ok", "let me think", "😊", "fine"],
+    (KV, "STOP"): ["stop", "please stop messaging", "unsubscribe", "band karo", "I want to leave"],
+    (WC, "TIME_YES"): ["yes {n} hours is fine", "sure, that works", "haan chalega", "yes definitely", "no problem"],
+    (WC, "TIME_MAYBE"): ["maybe, depends on my work", "I'll try", "shayad", "some weeks yes", "not sure"],
+    (WC, "TIME_NO"): ["no I can't", "only 30 minutes a week", "nahi ho payega", "too busy for that", "not possible"],
+    (WC, "QUERY"): ["which days?", "what time are sessions?", "can I choose the slot?"],
+    (WC, "AMBIGUOUS"): ["hmm", "ok let me see", "👍"],
+    (WC, "STOP"): ["stop", "unsubscribe", "leave me alone"],
+}
+FILL = {"give": ["give back", "help", "serve", "uplift others"], "learn": ["learn", "read", "grow"],
+        "subject": ["maths", "english", "science", "hindi"], "n": ["2", "3", "5", "10"],
+        "job": ["teacher", "engineer", "nurse", "homemaker"], "age": ["primary", "middle school", "older"]}
+PROMPTS = {KV: "What made you interested in volunteering with SERVE?",
+           WC: "Would you be comfortable spending about 2 hours a week with students?"}
+
+
+def synthetic(n, seed=0, templates=TEMPLATES):
+    rng = random.Random(seed)
+    keys = list(templates)
+    rows = []
+    for _ in range(n):
+        state, intent = rng.choice(keys)
+        text = rng.choice(templates[(state, intent)])
+        text = text.format(**{k: rng.choice(v) for k, v in FILL.items()})
+        rows.append({"state": state, "last_prompt": PROMPTS[state], "message": text, "intent": intent})
+    return rows
+
+
+def split_templates(seed=0):
+    """(train, held-out) templates: one phrasing of every (state, intent) is kept out of training."""
+    rng = random.Random(seed)
+    train, held_out = {}, {}
+    for key, texts in TEMPLATES.items():
+        texts = list(texts)
+        held_out[key] = [texts.pop(rng.randrange(len(texts)))]
+        train[key] = texts
+    return train, held_out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--labels")
+    parser.add_argument("--n", type=int, default=4000)
+    parser.add_argument("--threshold", type=float, default=0.85)
+    args = parser.parse_args()
+
+    if args.labels:
+        train_rows, held_out = distill.split(distill.load_labels(args.labels))
+        seen = None
+    else:
+        train_templates, held_templates = split_templates()
+        cut = int(args.n * 0.8)
+        train_rows = synthetic(cut, templates=train_templates)
+        held_out = synthetic(args.n - cut, seed=1, templates=held_templates)
+        seen = synthetic(args.n - cut, seed=2, templates=train_templates)
+    t0 = time.perf_counter()
+    model = distill.train(train_rows)
+    print(f"train: {len(train_rows)} rows in {time.perf_counter() - t0:.1f}s")
+    print("held-out:", json.dumps(distill.evaluate(model, held_out, args.threshold)))
+    if seen is not None:
+        print("seen phrasings:", json.dumps(distill.evaluate(model, seen, args.threshold)))
+
+
+if __name__ == "__main__":
+    main()
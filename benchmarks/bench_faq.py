@@ -0,0 +1,84 @@
+"""
+FAQ cache benchmark.
+
+Looks up paraphrased FAQ questions (should hit the right answer) and
+off-topic questions (should miss and go to the LLM); prints hit rate,
+wrong answers and per-lookup latency. Then learns answers for many sessions
+(past ``faq.MAX_LEARNED``) and prints the cost per ``learn`` and whether any
+session was served another session's answer.
+
+    python benchmarks/bench_faq.py --rounds 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import faq  # noqa: E402
+
+# (question, index into faq.CURATED it should be answered with, or None for "go to the LLM")
+QUESTIONS = [
+    ("How long is a session?", 0),
+    ("class kitne minute ki hoti hai?", 0),
+    ("how many days a week?", 1),
+    ("do i get lesson plan?", 2),
+    ("is training provided?", 3),
+    ("What device do I need?", 4),
+    ("what if I miss a class?", 5),
+    ("do I need experience teaching?", 6),
+    ("which students will I be teaching?", 7),
+    ("who will help me if I get stuck?", 8),
+    ("What is the salary?", None),
+    ("Can I choose which school?", None),
+    ("where is your office?", None),
+    ("will I get a certificate?", None),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    cache = faq.FAQCache()
+    hits = wrong = missed = 0
+    for q, expected in QUESTIONS:
+        answer, sim, matched = cache.nearest(q)
+        hit = sim >= cache.threshold
+        want = faq.CURATED[expected][1] if expected is not None else None
+        if hit and answer == want:
+            hits += 1
+        elif hit:
+            wrong += 1
+        elif want is not None:
+            missed += 1
+        print(f"{sim:.2f} {'HIT ' if hit else 'miss'} {q!r:40} -> {matched!r}")
+    answerable = sum(e is not None for _, e in QUESTIONS)
+    print(f"\ncorrect hits {hits}/{answerable}, wrong answers {wrong}, missed {missed}")
+
+    t0 = time.perf_counter()
+    for _ in range(args.rounds):
+        for q, _ in QUESTIONS:
+            cache.lookup(q)
+    elapsed = time.perf_counter() - t0
+    print(f"lookup: {1000 * elapsed / (args.rounds * len(QUESTIONS)):.3f} ms, stats: {cache.stats()}")
+
+    off_topic = [q for q, expected in QUESTIONS if expected is None]
+    sessions = 2 * faq.MAX_LEARNED // len(off_topic)
+    t0 = time.perf_counter()
+    for s in range(sessions):
+        for q in off_topic:
+            cache.learn(q, f"answer for session {s}", f"session-{s}")
+    elapsed = time.perf_counter() - t0
+    leaked = sum(
+        (cache.lookup(q, f"session-{s}") or f"answer for session {s}") != f"answer for session {s}"
+        for s in range(sessions) for q in off_topic
+    )
+    print(f"learn: {1000 * elapsed / (sessions * len(off_topic)):.3f} ms, "
+          f"answers served to the wrong session {leaked}, stats: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Selection state machine benchmark.
+
+Measures raw transition lookups on the compiled table (random state/intent
+pairs) and full turns through the rule-classified ORIENTATION state, which
+never calls the LLM.
+
+    python benchmarks/bench_fsm.py --lookups 1000000 --turns 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import llm  # noqa: E402
+from engine.flows import selection as flow  # noqa: E402
+from engine.mock import MockLLM  # noqa: E402
+
+REPLIES = ["yes that works", "not really", "what do I need to prepare?", "ok 👍", "hmm", "stop"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lookups", type=int, default=1_000_000)
+    parser.add_argument("--turns", type=int, default=100_000)
+    args = parser.parse_args()
+
+    fsm = flow.FSM
+    rng = random.Random(0)
+    pairs = [(rng.randrange(len(fsm.names)), rng.choice(fsm.intents[1:])) for _ in range(10_000)]
+
+    profile = flow.VolunteerProfile()
+    t0 = time.perf_counter()
+    n = 0
+    while n < args.lookups:
+        for state, intent in pairs:
+            fsm.advance(state, intent, 1, 1, profile)
+        n += len(pairs)
+    elapsed = time.perf_counter() - t0
+    print(f"advance(): {n / elapsed:,.0f} transitions/s")
+
+    mock = MockLLM()
+    llm.set_backend(mock)
+    orientation = fsm.index["ORIENTATION"]
+    t0 = time.perf_counter()
+    for i in range(args.turns):
+        state = flow.new_state()
+        state.state_index = orientation
+        flow.step(state, REPLIES[i % len(REPLIES)])
+    elapsed = time.perf_counter() - t0
+    print(f"rule-state step(): {args.turns / elapsed:,.0f} turns/s, llm calls: {mock.calls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Phase-agent prompt size benchmark for the multi-agent flow.
+
+Runs a multi-agent interview (``--turns`` volunteer turns per phase) with
+the mock LLM and reports, per phase, the mean prompt tokens of the phase
+agent's calls: as shipped (phase guide + handoff brief + this phase's
+messages) and the way it used to be built (phase guide + the last 20
+messages of the whole conversation).
+
+    python benchmarks/bench_handoff.py --turns 6
+"""
+import argparse
+import os
+import statistics
+import sys
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import llm, tasks  # noqa: E402
+from engine.flows import multi_agent  # noqa: E402
+from engine.mock import MockLLM  # noqa: E402
+
+ANSWER = ("I work as an accountant in Pune, and on weekends I help my niece with maths. "
+          "I think I could manage two evenings a week if the sessions are online.")
+
+
+def old_prompt_tokens(state):
+    phase = multi_agent.PHASES[state.phase]
+    system = multi_agent.SYSTEM_BASE + "\n\n" + f"Phase {state.phase}: {phase['name']} — {phase['guide']}"
+    return llm.estimate_tokens([{"role": "system", "content": system}, *state.messages.to_dicts()[-20:]])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=6, help="volunteer turns per phase")
+    args = parser.parse_args()
+
+    mock = MockLLM()
+    sizes = defaultdict(list)
+
+    def recording(messages, model, **kwargs):
+        if messages[0]["content"].startswith(multi_agent.SYSTEM_BASE):
+            sizes[current["phase"]].append(llm.estimate_tokens(messages))
+        return mock(messages, model, **kwargs)
+
+    llm.set_backend(recording)
+    current = {}
+    old = defaultdict(list)
+    state = multi_agent.new_state()
+    for pid in multi_agent.PHASES:
+        current["phase"] = pid
+        for t in range(args.turns):
+            old[pid].append(old_prompt_tokens(state) + llm.estimate_tokens([{"content": f"({pid}.{t}) {ANSWER}"}]))
+            multi_agent.step(state, f"({pid}.{t}) {ANSWER}")
+        if pid < len(multi_agent.PHASES):
+            multi_agent.next_phase(state)
+            tasks.wait(state.session_id)
+    for pid in multi_agent.PHASES:
+        print(f"phase {pid}: phase agent prompt {statistics.mean(sizes[pid]):6.0f} tokens "
+              f"(last-20 history: {statistics.mean(old[pid]):6.0f})")
+
+
+if __name__ == "__main__":
+    main()
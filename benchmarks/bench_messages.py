@@ -0,0 +1,124 @@
+"""
+Per-session message memory benchmark.
+
+Builds ``--sessions`` interviews of ``--messages`` turns (unique volunteer
+answers, a mix of template and LLM-written assistant turns, rehydrated from
+JSON the way the session store and records load them) and reports resident
+bytes per session measured with ``tracemalloc`` — once as the old list of
+{"role", "content"} dicts and once as a ``MessageLog`` — plus the cost of
+the views the flows read every turn. A single ``--long`` interview then
+shows what the text view keeps cached next to the compressed archive when
+the transcript is rendered every turn (as the scored flow does).
+
+    python benchmarks/bench_messages.py --sessions 1000 --messages 60 --long 4000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.extraction import conversation_text  # noqa: E402
+from engine.messages import MessageLog  # noqa: E402
+from engine.state import ConversationState  # noqa: E402
+
+TEMPLATES = [
+    "Great — let me explain how the volunteering works: weekly online sessions with a child, "
+    "about an hour each, with a coordinator checking in every month. Any questions so far?",
+    "(Guide) Availability: ask which days and times work and how many hours per week they can commit.",
+    "Thanks! Could you tell me a little about your work and what you enjoy doing outside it?",
+    "Sessions are 60 minutes, once a week, over a video call on a laptop or tablet.",
+]
+
+
+def turns(session, n):
+    """Scripted {"role", "content"} turns; every other assistant turn is a template."""
+    out = []
+    for i in range(n // 2):
+        out.append({"role": "user", "content": f"Volunteer {session} answer {i}: I can do weekends, I teach maths "
+                                                f"at a school near home and have tutored {i} kids before."})
+        if i % 2:
+            out.append({"role": "assistant", "content": TEMPLATES[i % len(TEMPLATES)]})
+        else:
+            out.append({"role": "assistant", "content": f"That's lovely, thank you {session}. Follow-up {i}: "
+                                                        "what made you want to volunteer with children?"})
+    return out
+
+
+def build(kind, sessions, n):
+    # the process served its templates once, as a live session would
+    warm = ConversationState("bench")
+    for text in TEMPLATES:
+        warm.add("assistant", text, shared=True)
+    payloads = [json.dumps(turns(s, n)) for s in range(sessions)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    if kind == "dicts":
+        held = [json.loads(p) for p in payloads]
+    else:
+        held = [MessageLog(json.loads(p)) for p in payloads]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return held, used / sessions
+
+
+def next_turn(messages):
+    if isinstance(messages, MessageLog):
+        messages.append("user", "One more answer.")
+    else:
+        messages.append({"role": "user", "content": "One more answer."})
+    return conversation_text(messages)
+
+
+def views_us(logs, repeat):
+    """Microseconds per call: first conversation_text, after each new turn, repeated unchanged, tail(20)."""
+    timings = {}
+    for name, view, rounds in (("conversation_text first", conversation_text, 1),
+                               ("after a turn", next_turn, repeat),
+                               ("unchanged", conversation_text, repeat),
+                               ("tail(20)", lambda m: m[-20:], repeat)):
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            for messages in logs:
+                view(messages)
+        timings[name] = 1e6 * (time.perf_counter() - t0) / (rounds * len(logs))
+    return timings
+
+
+def long_session(n):
+    log = MessageLog()
+    elapsed = 0.0
+    for i, turn in enumerate(turns(0, n)):
+        log.append(turn["role"], turn["content"])
+        if i % 2:
+            t0 = time.perf_counter()
+            conversation_text(log)
+            elapsed += time.perf_counter() - t0
+    cached = sum(len(view) for _, view in log._views.values())
+    archive = sum(len(blob) for blob in log._archive)
+    print(f"long: {n} messages, text view cached {cached} B, archive {archive} B, "
+          f"conversation_text {1000 * elapsed / (n // 2):.2f} ms/turn")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--messages", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--long", type=int, default=4000, help="messages in the single long interview")
+    args = parser.parse_args()
+
+    print(f"sessions={args.sessions} messages/session={args.messages}")
+    for kind in ("dicts", "log"):
+        held, per_session = build(kind, args.sessions, args.messages)
+        timings = ", ".join(f"{k} {v:.1f} us" for k, v in views_us(held, args.repeat).items())
+        extra = f", estimate {held[0].nbytes()} B" if kind == "log" else ""
+        print(f"{kind:5}: {per_session / 1024:6.1f} KiB/session{extra}; {timings}")
+    long_session(args.long)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Phase-agent plugin benchmark for the multi-agent flow.
+
+Reports which phase modules a session loads (only the phases it reaches are
+imported), then times "Next Phase" out of each phase with a mock LLM
+(``--latency`` seconds per call): with the phase's rubric evaluator running
+alongside the replies (phases with ``EVALUATE_EACH_TURN``), and with every
+phase scored when the coordinator moves on, as before.
+
+    python benchmarks/bench_phase_agents.py --turns 4 --latency 0.2
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import llm, tasks  # noqa: E402
+from engine.flows import multi_agent  # noqa: E402
+from engine.mock import MockLLM  # noqa: E402
+
+ANSWER = ("I work as an accountant in Pune, and on weekends I help my niece with maths. "
+          "I think I could manage two evenings a week if the sessions are online.")
+
+
+def next_phase_times(turns, think):
+    """{phase_id: seconds} for Next Phase after ``turns`` replies (``think`` seconds between replies)."""
+    state = multi_agent.new_state()
+    times = {}
+    for pid in multi_agent.PHASES:
+        if pid == len(multi_agent.PHASES):
+            break
+        for t in range(turns):
+            multi_agent.step(state, f"({pid}.{t}) {ANSWER}")
+            time.sleep(think)
+        started = time.perf_counter()
+        multi_agent.next_phase(state)
+        times[pid] = time.perf_counter() - started
+    tasks.wait(state.session_id)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=4, help="volunteer turns per phase")
+    parser.add_argument("--latency", type=float, default=0.2, help="mock LLM seconds per call")
+    parser.add_argument("--think", type=float, default=0.3, help="seconds the volunteer takes to reply")
+    args = parser.parse_args()
+    llm.set_backend(MockLLM(args.latency))
+
+    state = multi_agent.new_state()
+    for t in range(args.turns):
+        multi_agent.step(state, f"(1.{t}) {ANSWER}")
+    print(f"{len(multi_agent.PHASES)} phase modules; a session still in phase 1 loaded {multi_agent.PHASES.loaded()}")
+
+    shipped = next_phase_times(args.turns, args.think)
+    flags = {pid: multi_agent.PHASES[pid].evaluate_each_turn for pid in multi_agent.PHASES}
+    for pid in multi_agent.PHASES:
+        multi_agent.PHASES[pid].evaluate_each_turn = False
+    try:
+        scored_at_end = next_phase_times(args.turns, args.think)
+    finally:
+        for pid, flag in flags.items():
+            multi_agent.PHASES[pid].evaluate_each_turn = flag
+    for pid, seconds in shipped.items():
+        mode = "evaluated each turn" if flags[pid] else "scored on Next Phase"
+        print(f"phase {pid} ({mode:21}): Next Phase {seconds * 1000:6.0f} ms "
+              f"(all scored on Next Phase: {scored_at_end[pid] * 1000:6.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
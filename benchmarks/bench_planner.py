@@ -0,0 +1,109 @@
+"""
+KNOWING_VOLUNTEER replay benchmark: question planner on vs off.
+
+Replays ``--personas`` scripted volunteers through the selection flow with a
+scripted LLM. Each volunteer answers whatever topic the last question was
+about (sometimes vaguely). Without the planner the scripted LLM drifts
+between topics the way the free-running model does; with it, the LLM asks
+about the planner's target. Reports completed profiles and turns / LLM calls per interview.
+
+    python benchmarks/bench_planner.py --personas 500
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import distill, llm  # noqa: E402
+from engine.flows import selection as flow  # noqa: E402
+
+TOPIC_QUESTIONS = {
+    "motivation": "What made you want to volunteer with us?",
+    "has_teaching_experience": "Have you taught or mentored anyone before?",
+    "subjects": "Which subjects do you enjoy?",
+    "children_age_comfort": "Which age group are you most comfortable with?",
+    "teaching_interest": "Would you enjoy teaching online?",
+    # off-target topics the free-running model also likes to ask about
+    "work": "What do you do for work these days?",
+    "hobbies": "What do you enjoy doing in your free time?",
+    "city": "Which city are you based in?",
+}
+QUESTION_TOPIC = {q: t for t, q in TOPIC_QUESTIONS.items()}
+QUESTION_TOPIC[flow.FIRST_QUESTION] = "work"
+
+
+def persona(rng):
+    return {
+        "motivation": rng.choice(["help", "give back", "bring joy"]),
+        "has_teaching_experience": rng.random() < 0.5,
+        "subjects": [rng.choice(["maths", "english", "science"])],
+        "children_age_comfort": rng.choice(["primary", "middle", "secondary"]),
+        "teaching_interest": rng.choice(["yes", "maybe"]),
+    }
+
+
+class ScriptedLLM:
+
+    def __init__(self, rng, clarity):
+        self.rng = rng
+        self.clarity = clarity
+        self.calls = 0
+        self.persona = None
+
+    def __call__(self, messages, model, **kwargs):
+        self.calls += 1
+        asked = next((QUESTION_TOPIC.get(m["content"].split("\n\n")[-1]) for m in reversed(messages)
+                      if m["role"] == "assistant"), None)
+        signals = {}
+        if asked in flow.SIGNAL_TARGETS and self.rng.random() < self.clarity:
+            signals[asked] = self.persona[asked]
+        plan = next((m["content"] for m in messages if m["content"].startswith("Next question:")), None)
+        if plan:
+            todo = sorted((plan.find(target), s) for s, (target, _) in flow.SIGNAL_TARGETS.items()
+                          if plan.find(target) < plan.find("In tone_reply") and target in plan)
+            topic = next((s for _, s in todo if s not in signals), todo[-1][1])
+        else:
+            topic = self.rng.choice(list(TOPIC_QUESTIONS))
+        return json.dumps({"intent": "EXPERIENCE_SHARED", "confidence": 0.8,
+                           "tone_reply": f"Thanks for sharing 😊\n\n{TOPIC_QUESTIONS[topic]}", "signals": signals})
+
+
+def replay(n, use_planner, clarity, seed=0):
+    rng = random.Random(seed)
+    backend = ScriptedLLM(rng, clarity)
+    llm.set_backend(backend)
+    flow.USE_PLANNER = use_planner
+    turns, calls, completed = [], [], 0
+    for _ in range(n):
+        backend.persona = persona(rng)
+        backend.calls = 0
+        state = flow.new_state()
+        while flow.current_state(state) == "KNOWING_VOLUNTEER" and not state.done:
+            flow.step(state, "(answer)")
+        completed += state.meta["outcome"] == "complete"
+        turns.append(state.question_index)
+        calls.append(backend.calls)
+    return completed, statistics.mean(turns), statistics.mean(calls)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--personas", type=int, default=500)
+    parser.add_argument("--clarity", type=float, default=0.85, help="chance an answer carries the signal")
+    args = parser.parse_args()
+    distill.LABEL_LOG = ""
+    distill.set_model(None)
+
+    for use_planner in (False, True):
+        completed, turns, calls = replay(args.personas, use_planner, args.clarity)
+        label = "planner" if use_planner else "free    "
+        print(f"{label}: completed {completed}/{args.personas}, "
+              f"turns/interview {turns:.1f}, llm calls/interview {calls:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Rule-based intent microbenchmark.
+
+Compares the compiled single-pass matcher in engine/rules.py against the
+original per-call keyword scans (copied below as the baseline) on a mix of
+English, Hinglish and Hindi replies.
+
+    python benchmarks/bench_rules.py --rounds 20000
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import rules  # noqa: E402
+
+SAMPLES = [
+    "Yes I can do that", "no, stop", "I'm not sure about weekends", "What subjects will I teach?",
+    "I worked as an engineer for 10 years", "ok", "haan bilkul, weekend pe chalega",
+    "nahi ho payega is hafte", "pata nahi", "kab se shuru hoga?", "हाँ जी, ठीक है", "मुझे नहीं पता",
+    "I have been teaching my neighbour's kids maths for two years and really enjoy it",
+    "hmm", "sounds good to me 🙂",
+]
+
+
+def legacy_intent(text):
+    t = text.lower().strip()
+    if any(x in t for x in ["stop", "unsubscribe", "exit", "leave", "quit", "cancel"]):
+        return "STOP"
+    if re.search(r"\b(yes|yeah|yep|sure|ok|okay|fine|i do|i am)\b", t):
+        return "AFFIRM"
+    if re.search(r"\b(no|nope|not really|can't|cannot|won't|don’t|do not)\b", t):
+        return "NEGATE"
+    if "?" in t or any(x in t for x in ["how", "what", "when", "where", "why", "can you", "is it", "do i"]):
+        return "QUERY"
+    if any(x in t for x in ["teacher", "teaching", "student", "engineer", "working", "experience",
+                            "background", "volunteer", "profession", "mentor", "worked", "homemaker",
+                            "housewife"]):
+        return "INFO"
+    return "AMBIGUOUS"
+
+
+def legacy_confidence(text):
+    t = text.lower().strip()
+    if len(t) < 3:
+        return 0.2
+    if any(x in t for x in ["yes", "sure", "absolutely", "definitely", "i can", "i will"]):
+        return 0.9
+    if any(x in t for x in ["no", "can't", "cannot", "not possible"]):
+        return 0.9
+    if "?" in t:
+        return 0.6
+    if any(x in t for x in ["years", "hours", "week", "experience", "background"]):
+        return 0.7
+    return 0.5
+
+
+def timed(fn, rounds):
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for s in SAMPLES:
+            fn(s)
+    return rounds * len(SAMPLES) / (time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20000)
+    args = parser.parse_args()
+
+    legacy = timed(lambda s: (legacy_intent(s), legacy_confidence(s)), args.rounds)
+    compiled = timed(rules.classify, args.rounds)
+    print(f"legacy scans:     {legacy:,.0f} msgs/s")
+    print(f"compiled matcher: {compiled:,.0f} msgs/s ({compiled / legacy:.2f}x)")
+    print()
+    for s in SAMPLES:
+        print(f"{s[:40]!r:44} legacy={legacy_intent(s):9} compiled={rules.classify(s)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Fake webhook sender for the async server.
+
+Starts ``ScreeningServer`` on a local port with the mock LLM, then opens one
+keep-alive connection per simulated volunteer and sends ``--messages`` turns
+each, all sessions at once. Half the sessions run the SIA selection flow and
+half the phase flow. Checks that every session got its replies back in order.
+
+    python benchmarks/bench_server.py --sessions 1000 --messages 5 --latency 0.05
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import distill, llm  # noqa: E402
+from engine.mock import MockLLM  # noqa: E402
+from engine.server import ScreeningServer  # noqa: E402
+from engine.store import SessionStore  # noqa: E402
+
+FLOWS = ("selection", "phase")
+
+
+async def post(reader, writer, payload):
+    body = json.dumps(payload).encode("utf-8")
+    writer.write(
+        b"POST /webhook HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        + f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    status = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    data = json.loads(await reader.readexactly(length))
+    return int(status.split()[1]), data
+
+
+async def volunteer(port, idx, n_messages, latencies):
+    session_id = f"+9100000{idx:05d}"
+    flow = FLOWS[idx % len(FLOWS)]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for turn in range(n_messages):
+            started = time.perf_counter()
+            status, data = await post(reader, writer, {"phone": session_id, "text": f"message {turn} from {idx}", "flow": flow})
+            latencies.append(time.perf_counter() - started)
+            if status != 200 or data["session_id"] != session_id:
+                raise AssertionError(f"bad reply for {session_id}: {status} {data}")
+    finally:
+        writer.close()
+    return session_id
+
+
+async def run(args):
+    mock = MockLLM(args.latency)
+    llm.set_backend(mock)
+    distill.LABEL_LOG = ""
+    spill_dir = tempfile.mkdtemp(prefix="bench_sessions_")
+    server = ScreeningServer(max_workers=args.workers, store=SessionStore(spill_dir, max_sessions=args.max_sessions))
+    srv = await server.start("127.0.0.1", 0)
+    port = srv.sockets[0].getsockname()[1]
+
+    latencies = []
+    started = time.perf_counter()
+    ids = await asyncio.gather(*(volunteer(port, i, args.messages, latencies) for i in range(args.sessions)))
+    elapsed = time.perf_counter() - started
+
+    # per-session ordering: user turns must appear in the transcript in send order
+    for sid in ids:
+        sent = [m["content"] for m in server.store.get(sid).messages if m["role"] == "user"]
+        idx = int(sid[-5:])
+        assert sent == [f"message {t} from {idx}" for t in range(len(sent))], sid
+
+    server.close()
+    total = args.sessions * args.messages
+    latencies.sort()
+    print(f"sessions={args.sessions} messages/session={args.messages} mock_latency={args.latency}s cores={os.cpu_count()}")
+    print(f"turns={total} elapsed={elapsed:.2f}s throughput={total / elapsed:.0f} turns/s llm_calls={mock.calls}")
+    print(f"latency p50={statistics.median(latencies) * 1000:.1f}ms p95={latencies[int(len(latencies) * 0.95)] * 1000:.1f}ms")
+    print("ordering: OK")
+    print(f"store: {server.store.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--messages", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=1024)
+    parser.add_argument("--max-sessions", type=int, default=None, help="resident cap for the session store")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Startup / rerun benchmark for the Streamlit entry points.
+
+For every app: the cold import time of what it imports (fresh interpreter,
+``python -X importtime``) with the slowest modules, and the mean time of a
+plain rerun (no input) under ``streamlit.testing`` with the mock LLM. For
+every ``python -m engine`` subcommand: process start to ``--help`` and which
+heavy packages it pulled in.
+
+    python benchmarks/bench_startup.py --reruns 20
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+APPS = [
+    "screening_agent.py",
+    "screening_agent_phase.py",
+    "screening_multi_agent.py",
+    "screening_agent_app.py",
+    "src/agents/selection/selection_agent.py",
+    "app.py",
+]
+_IMPORT = re.compile(r"^(?:from\s+\S+\s+import\s+[^(\n]+|import\s+[^\n]+)", re.M)
+_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def app_imports(path):
+    """The app's top-level import statements."""
+    with open(os.path.join(ROOT, path), encoding="utf-8") as f:
+        return [line.split("#")[0].strip() for line in _IMPORT.findall(f.read())]
+
+
+def cold_import(statements):
+    """(total ms, [(cumulative ms, module)] of the slowest top-level imports) in a fresh interpreter."""
+    code = "\n".join(statements)
+    t0 = time.perf_counter()
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stderr
+    total = 1000 * (time.perf_counter() - t0)
+    top = [(int(cum) / 1000, name) for _, cum, indent, name in _IMPORTTIME.findall(out) if len(indent) == 1]
+    return total, sorted(top, reverse=True)[:4]
+
+
+CLI_COMMANDS = ["serve", "rescore", "migrate", "bench", "ui"]
+HEAVY = ("streamlit", "numpy", "openai")
+
+
+def cli_startup(command):
+    """(ms to ``--help``, heavy packages imported) for ``python -m engine <command>``."""
+    t0 = time.perf_counter()
+    out = subprocess.run([sys.executable, "-X", "importtime", "-m", "engine", command, "--help"], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stderr
+    total = 1000 * (time.perf_counter() - t0)
+    imported = {name for _, _, _, name in _IMPORTTIME.findall(out)}
+    return total, [h for h in HEAVY if h in imported]
+
+
+def run_app(path):
+    import runpy
+
+    from engine import distill, llm
+    from engine.mock import MockLLM
+    if not isinstance(llm._backend, MockLLM):
+        llm.set_backend(MockLLM())
+    distill.LABEL_LOG = ""
+    runpy.run_path(path, run_name="__main__")
+
+
+def rerun_ms(path, reruns):
+    at = AppTest.from_function(run_app, args=(os.path.join(ROOT, path),), default_timeout=60)
+    at.run()
+    if at.exception:
+        raise RuntimeError(f"{path}: {at.exception[0].message}")
+    t0 = time.perf_counter()
+    for _ in range(reruns):
+        at.run()
+    return 1000 * (time.perf_counter() - t0) / reruns
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    for command in CLI_COMMANDS:
+        total, heavy = cli_startup(command)
+        print(f"python -m engine {command:8} start {total:6.0f} ms, imports {', '.join(heavy) or 'none of ' + '/'.join(HEAVY)}")
+    for path in APPS:
+        total, top = cold_import(app_imports(path))
+        slowest = ", ".join(f"{name} {ms:.0f}" for ms, name in top)
+        print(f"{path:40} cold start {total:6.0f} ms (slowest imports, ms: {slowest}); "
+              f"rerun {rerun_ms(path, args.reruns):5.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
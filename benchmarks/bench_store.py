@@ -0,0 +1,66 @@
+"""
+Session store memory benchmark.
+
+Opens ``--sessions`` conversations (selection + phase flows, mock LLM), a few
+turns each, with the store capped at ``--max-sessions`` resident sessions,
+then comes back to every session once more to exercise rehydration. Prints
+traced Python memory as the number of open conversations grows.
+
+    python benchmarks/bench_store.py --sessions 20000 --max-sessions 500
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import distill, llm  # noqa: E402
+from engine.flows import get_flow  # noqa: E402
+from engine.mock import MockLLM  # noqa: E402
+from engine.store import SessionStore  # noqa: E402
+
+FLOWS = ("selection", "phase")
+
+
+def turn(store, sid, flow_name, text):
+    state = store.acquire(sid, lambda s: get_flow(flow_name).new_state(s))
+    try:
+        get_flow(state.flow).step(state, text)
+    finally:
+        store.release(state)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=20000)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--max-sessions", type=int, default=500)
+    args = parser.parse_args()
+
+    llm.set_backend(MockLLM())
+    distill.LABEL_LOG = ""
+    store = SessionStore(tempfile.mkdtemp(prefix="bench_store_"), max_sessions=args.max_sessions)
+    tracemalloc.start()
+    checkpoints = {args.sessions // 4, args.sessions // 2, args.sessions}
+    started = time.perf_counter()
+    for i in range(1, args.sessions + 1):
+        sid = f"s{i}"
+        for t in range(args.turns):
+            turn(store, sid, FLOWS[i % 2], f"I have been teaching maths for {t + 1} years and love kids")
+        if i in checkpoints:
+            current, _ = tracemalloc.get_traced_memory()
+            print(f"open={i:>7} resident={len(store):>5} traced={current / 1e6:7.1f} MB")
+    # every session comes back once: all but the hottest are rehydrated from disk
+    for i in range(1, args.sessions + 1):
+        turn(store, f"s{i}", FLOWS[i % 2], "I'm back, sorry for the delay!")
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    print(f"after revisit: traced={current / 1e6:.1f} MB peak={peak / 1e6:.1f} MB elapsed={elapsed:.1f}s")
+    print(store.stats())
+
+
+if __name__ == "__main__":
+    main()
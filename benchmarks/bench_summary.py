@@ -0,0 +1,90 @@
+"""
+End Interview latency benchmark for the map-reduce coordinator summary.
+
+Runs multi-agent interviews of growing length (``--turns`` volunteer turns
+in each phase but the last, which gets ``--last``) with a mock LLM whose
+latency grows with the prompt (``--per-1k`` seconds per 1k prompt tokens on
+top of ``--latency``), then times End Interview — once the way it used to
+work (extraction, scoring and the summary each over the whole
+conversation), once as shipped (per-phase summaries made on Next Phase,
+only the open phase handled at the end, notes reduced) — and the largest
+prompt End Interview sends.
+
+    python benchmarks/bench_summary.py --turns 2 8 32
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import llm, tasks  # noqa: E402
+from engine.extraction import conversation_text, coordinator_summary, extract_fields, score_phase  # noqa: E402
+from engine.flows import multi_agent  # noqa: E402
+from engine.mock import MockLLM  # noqa: E402
+
+ANSWER = ("I work as an accountant in Pune, and on weekends I help my niece with maths. "
+          "I think I could manage two evenings a week if the sessions are online.")
+
+
+class PromptSizedLLM(MockLLM):
+    """Mock whose latency is ``latency + per_1k * prompt_tokens / 1000``; remembers the largest prompt."""
+
+    def __init__(self, latency, per_1k):
+        super().__init__(0.0)
+        self.base, self.per_1k = latency, per_1k
+        self.largest = 0
+
+    def __call__(self, messages, model, **kwargs):
+        tokens = llm.estimate_tokens(messages)
+        self.largest = max(self.largest, tokens)
+        time.sleep(self.base + self.per_1k * tokens / 1000)
+        return super().__call__(messages, model, **kwargs)
+
+
+def interview(turns, last):
+    state = multi_agent.new_state()
+    for pid in multi_agent.PHASES:
+        for t in range(turns if pid < len(multi_agent.PHASES) else last):
+            multi_agent.step(state, f"({pid}.{t}) {ANSWER}")
+        if pid < len(multi_agent.PHASES):
+            multi_agent.next_phase(state)
+    tasks.wait(state.session_id)  # Next Phase work finishes while the coordinator reads
+    return state
+
+
+def old_end_interview(state):
+    conv_text = conversation_text(state.messages)
+    extract_fields(conv_text)
+    score_phase(state.phase, conv_text, multi_agent.RUBRICS[state.phase])
+    coordinator_summary(conv_text, multi_agent.SUMMARY_INSTRUCTIONS)
+
+
+def timed(backend, fn):
+    backend.largest = 0
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started, backend.largest
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, nargs="+", default=[2, 8, 32], help="volunteer turns in each phase but the last")
+    parser.add_argument("--last", type=int, default=2, help="volunteer turns in the last phase")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--per-1k", type=float, default=0.1)
+    args = parser.parse_args()
+    backend = PromptSizedLLM(args.latency, args.per_1k)
+    llm.set_backend(backend)
+    for turns in args.turns:
+        state = interview(turns, args.last)
+        old_s, old_tokens = timed(backend, lambda: old_end_interview(state))
+        new_s, new_tokens = timed(backend, lambda: multi_agent.end_interview(state))
+        print(f"{len(state.messages):4} messages: End Interview over the whole conversation {old_s * 1000:6.0f} ms "
+              f"(largest prompt {old_tokens:5} tokens) | as shipped {new_s * 1000:6.0f} ms "
+              f"(largest prompt {new_tokens:5} tokens)")
+
+
+if __name__ == "__main__":
+    main()
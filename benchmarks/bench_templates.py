@@ -0,0 +1,85 @@
+"""
+Template turn benchmark.
+
+Runs a scripted interview through every flow with the mock LLM and reports
+how many assistant turns were served from templates vs written by the LLM,
+and the LLM calls spent — once as shipped and once with
+``paraphrase_templates`` on, to show what the rewrite costs.
+
+    python benchmarks/bench_templates.py --interviews 20
+"""
+import argparse
+import os
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import distill, llm  # noqa: E402
+from engine.flows import multi_agent, phase, question_bank, scored, selection  # noqa: E402
+from engine.mock import MockLLM  # noqa: E402
+
+ANSWERS = ["I'm Asha, doing well", "I work in a bank and love kids", "yes that's clear", "weekends work for me",
+           "How long is a session?"]
+
+
+def phase_interview(flow, paraphrase):
+    state = flow.new_state()
+    state.options["paraphrase_templates"] = paraphrase
+    for answer in ANSWERS:
+        flow.step(state, answer)
+        flow.next_phase(state)
+    return state
+
+
+def selection_interview(paraphrase):
+    state = selection.new_state()
+    state.options["paraphrase_templates"] = paraphrase
+    for answer in ["Yes, let's start", "I tutored kids in maths", "yes", "yes I can do 2 hours a week", "yes"] * 3:
+        if state.done:
+            break
+        selection.step(state, answer)
+    return state
+
+
+def question_bank_interview(paraphrase):
+    state = question_bank.new_state()
+    state.options["paraphrase_templates"] = paraphrase
+    while not state.done:
+        question_bank.step(state, "sure")
+    return state
+
+
+FLOWS = {
+    "phase": lambda p: phase_interview(phase, p),
+    "multi_agent": lambda p: phase_interview(multi_agent, p),
+    "scored": lambda p: phase_interview(scored, p),
+    "selection": selection_interview,
+    "question_bank": question_bank_interview,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--interviews", type=int, default=20)
+    args = parser.parse_args()
+    distill.LABEL_LOG = ""
+    backend = MockLLM()
+    llm.set_backend(backend)
+
+    for paraphrase in (False, True):
+        print(f"paraphrase_templates={paraphrase}")
+        for name, run in FLOWS.items():
+            backend.calls = 0
+            turns = Counter()
+            for _ in range(args.interviews):
+                turns.update(run(paraphrase).meta.get("turns", {}))
+            n = args.interviews
+            total = sum(turns.values())
+            print(f"  {name:14} {total / n:5.1f} assistant turns: template {turns['template'] / n:4.1f}, "
+                  f"paraphrased {turns['paraphrased'] / n:4.1f}, llm {turns['llm'] / n:4.1f} "
+                  f"| llm calls/interview {backend.calls / n:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
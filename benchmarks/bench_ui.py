@@ -0,0 +1,126 @@
+"""
+Chat rendering benchmark: chat_message loop + st.rerun vs fragment + transcript.
+
+Drives two minimal Streamlit chat apps with ``streamlit.testing`` for
+``--turns`` replies and prints, every few turns, the script runs per reply,
+the bytes of elements the run produced (what goes over the websocket) and
+the server time per reply. With the loop both grow with the transcript;
+with the fragment and the append-only transcript they stay flat.
+``streamlit.testing`` reruns the whole script even for a widget inside a
+fragment, so the fragment numbers are an upper bound (one full run where
+the browser gets a fragment-only run).
+
+It then drives screening_agent.py itself (scored flow, mock LLM: extraction
+and scores change on nearly every reply) and prints the same numbers, so a
+reply that still triggers a full-app rerun shows up as 2 script runs.
+
+    python benchmarks/bench_ui.py --turns 40
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+
+def loop_app():
+    import streamlit as st
+
+    st.session_state.setdefault("messages", [{"role": "assistant", "content": "Hi! May I know your name?"}])
+    st.session_state["runs"] = st.session_state.get("runs", 0) + 1
+    for msg in st.session_state.messages:
+        st.chat_message(msg["role"]).markdown(msg["content"])
+    user_input = st.chat_input("reply")
+    if user_input:
+        st.session_state.messages.append({"role": "user", "content": user_input})
+        st.session_state.messages.append({"role": "assistant", "content": f"Thanks! You said: {user_input}"})
+        st.rerun()
+
+
+def fragment_app():
+    import streamlit as st
+
+    from ui.chat import transcript
+
+    st.session_state.setdefault("messages", [{"role": "assistant", "content": "Hi! May I know your name?"}])
+    st.session_state["runs"] = st.session_state.get("runs", 0) + 1
+
+    @st.fragment
+    def chat():
+        box = st.container()
+        user_input = st.chat_input("reply")
+        if user_input:
+            st.session_state.messages.append({"role": "user", "content": user_input})
+            st.session_state.messages.append({"role": "assistant", "content": f"Thanks! You said: {user_input}"})
+        with box:
+            transcript(st.session_state.messages)
+
+    chat()
+
+
+def scored_app():
+    import json
+    import os
+    import runpy
+
+    import streamlit as st
+
+    from engine import llm, records
+    from engine.mock import MockLLM
+
+    if "runs" not in st.session_state:
+        mock = MockLLM()
+
+        def scoring_changes(messages, model, **kwargs):
+            # like a real model, the phase score notes differ from reply to reply
+            if "evaluator" in messages[0]["content"]:
+                return json.dumps({"score": 3 + mock.calls % 3, "notes": f"Observation {mock.calls}."})
+            return mock(messages, model, **kwargs)
+
+        llm.set_backend(scoring_changes)
+        records.save_state = lambda *a, **k: (None, None)  # no files from a benchmark
+    st.session_state["runs"] = st.session_state.get("runs", 0) + 1
+    runpy.run_path(os.path.join(os.environ["BENCH_ROOT"], "screening_agent.py"), run_name="__main__")
+
+
+def element_bytes(node):
+    proto = getattr(node, "proto", None)
+    total = proto.ByteSize() if hasattr(proto, "ByteSize") else 0
+    children = getattr(node, "children", None)
+    if isinstance(children, dict):
+        total += sum(element_bytes(c) for c in children.values())
+    return total
+
+
+def drive(app, turns, every):
+    at = AppTest.from_function(app, default_timeout=30)
+    at.run()
+    rows = []
+    for turn in range(1, turns + 1):
+        runs = at.session_state["runs"]
+        t0 = time.perf_counter()
+        at.chat_input[0].set_value(f"reply {turn}: I teach maths on weekends and enjoy it a lot").run()
+        elapsed = time.perf_counter() - t0
+        if turn % every == 0:
+            rows.append((turn, at.session_state["runs"] - runs, element_bytes(at._tree), elapsed))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--every", type=int, default=10)
+    args = parser.parse_args()
+    os.environ["BENCH_ROOT"] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for label, app in (("loop + st.rerun", loop_app), ("fragment + transcript", fragment_app),
+                       ("screening_agent.py (scored flow)", scored_app)):
+        print(label)
+        for turn, runs, size, elapsed in drive(app, args.turns, args.every):
+            print(f"  turn {turn:3}: {runs} full script runs, {size:6} bytes of elements, {1000 * elapsed:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Worker-pool throughput benchmark.
+
+Pushes ``--sessions`` x ``--turns`` messages through a WorkerPool for each
+worker count in ``--workers`` and prints throughput. The mock LLM latency is
+0 by default so the run is dominated by engine CPU work (prompt assembly,
+JSON, transcript handling). Whether more workers speed that up depends on
+the cores available; no multi-core result has been recorded yet, and on a
+single core extra workers only add overhead. Also restarts one worker
+mid-run to check drain + rehydration keeps every session's turns in order.
+
+    python benchmarks/bench_workers.py --workers 1,2,4 --sessions 2000 --turns 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.store import SessionStore  # noqa: E402
+from engine.workers import WorkerPool  # noqa: E402
+
+FLOWS = ("selection", "phase")
+
+
+def run(n_workers, args):
+    spill_dir = tempfile.mkdtemp(prefix="bench_workers_")
+    pool = WorkerPool(n_workers, spill_dir, threads=8,
+                      mock_latency=args.latency, max_sessions=args.max_sessions)
+    # warm up: spawn + imports are not part of the measurement
+    for f in [pool.submit(f"warm{i}", "hi") for i in range(n_workers * 4)]:
+        f.result()
+    started = time.perf_counter()
+    futures = []
+    for turn in range(args.turns):
+        for i in range(args.sessions):
+            futures.append(pool.submit(f"s{i}", f"turn {turn}", FLOWS[i % 2]))
+        if turn == args.turns // 2 and args.restart:
+            pool.restart_worker(pool.worker_ids[0])
+    results = [f.result() for f in futures]
+    elapsed = time.perf_counter() - started
+
+    owners = {}
+    for r in results:
+        owners.setdefault(r["session_id"], set()).add(r["worker"])
+    moved = sum(1 for w in owners.values() if len(w) > 1)
+    pool.close()
+
+    # every worker spilled on close: the transcripts must hold each session's turns in send order
+    store = SessionStore(spill_dir)
+    expected = [f"turn {t}" for t in range(args.turns)]
+    for i in range(args.sessions):
+        sent = [m["content"] for m in store.get(f"s{i}").messages if m["role"] == "user"]
+        assert sent == expected, (i, sent)
+    total = args.sessions * args.turns
+    print(f"workers={n_workers} turns={total} elapsed={elapsed:.2f}s throughput={total / elapsed:.0f} turns/s "
+          f"sessions_on_multiple_workers={moved} ordering=OK")
+    return total / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--max-sessions", type=int, default=None)
+    parser.add_argument("--restart", action="store_true", help="restart one worker halfway through")
+    args = parser.parse_args()
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    counts = [int(x) for x in args.workers.split(",")]
+    print(f"cores={cores}")
+    if cores < max(counts):
+        print(f"  note: only {cores} core(s) available; worker counts above {cores} can't show a speed-up here")
+    baseline = None
+    for n in counts:
+        tput = run(n, args)
+        baseline = baseline or tput
+        print(f"  speedup vs first: {tput / baseline:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
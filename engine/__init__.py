@@ -0,0 +1,12 @@
+"""
+Headless screening engine.
+
+Everything in here is plain Python: no Streamlit, no import-time side effects.
+Each conversation lives in a ``ConversationState`` and every flow exposes
+``step(state, user_text) -> (state, outputs)`` so the same logic can back the
+Streamlit views, a server, a worker or a benchmark.
+"""
+from engine.state import ConversationState
+from engine.flows import FLOWS, get_flow
+
+__all__ = ["ConversationState", "FLOWS", "get_flow"]
@@ -0,0 +1,98 @@
+"""
+Single entry point for the screening apps, server and batch jobs.
+
+    python -m engine ui multi_agent [streamlit options]
+    python -m engine serve --port 8080 [--processes 4 ...]
+    python -m engine rescore --records-dir records
+    python -m engine bench server [--sessions 1000 ...]
+    python -m engine migrate --records-dir records
+
+Each subcommand imports only what it needs: ``serve``, ``rescore`` and
+``migrate`` never import Streamlit, and ``ui`` doesn't import the server.
+Everything after the subcommand is passed to it (``--help`` included).
+"""
+import argparse
+import os
+import runpy
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# UI flavour -> Streamlit script (flavours are named after the flow they run)
+APPS = {
+    "scored": "screening_agent.py",
+    "phase": "screening_agent_phase.py",
+    "multi_agent": "screening_multi_agent.py",
+    "question_bank": "screening_agent_app.py",
+    "selection": os.path.join("src", "agents", "selection", "selection_agent.py"),
+    "basic": "app.py",
+}
+BENCH_DIR = os.path.join(ROOT, "benchmarks")
+
+
+def run_ui(argv):
+    parser = argparse.ArgumentParser(prog="python -m engine ui",
+                                     description="Run a Streamlit app; extra options go to `streamlit run`.")
+    parser.add_argument("flavour", choices=sorted(APPS))
+    args, streamlit_args = parser.parse_known_args(argv)
+    from streamlit.web import cli as stcli
+    sys.argv = ["streamlit", "run", os.path.join(ROOT, APPS[args.flavour]), *streamlit_args]
+    return stcli.main()
+
+
+def run_serve(argv):
+    from engine import server
+    return server.main(argv)
+
+
+def run_rescore(argv):
+    from engine import rescore
+    return rescore.main(argv)
+
+
+def bench_names():
+    return sorted(name[len("bench_"):-len(".py")] for name in os.listdir(BENCH_DIR)
+                  if name.startswith("bench_") and name.endswith(".py"))
+
+
+def run_bench(argv):
+    parser = argparse.ArgumentParser(prog="python -m engine bench",
+                                     description="Run benchmarks/bench_<name>.py; extra options go to it.")
+    parser.add_argument("name", choices=bench_names())
+    args, bench_args = parser.parse_known_args(argv)
+    path = os.path.join(BENCH_DIR, f"bench_{args.name}.py")
+    sys.argv = [path, *bench_args]
+    runpy.run_path(path, run_name="__main__")
+
+
+def run_migrate(argv):
+    from engine import records
+    parser = argparse.ArgumentParser(prog="python -m engine migrate",
+                                     description=f"Upgrade saved records to layout version {records.RECORD_VERSION}.")
+    parser.add_argument("--records-dir", default=records.RECORDS_DIR)
+    parser.add_argument("--dry-run", action="store_true", help="only count what would change")
+    args = parser.parse_args(argv)
+    print(f"migrate: {records.migrate_records(args.records_dir, args.dry_run)}")
+
+
+COMMANDS = {
+    "ui": (run_ui, "run a Streamlit app (flavours: " + ", ".join(APPS) + ")"),
+    "serve": (run_serve, "serve the webhook API"),
+    "rescore": (run_rescore, "re-score saved interviews"),
+    "bench": (run_bench, "run a benchmark from benchmarks/"),
+    "migrate": (run_migrate, "upgrade saved records to the current layout"),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m engine", description=__doc__.strip().splitlines()[0],
+                                     epilog="\n".join(f"  {n:8} {h}" for n, (_, h) in COMMANDS.items()),
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=COMMANDS, metavar="command")
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+    return COMMANDS[args.command][0](args.args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
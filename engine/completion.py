@@ -0,0 +1,173 @@
+# ---------------------------
+# Phase-completion detection for unattended sessions
+# ---------------------------
+# The phase flows move on when a coordinator clicks "Next Phase". Sessions
+# nobody is watching (the webhook server, or the apps' "Advance phases
+# automatically" switch) ask ``ready`` after each volunteer message instead.
+# It decides from cheap features first:
+#   * volunteer turns in the phase (``min_turns`` / ``max_turns``),
+#   * the rules.classify intent of the last reply (an open question holds
+#     the phase; ``ends_on`` intents close it, e.g. "yes, clear"),
+#   * coverage of the phase's required fields — extracted, or cued by
+#     keywords in the volunteer's own replies when extraction hasn't run yet,
+#   * the phase plugin's own completion rule (multi-agent flow),
+# and asks the model a one-word YES/NO only when those leave it unsure.
+# The last phase is never left automatically: its completion is recorded in
+# ``state.meta["interview_complete"]`` (with the interview's turn count in
+# ``stats()``) for the coordinator to close.
+import re
+import textwrap
+import threading
+
+from engine import llm, rules, summaries
+from engine.extraction import conversation_text
+from engine.profile import Profile
+
+# process-wide default; the webhook server turns it on, options["auto_advance"] overrides per session
+AUTO_ADVANCE = False
+# phase messages the YES/NO check reads
+ASK_HISTORY = 12
+
+FIELD_CUES = {
+    "name": r"my name is|my name's|call me|this is|myself|mera naam",
+    "experience": r"teach\w*|taught|tutor\w*|volunteer\w*|experience\w*|mentor\w*|worked|work as|working|padhaya",
+    "motivation": r"want to|wanted to|love|enjoy|give back|help\w*|passion\w*|because|inspir\w*",
+    "availability": r"mondays?|tuesdays?|wednesdays?|thursdays?|fridays?|saturdays?|sundays?|weekends?|weekdays?"
+                    r"|mornings?|afternoons?|evenings?|nights?|\d{1,2}\s*(?:am|pm)|once a week|twice a week|daily",
+    "subjects": r"maths?|mathematics|science|english|hindi|history|geography|computers?|art|music",
+    "languages": r"hindi|english|marathi|tamil|telugu|kannada|bengali|gujarati|punjabi|urdu|malayalam",
+    "concerns": r"worried|worry|concern\w*|afraid|nervous|fear\w*|not sure|unsure",
+}
+_CUES = {name: re.compile(rf"\b(?:{pattern})\b", re.IGNORECASE) for name, pattern in FIELD_CUES.items()}
+
+ASK_PROMPT = textwrap.dedent("""
+You check whether one phase of a volunteer screening interview is finished.
+Phase goal: {goal}
+
+Say YES if the goal is met and the interviewer can move on to the next phase.
+Say NO if something in the goal is still open or the volunteer is waiting for an answer.
+
+Return ONLY one word: YES or NO.
+""").strip()
+
+_lock = threading.Lock()
+_metrics = {"checks": 0, "by_rules": 0, "by_llm": 0, "advanced": 0, "interviews": 0, "interview_turns": 0}
+
+
+class Phase:
+    """When a phase counts as complete: required fields, turn bounds, closing intents."""
+
+    __slots__ = ("required", "min_turns", "max_turns", "ends_on")
+
+    def __init__(self, required=(), min_turns=1, max_turns=6, ends_on=()):
+        self.required = tuple(required)
+        self.min_turns = min_turns
+        self.max_turns = max_turns
+        self.ends_on = tuple(ends_on)
+
+    def __repr__(self):
+        return f"Phase(required={self.required}, turns={self.min_turns}..{self.max_turns}, ends_on={self.ends_on})"
+
+
+def enabled(state):
+    return state.options.get("auto_advance", AUTO_ADVANCE)
+
+
+def coverage(state, fields, replies):
+    """Share of ``fields`` known: extracted already, or cued in the volunteer's ``replies``."""
+    if not fields:
+        return 1.0
+    text = "\n".join(replies)
+    extracted = state.extracted
+    covered = 0
+    for name in fields:
+        if isinstance(extracted, Profile) and name in extracted.INDEX and extracted.filled(name):
+            covered += 1
+        elif isinstance(extracted, dict) and extracted.get(name):
+            covered += 1
+        elif name in _CUES and _CUES[name].search(text):
+            covered += 1
+    return covered / len(fields)
+
+
+def _count(*keys):
+    with _lock:
+        for key in keys:
+            _metrics[key] += 1
+
+
+def _ask(messages, goal):
+    prompt = [
+        {"role": "system", "content": ASK_PROMPT.format(goal=goal)},
+        {"role": "user", "content": conversation_text(messages[-ASK_HISTORY:])},
+    ]
+    try:
+        out = llm.chat(prompt, temperature=0, max_tokens=2)
+    except Exception:
+        return False  # stay in the phase; max_turns still moves it on
+    return (out or "").strip().upper().startswith("YES")
+
+
+def check(state, spec, goal, rule=None):
+    """
+    Is the current phase complete? ``spec`` is its Phase, ``goal`` the text
+    the YES/NO check is given, ``rule(state, messages)`` an optional
+    True/False/None completion rule (phase plugins).
+    """
+    _count("checks")
+    messages = summaries.phase_messages(state, state.phase)
+    replies = [m["content"] for m in messages if m["role"] == "user"]
+    turns = len(replies)
+    if turns < spec.min_turns:
+        verdict = False
+    elif turns >= spec.max_turns:
+        verdict = True
+    else:
+        intent, _ = rules.classify(replies[-1])
+        verdict = rule(state, messages) if rule is not None else None
+        if intent == "QUERY":
+            verdict = False  # answer the volunteer's question first
+        elif verdict is None and intent in spec.ends_on:
+            verdict = True
+        elif verdict is None and spec.required:
+            covered = coverage(state, spec.required, replies)
+            if covered == 1.0:
+                verdict = True
+            elif covered == 0.0 and turns <= spec.min_turns:
+                verdict = False
+    if verdict is not None:
+        _count("by_rules")
+        return verdict
+    _count("by_llm")
+    return _ask(messages, goal)
+
+
+def ready(state, spec, goal, last_phase, rule=None):
+    """
+    For unattended sessions: True when the flow should move to the next phase
+    now. Sets ``state.meta["phase_complete"]``; completing ``last_phase``
+    marks the interview complete instead of advancing.
+    """
+    if not enabled(state) or state.meta.get("interview_complete"):
+        return False
+    done = check(state, spec, goal, rule)
+    state.meta["phase_complete"] = done
+    if not done:
+        return False
+    if state.phase >= last_phase:
+        state.meta["interview_complete"] = True
+        turns = sum(1 for m in state.messages if m["role"] == "user")
+        with _lock:
+            _metrics["interviews"] += 1
+            _metrics["interview_turns"] += turns
+        return False
+    _count("advanced")
+    return True
+
+
+def stats():
+    with _lock:
+        data = dict(_metrics)
+    data["avg_turns_per_interview"] = round(data["interview_turns"] / data["interviews"], 1) if data["interviews"] else None
+    data["llm_share"] = round(data["by_llm"] / data["checks"], 3) if data["checks"] else None
+    return data
@@ -0,0 +1,71 @@
+# ---------------------------
+# Relevance-based context selection under a token budget
+# ---------------------------
+# Instead of "the last N messages", pick the history that matters for this
+# call: the question being answered is always kept, the latest message
+# next, then earlier turns ranked by keyword relevance (ties to the more
+# recent turn) until the budget is spent. Output keeps conversation order.
+import re
+
+from engine.llm import estimate_tokens
+
+
+def message_tokens(m):
+    return estimate_tokens([m])
+
+
+def keyword_pattern(keywords):
+    # keywords match at the start of a word ("teach" hits "teaching", "age" doesn't hit "message")
+    return re.compile(r"\b(?:" + "|".join(re.escape(k) for k in sorted(set(keywords), key=len, reverse=True)) + ")")
+
+
+def relevance(content, pattern):
+    return len(set(pattern.findall(content.lower())))
+
+
+def last_assistant_index(history):
+    for i in range(len(history) - 1, -1, -1):
+        if history[i]["role"] == "assistant":
+            return i
+    return None
+
+
+def select_context(history, budget, keywords=(), recent=1):
+    """
+    Subset of ``history`` (same order) within ``budget`` tokens: the last
+    assistant question first, then the ``recent`` latest messages, then
+    earlier messages that hit ``keywords``. Messages with no keyword hit
+    outside the recent window (small talk) are left out.
+    """
+    if not history:
+        return []
+    n = len(history)
+    picked, used = set(), 0
+
+    def take(i):
+        nonlocal used
+        if i in picked:
+            return True
+        cost = message_tokens(history[i])
+        if used + cost > budget and picked:
+            return False
+        picked.add(i)
+        used += cost
+        return True
+
+    question = last_assistant_index(history)
+    if question is not None:
+        take(question)
+    for i in range(n - 1, max(-1, n - 1 - recent), -1):
+        take(i)
+    if keywords:
+        pattern = keyword_pattern(keywords)
+        ranked = sorted(
+            ((relevance(history[i]["content"], pattern), i) for i in range(n) if i not in picked),
+            reverse=True,
+        )
+        for score, i in ranked:
+            if score == 0:
+                break
+            take(i)
+    return [history[i] for i in sorted(picked)]
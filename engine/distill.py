@@ -0,0 +1,248 @@
+# ---------------------------
+# Distilled local intent classifier
+# ---------------------------
+# With ``INTENT_LABEL_LOG`` set, the selection flow logs every LLM-labelled
+# turn as
+#   {"state", "last_prompt", "message", "intent"}
+# to that file (off by default: the rows are volunteers' own words). ``train`` fits a multinomial logistic regression on hashed
+# word / bigram / char-trigram features (NumPy only), and the flow asks the
+# trained model first, falling back to the LLM when it is not confident.
+# NumPy is imported inside the functions that use it, so importing the module stays cheap.
+#
+#   INTENT_LABEL_LOG=records/intent_labels.jsonl streamlit run src/agents/selection/selection_agent.py
+#   python -m engine.distill --labels records/intent_labels.jsonl --out records/intent_model.npz
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+
+LABEL_LOG = os.getenv("INTENT_LABEL_LOG", "")
+MODEL_PATH = os.getenv("INTENT_MODEL", os.path.join("records", "intent_model.npz"))
+DIM = 1 << 15
+
+_WORD = re.compile(r"\w+")
+_log_lock = threading.Lock()
+_model = None
+_model_loaded = False
+TIERS = Counter()
+
+
+# ---------------------------
+# Label logging
+# ---------------------------
+def log_label(state_name, last_prompt, message, intent, path=None):
+    """Append one LLM-labelled turn; nothing is logged unless ``INTENT_LABEL_LOG`` is set."""
+    path = LABEL_LOG if path is None else path
+    if not path or not intent:
+        return
+    row = json.dumps({"state": state_name, "last_prompt": last_prompt or "", "message": message,
+                      "intent": intent}, ensure_ascii=False)
+    with _log_lock:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(row + "\n")
+
+
+def load_labels(path=None):
+    rows = []
+    with open(path or LABEL_LOG, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                rows.append(json.loads(line))
+    return rows
+
+
+# ---------------------------
+# Features
+# ---------------------------
+def features(message, state_name="", last_prompt="", dim=DIM):
+    """Hashed feature indices and values for one turn (crc32 so they are stable across processes)."""
+    import numpy as np
+    words = _WORD.findall(message.lower())
+    keys = [f"s:{state_name}"]
+    keys += [f"w:{w}" for w in words]
+    keys += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+    for w in words:
+        padded = f"#{w}#"
+        keys += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    keys += [f"p:{w}" for w in _WORD.findall((last_prompt or "").lower())]
+    counts = Counter(zlib.crc32(k.encode()) % dim for k in keys)
+    idx = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    val = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+    return idx, val / np.sqrt((val * val).sum())
+
+
+def _batch(rows, dim):
+    import numpy as np
+    cols, vals, offsets = [], [], []
+    n = 0
+    for r in rows:
+        idx, val = features(r["message"], r.get("state", ""), r.get("last_prompt", ""), dim)
+        offsets.append(n)
+        cols.append(idx)
+        vals.append(val)
+        n += len(idx)
+    return np.concatenate(cols), np.concatenate(vals), np.array(offsets)
+
+
+# ---------------------------
+# Model
+# ---------------------------
+class IntentModel:
+
+    def __init__(self, labels, dim=DIM, weights=None, bias=None):
+        import numpy as np
+        self.labels = list(labels)
+        self.label_index = {l: i for i, l in enumerate(self.labels)}
+        self.dim = dim
+        self.W = weights if weights is not None else np.zeros((dim, len(self.labels)))
+        self.b = bias if bias is not None else np.zeros(len(self.labels))
+
+    def proba(self, message, state_name="", last_prompt="", allowed=None):
+        import numpy as np
+        idx, val = features(message, state_name, last_prompt, self.dim)
+        z = val @ self.W[idx] + self.b
+        if allowed is not None:
+            mask = np.full(len(self.labels), -np.inf)
+            for label in allowed:
+                i = self.label_index.get(label)
+                if i is not None:
+                    mask[i] = 0.0
+            z = z + mask
+        z = np.exp(z - z.max())
+        return z / z.sum()
+
+    def predict(self, message, state_name="", last_prompt="", allowed=None):
+        """Return (intent, probability)."""
+        p = self.proba(message, state_name, last_prompt, allowed)
+        i = int(p.argmax())
+        return self.labels[i], float(p[i])
+
+    def save(self, path):
+        import numpy as np
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(path, W=self.W, b=self.b, labels=np.array(self.labels), dim=self.dim)
+
+    @classmethod
+    def load(cls, path):
+        import numpy as np
+        data = np.load(path)
+        return cls([str(l) for l in data["labels"]], int(data["dim"]), data["W"], data["b"])
+
+
+def train(rows, dim=DIM, epochs=200, lr=0.5, l2=1e-4):
+    """Full-batch softmax regression with Adam over sparse hashed features."""
+    import numpy as np
+    labels = sorted({r["intent"] for r in rows})
+    model = IntentModel(labels, dim)
+    cols, vals, offsets = _batch(rows, dim)
+    rows_of = np.repeat(np.arange(len(rows)), np.diff(np.append(offsets, len(cols))))
+    y = np.array([model.label_index[r["intent"]] for r in rows])
+    Y = np.eye(len(labels))[y]
+    n, k = len(rows), len(labels)
+
+    mW, vW = np.zeros_like(model.W), np.zeros_like(model.W)
+    mb, vb = np.zeros(k), np.zeros(k)
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    for t in range(1, epochs + 1):
+        z = np.add.reduceat(model.W[cols] * vals[:, None], offsets, axis=0) + model.b
+        z = np.exp(z - z.max(axis=1, keepdims=True))
+        G = (z / z.sum(axis=1, keepdims=True) - Y) / n
+        gW = np.empty_like(model.W)
+        for c in range(k):
+            gW[:, c] = np.bincount(cols, weights=G[rows_of, c] * vals, minlength=dim)
+        gW += l2 * model.W
+        gb = G.sum(axis=0)
+        for p, g, m, v in ((model.W, gW, mW, vW), (model.b, gb, mb, vb)):
+            m *= beta1
+            m += (1 - beta1) * g
+            v *= beta2
+            v += (1 - beta2) * g * g
+            p -= lr * (m / (1 - beta1 ** t)) / (np.sqrt(v / (1 - beta2 ** t)) + eps)
+    return model
+
+
+def split(rows, holdout=0.2, seed=0):
+    """(train, held_out) with every copy of a message on the same side, so "ok" isn't scored on itself."""
+    groups = {}
+    for r in rows:
+        groups.setdefault(" ".join(_WORD.findall(r["message"].lower())), []).append(r)
+    keys = sorted(groups)
+    random.Random(seed).shuffle(keys)
+    cut = int(len(keys) * (1 - holdout))
+    return ([r for k in keys[:cut] for r in groups[k]],
+            [r for k in keys[cut:] for r in groups[k]])
+
+
+def evaluate(model, rows, threshold=0.85):
+    """Accuracy against held-out LLM labels, overall and on the confident subset."""
+    correct = confident = confident_correct = 0
+    t0 = time.perf_counter()
+    for r in rows:
+        intent, p = model.predict(r["message"], r.get("state", ""), r.get("last_prompt", ""))
+        hit = intent == r["intent"]
+        correct += hit
+        if p >= threshold:
+            confident += 1
+            confident_correct += hit
+    elapsed = time.perf_counter() - t0
+    n = max(1, len(rows))
+    return {
+        "n": len(rows),
+        "accuracy": correct / n,
+        "coverage": confident / n,
+        "accuracy_confident": confident_correct / confident if confident else None,
+        "ms_per_message": 1000 * elapsed / n,
+    }
+
+
+# ---------------------------
+# Serving
+# ---------------------------
+def get_model():
+    """The trained model at ``MODEL_PATH``, loaded once; None when there isn't one."""
+    global _model, _model_loaded
+    if not _model_loaded:
+        _model = IntentModel.load(MODEL_PATH) if os.path.exists(MODEL_PATH) else None
+        _model_loaded = True
+    return _model
+
+
+def set_model(model):
+    global _model, _model_loaded
+    _model, _model_loaded = model, True
+
+
+def stats():
+    return dict(TIERS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the local intent classifier from logged LLM labels")
+    parser.add_argument("--labels", default=LABEL_LOG or None, required=not LABEL_LOG,
+                        help="label log to train on (default: $INTENT_LABEL_LOG)")
+    parser.add_argument("--out", default=MODEL_PATH)
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument("--threshold", type=float, default=0.85)
+    parser.add_argument("--epochs", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=DIM)
+    args = parser.parse_args()
+
+    train_rows, held_out = split(load_labels(args.labels), args.holdout)
+    t0 = time.perf_counter()
+    model = train(train_rows, dim=args.dim, epochs=args.epochs)
+    print(f"trained on {len(train_rows)} labels ({len(model.labels)} intents) in {time.perf_counter() - t0:.1f}s")
+    if held_out:
+        print("held-out:", json.dumps(evaluate(model, held_out, args.threshold)))
+    model.save(args.out)
+    print(f"saved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
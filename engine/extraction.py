@@ -0,0 +1,112 @@
+# ---------------------------
+# Extraction, scoring and summaries shared by the phase flows
+# ---------------------------
+import json
+import textwrap
+
+from engine import llm
+from engine.jsonparse import chat_json
+from engine.messages import MessageLog
+
+EXTRACT_SCHEMA = {
+    "name": "string?", "experience": "string?", "languages": "list?", "subjects": "list?",
+    "availability": "string?", "motivation": "string?", "concerns": "string?",
+}
+SCORE_SCHEMA = {"score": "number", "notes": "string?"}
+
+
+def conversation_text(messages):
+    if isinstance(messages, MessageLog):
+        return messages.text()  # cached, only new turns are rendered
+    return "\n\n".join(f"{m['role']}: {m['content']}" for m in messages if m.get("role") != "system")
+
+
+# Extraction prompt (returns JSON only)
+def extract_fields(conversation_text):
+    prompt = textwrap.dedent(f"""
+    Extract the following fields from the conversation below and return VALID JSON ONLY:
+    - name (string or null)
+    - experience (short string or null)
+    - languages (list of strings)
+    - subjects (list of strings)
+    - availability (short string)
+    - motivation (short string)
+    - concerns (short string or null)
+
+    Conversation:
+    \"\"\"{conversation_text}\"\"\"
+    """).strip()
+    messages = [
+        {"role": "system", "content": "You are a JSON extractor. Output VALID JSON only."},
+        {"role": "user", "content": prompt},
+    ]
+    parsed, out = chat_json(messages, EXTRACT_SCHEMA, name="extract_fields", priority=llm.BACKGROUND)
+    # fallback: return raw under "raw"
+    return parsed if parsed is not None else {"raw": out}
+
+
+# Phase scoring (1-5) against a one-line rubric, returns JSON
+def score_phase(phase_id, conversation_text, rubric):
+    prompt = textwrap.dedent(f"""
+    Phase {phase_id}. Using the rubric: {rubric}
+    Evaluate the volunteer's responses in this conversation section and return VALID JSON ONLY:
+    {{
+      "score": <number between 1 and 5>,
+      "notes": "<one-sentence explanation>"
+    }}
+
+    Conversation:
+    \"\"\"{conversation_text}\"\"\"
+    """).strip()
+    messages = [
+        {"role": "system", "content": "You are an evaluator following the given rubric. Output VALID JSON only."},
+        {"role": "user", "content": prompt},
+    ]
+    # the schema normalizes a string score ("4", "4/5") to a float
+    parsed, out = chat_json(messages, SCORE_SCHEMA, name="score_phase", priority=llm.BACKGROUND)
+    return parsed if parsed is not None else {"raw": out}
+
+
+def coordinator_summary(conversation_text, instructions):
+    summary_prompt = f"{instructions}\n\nConversation:\n\"\"\"{conversation_text}\"\"\""
+    return llm.chat([
+        {"role": "system", "content": "You are a coordinator summarizer."},
+        {"role": "user", "content": summary_prompt},
+    ], priority=llm.BACKGROUND)
+
+
+PHASE_SUMMARY_INSTRUCTIONS = ("Summarise this phase of a volunteer screening for the coordinator in 2-3 short lines: "
+                              "what was learned, the volunteer's manner, and any concern. No recommendation yet.")
+
+
+def phase_summary(phase_name, conversation_text):
+    """Mini-summary of one phase's messages (the map step of the coordinator summary)."""
+    return coordinator_summary(conversation_text, f"Phase: {phase_name}.\n{PHASE_SUMMARY_INSTRUCTIONS}")
+
+
+def summary_from_notes(phase_notes, extracted, instructions):
+    """Coordinator summary from the per-phase notes and the extracted record (the reduce step)."""
+    prompt = (f"{instructions}\n\nPer-phase notes:\n{phase_notes}\n\n"
+              f"Extracted record:\n{json.dumps(extracted, ensure_ascii=False, default=str)}")
+    return llm.chat([
+        {"role": "system", "content": "You are a coordinator summarizer."},
+        {"role": "user", "content": prompt},
+    ], priority=llm.BACKGROUND)
+
+
+def compute_overall_recommendation(scores, phase_ids):
+    numeric_scores = []
+    for pid in phase_ids:
+        sc = scores.get(pid)
+        if isinstance(sc, dict) and isinstance(sc.get("score"), (int, float)):
+            numeric_scores.append(float(sc["score"]))
+    if not numeric_scores:
+        return {"recommendation": "Hold", "reason": "Insufficient numeric scores"}
+    avg = sum(numeric_scores) / len(numeric_scores)
+    if avg >= 4.0:
+        rec = "Recommend"
+    elif avg >= 2.5:
+        rec = "Hold / Re-screen"
+    else:
+        rec = "Not Recommended"
+    return {"avg": round(avg, 2), "recommendation": rec}
@@ -0,0 +1,255 @@
+# ---------------------------
+# Semantic FAQ answer cache
+# ---------------------------
+# Volunteer questions in the FAQ phase ("how long are sessions?", "do I get
+# lesson plans?") have fixed answers. Every known question variant is a row
+# of a NumPy matrix of hashed TF-IDF vectors (word unigrams/bigrams + char
+# trigrams, L2-normalised); a lookup is one matrix-vector product and an
+# argmax. Above ``THRESHOLD`` cosine similarity the stored answer is served;
+# below it the caller goes to the LLM and may ``learn`` the answer it got.
+# Only the curated answers are served to every session: an LLM reply can
+# carry the volunteer's own details, so a learned answer is only served back
+# to the session that learned it, and the least recently used ones are
+# dropped past ``MAX_LEARNED``. New shared answers go into ``CURATED``.
+# NumPy is imported when the cache is first built, not with the module.
+import re
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+
+from engine import rules
+
+DIM = 1 << 13
+THRESHOLD = 0.5
+MAX_LEARNED = 256
+FOLLOW_UP = "Anything else you'd like to know? 😊"
+
+_WORD = re.compile(r"\w+")
+_STOPWORDS = {"i", "a", "an", "the", "is", "are", "do", "does", "to", "of", "in", "for", "it", "will",
+              "be", "can", "my", "me", "you", "we", "there", "what", "how", "and", "or", "any"}
+
+# answers come from what the screening prompts already tell volunteers; nothing new is promised
+CURATED = [
+    (["how long are the sessions", "how long is each class", "session duration", "what is the class duration",
+      "kitne minute ki class hoti hai"],
+     "Sessions are short — about 30–45 minutes each."),
+    (["how many classes per week", "how often do I have to teach", "how many sessions a week",
+      "what is the frequency of classes", "hafte mein kitni class"],
+     "Usually 1–2 classes a week, at times that work for you."),
+    (["do I get lesson plans", "will you provide teaching material", "what do I teach from",
+      "is there a syllabus", "do I need to prepare content", "what about the syllabus"],
+     "Yes — you'll get textbooks, lesson plans and subject content in advance, so you don't have to prepare from scratch."),
+    (["is there any training", "will there be an orientation", "how will I be trained",
+      "what happens before I start teaching"],
+     "Yes — there's an orientation before you start, and a coordinator supports you throughout."),
+    (["how do the online classes work", "what technology do I need", "do I need a laptop",
+      "what device do I need", "how will the children see me", "what is the smart class setup",
+      "tech setup kya hai"],
+     "The school has a smart TV in the classroom; you teach remotely from your own device with an internet "
+     "connection. We help with tech if needed."),
+    (["what if I miss a class", "what if I can't make a session", "what happens if I am busy one week",
+      "can I skip a class sometimes"],
+     "That's okay — just let the team know as early as you can so the coordinator can plan for the class."),
+    (["do I need teaching experience", "I am not a teacher is that ok", "do I need to be qualified",
+      "what skills do I need"],
+     "You don't need to be a trained teacher — connection with children and patience matter more than teaching expertise."),
+    (["who will I be teaching", "which students will I teach", "where are the schools",
+      "what kind of children are in the class"],
+     "You'll be teaching school students, mostly in rural schools, through their smart-class."),
+    (["who do I contact if I have a problem", "will someone help me", "is there any support",
+      "who supports the volunteers"],
+     "A coordinator supports you throughout — with lesson plans, tech help and any questions you have."),
+]
+_CURATED_ANSWERS = {a for _, a in CURATED}
+
+
+def _keys(text):
+    words = _WORD.findall(text.lower())
+    content = [w for w in words if w not in _STOPWORDS] or words
+    keys = [f"w:{w}" for w in content]
+    keys += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+    for w in content:
+        padded = f"#{w}#"
+        keys += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    return keys
+
+
+def _hashed(text, dim=DIM):
+    return Counter(zlib.crc32(k.encode()) % dim for k in _keys(text))
+
+
+class FAQCache:
+
+    def __init__(self, entries=CURATED, threshold=THRESHOLD, dim=DIM, max_learned=MAX_LEARNED):
+        import numpy as np
+        self.threshold = threshold
+        self.dim = dim
+        self.max_learned = max_learned
+        self._lock = threading.Lock()
+        self.questions, self.answer_ids, self.answers, self.sources = [], [], [], []
+        # curated rows first, learned rows after them; capacity grows by doubling
+        self._rows = np.zeros((0, dim), dtype=np.float32)
+        self._curated = 0
+        self._lru = OrderedDict()  # learned row -> session, least recently used first
+        self._by_session = {}  # session -> its learned rows
+        self.idf = np.ones(dim, dtype=np.float32)
+        self.metrics = {"lookups": 0, "hits": 0, "misses": 0, "learned": 0, "evicted": 0,
+                        "lookup_seconds_total": 0.0}
+        for variants, answer in entries:
+            self._add(variants, answer, "curated")
+        self._rebuild()
+
+    @property
+    def matrix(self):
+        return self._rows[:len(self.questions)]
+
+    def _add(self, variants, answer, source):
+        self.answers.append(answer)
+        self.sources.append(source)
+        for q in variants:
+            self.questions.append(q)
+            self.answer_ids.append(len(self.answers) - 1)
+
+    def _rebuild(self):
+        # the curated rows; their IDF weights every later row and lookup
+        import numpy as np
+        rows = [_hashed(q, self.dim) for q in self.questions]
+        n = len(rows)
+        df = np.zeros(self.dim, dtype=np.float32)
+        for counts in rows:
+            df[list(counts)] += 1
+        self.idf = (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+        matrix = np.zeros((n, self.dim), dtype=np.float32)
+        for row, counts in enumerate(rows):
+            matrix[row, list(counts)] = 1 + np.log(np.fromiter(counts.values(), dtype=np.float32))
+        matrix *= self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self._rows = matrix / np.maximum(norms, 1e-9)
+        self._curated = n
+
+    def vector(self, text):
+        import numpy as np
+        counts = _hashed(text, self.dim)
+        v = np.zeros(self.dim, dtype=np.float32)
+        if counts:
+            idx = list(counts)
+            v[idx] = (1 + np.log(np.fromiter(counts.values(), dtype=np.float32))) * self.idf[idx]
+            v /= max(float(np.linalg.norm(v)), 1e-9)
+        return v
+
+    def _nearest_row(self, v, session):
+        # curated rows plus the rows ``session`` learned; other sessions' rows are never scored
+        row, sim = None, 0.0
+        if self._curated:
+            sims = self._rows[:self._curated] @ v
+            row = int(sims.argmax())
+            sim = float(sims[row])
+        own = self._by_session.get(session) if session is not None else None
+        if own:
+            sims = self._rows[own] @ v
+            best = int(sims.argmax())
+            if row is None or sims[best] > sim:
+                row, sim = own[best], float(sims[best])
+        return row, sim
+
+    def nearest(self, question, session=None):
+        """(answer, similarity, matched question) of the closest variant ``session`` may be served."""
+        v = self.vector(question)
+        with self._lock:
+            row, sim = self._nearest_row(v, session)
+            if row is None:
+                return None, 0.0, None
+            return self.answers[self.answer_ids[row]], sim, self.questions[row]
+
+    def lookup(self, question, session=None):
+        """The cached answer when the nearest question is similar enough, else None."""
+        t0 = time.perf_counter()
+        v = self.vector(question)
+        with self._lock:
+            row, sim = self._nearest_row(v, session)
+            hit = row is not None and sim >= self.threshold
+            if hit and row in self._lru:
+                self._lru.move_to_end(row)
+            self.metrics["lookups"] += 1
+            self.metrics["hits" if hit else "misses"] += 1
+            self.metrics["lookup_seconds_total"] += time.perf_counter() - t0
+            return self.answers[self.answer_ids[row]] if hit else None
+
+    def learn(self, question, answer, session):
+        """Store an LLM answer for a question the cache missed, for ``session`` only."""
+        import numpy as np
+        v = self.vector(question)
+        with self._lock:
+            if len(self._lru) >= self.max_learned:
+                # reuse the least recently used learned row
+                row, owner = self._lru.popitem(last=False)
+                rows = self._by_session[owner]
+                rows.remove(row)
+                if not rows:
+                    del self._by_session[owner]
+                self.questions[row] = question
+                self.answers[self.answer_ids[row]] = answer
+                self.metrics["evicted"] += 1
+            else:
+                row = len(self.questions)
+                if row == len(self._rows):
+                    grown = np.zeros((max(2 * row, 16), self.dim), dtype=np.float32)
+                    grown[:row] = self._rows
+                    self._rows = grown
+                self._add([question], answer, "learned")
+            self._rows[row] = v
+            self._lru[row] = session
+            self._by_session.setdefault(session, []).append(row)
+            self.metrics["learned"] += 1
+
+    def stats(self):
+        with self._lock:
+            m = dict(self.metrics)
+            m["entries"] = len(self.questions)
+            m["learned_entries"] = len(self._lru)
+        lookups = m["lookups"] or 1
+        m["hit_rate"] = round(m["hits"] / lookups, 3)
+        m["lookup_ms_avg"] = round(1000 * m.pop("lookup_seconds_total") / lookups, 3)
+        return m
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = FAQCache(CURATED)
+    return _cache
+
+
+def is_question(text):
+    return "?" in text or rules.classify(text)[0] == "QUERY"
+
+
+def answer(text, session=None):
+    """Cached answer for a volunteer question, or None (not a question / not similar enough)."""
+    if not text or not is_question(text):
+        return None
+    return get_cache().lookup(text, session)
+
+
+def reply(text, session=None):
+    """Full FAQ-phase reply: a curated answer plus the follow-up, or one ``session`` learned as is."""
+    cached = answer(text, session)
+    if cached is None:
+        return None
+    return cached if cached not in _CURATED_ANSWERS else f"{cached}\n\n{FOLLOW_UP}"
+
+
+def learn(question, reply_text, session):
+    if question and reply_text and session and is_question(question):
+        get_cache().learn(question, reply_text, session)
+
+
+def stats():
+    return get_cache().stats() if _cache is not None else {}
@@ -0,0 +1,24 @@
+"""
+Conversation flows.
+
+Each flow module exposes ``new_state(session_id=None)`` and
+``step(state, user_text) -> (state, outputs)`` where ``outputs`` is the list of
+assistant messages produced by the turn. Phase flows also expose coordinator
+actions (``next_phase``, ``end_interview``) with the same signature minus text.
+"""
+import importlib
+
+FLOWS = {
+    "phase": "engine.flows.phase",                  # screening_agent_phase.py
+    "multi_agent": "engine.flows.multi_agent",      # screening_multi_agent.py
+    "scored": "engine.flows.scored",                # screening_agent.py
+    "question_bank": "engine.flows.question_bank",  # screening_agent_app.py
+    "selection": "engine.flows.selection",          # selection_agent.py
+}
+
+
+def get_flow(name):
+    try:
+        return importlib.import_module(FLOWS[name])
+    except KeyError:
+        raise ValueError(f"Unknown flow {name!r}; expected one of {sorted(FLOWS)}") from None
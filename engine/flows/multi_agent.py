@@ -0,0 +1,161 @@
+# ---------------------------
+# Multi-agent phase runner — backs screening_multi_agent.py
+# ---------------------------
+# One short phase-specific agent per phase (agents/phase<N>_*.py); extraction
+# and scoring run when the coordinator moves on, or every turn alongside the
+# reply for phases that ask for it. A phase agent sees only its own phase's messages plus
+# a handoff brief of what earlier phases established (extracted fields,
+# scores/notes, open concerns), so its prompt stays small in later phases.
+import textwrap
+
+from engine import completion, faq, phase_agents, summaries, tasks, templates
+from engine.extraction import conversation_text, extract_fields, score_phase
+from engine.messages import as_dict
+from engine.profile import ExtractedProfile
+from engine.records import make_prefix
+from engine.state import ConversationState
+
+FLOW = "multi_agent"
+
+# phase agents are plugins in agents/ (see agents/__init__.py), each imported on first use
+PHASES = phase_agents.Registry()
+
+# volunteer questions in this phase are answered from the FAQ cache when possible
+FAQ_PHASE = 5
+# the SERVE explanation is served as a template on entering this phase
+SERVE_PHASE = 3
+
+SYSTEM_BASE = textwrap.dedent("""
+You are Shiksha Mitra — a warm, kind, Indian-English volunteer screening assistant for SERVE. 
+You will be having a friendly conversation with potential volunteers 
+who will remotely teach school students from rural areas through digital tools. 
+The goal is to have a conversation with the volunteers to assess them and 
+see if they are a good fit. Always be friendly and conversational. Ask ONE question at a time.
+Do not reveal internal scoring or phase logic to the volunteer.
+Adjust tone gently for shy, grounded for confident, and politely redirect talkative volunteers.
+""").strip()
+
+RUBRICS = phase_agents.Rubrics(PHASES)
+
+OPENING = "🌼 {greeting}! I’m Shiksha Mitra — nice to meet you. I’ll ask a few friendly questions to help you onboard to SERVE. To start, may I have your name?"
+
+SUMMARY_INSTRUCTIONS = "Create a short (3-4 line) coordinator-facing summary and a final recommendation label (Recommend / Hold / Not Recommended) with a one-line reason."
+
+
+def new_state(session_id=None):
+    state = ConversationState(FLOW, session_id)
+    state.extracted = ExtractedProfile()
+    state.meta = {"file_prefix": make_prefix()}
+    templates.serve(state, OPENING)
+    return state
+
+
+# messages of the current phase passed to its agent
+PHASE_HISTORY = 20
+
+
+def handoff_brief(state):
+    """Compact notes from the earlier phases for the current phase agent ("" in phase 1)."""
+    lines = []
+    known = {k: v for k, v in state.extracted.to_dict().items() if v not in (None, [], "") and k != "concerns"}
+    if known:
+        lines.append("Known about the volunteer: " + "; ".join(
+            f"{k}: {', '.join(v) if isinstance(v, list) else v}" for k, v in known.items()))
+    for pid in range(1, state.phase):
+        entry = state.scores.get(pid)
+        if not isinstance(entry, dict):
+            continue
+        # the phase summary once it's in (see engine/summaries.py), else the scorer's notes
+        note = entry.get("summary") or entry.get("notes")
+        score = entry.get("score")
+        head = f"Phase {pid} ({PHASES[pid]['name']})"
+        if isinstance(score, (int, float)):
+            head += f", score {score:g}"
+        if note or isinstance(score, (int, float)):
+            lines.append(f"{head}: {note}" if note else head)
+    if state.extracted.concerns:
+        lines.append(f"Open concerns: {state.extracted.concerns}")
+    return "\n".join(lines)
+
+
+# Each agent uses the SYSTEM_BASE + PHASE guide + handoff brief to generate the next assistant message.
+def run_phase_agent(state):
+    phase_id = state.phase
+    agent = PHASES[phase_id]
+    system_prompt = SYSTEM_BASE + "\n\n" + f"Phase {phase_id}: {agent.name} — {agent.guide}"
+    messages = [{"role": "system", "content": system_prompt}]
+    brief = handoff_brief(state)
+    if brief:
+        messages.append({"role": "system", "content": "Handoff from earlier phases (internal, don't read it out):\n" + brief})
+    # only this phase's conversation; earlier phases reach the agent through the brief
+    history = state.messages.since(f"phase:{phase_id}")[-PHASE_HISTORY:]
+    if not history and len(state.messages):
+        # the phase just opened on its own: answer the reply that closed the previous one
+        history = [state.messages[-1]]
+    messages.extend(as_dict(m) for m in history)
+    return phase_agents.run_turn(agent, state, messages)
+
+
+def step(state, user_text):
+    state.add("user", user_text)
+    outputs = []
+    # unattended: move on once the phase is done; the new phase's agent answers with its guide
+    # in the system prompt only (the SERVE explanation stands alone)
+    agent = PHASES[state.phase]
+    if completion.ready(state, agent.completion, agent.guide, len(PHASES), agent.is_complete):
+        _, outputs = next_phase(state, guide=False)
+        if state.phase == SERVE_PHASE:
+            return state, outputs
+    if state.phase == FAQ_PHASE:
+        cached = faq.reply(user_text, state.session_id)
+        if cached:
+            return state, outputs + [templates.serve(state, cached)]
+    try:
+        assistant_reply = run_phase_agent(state)
+    except Exception:
+        return state, outputs + [templates.serve(state, "Sorry — couldn't call the model just now. Please try again.", False)]
+    if state.phase == FAQ_PHASE:
+        faq.learn(user_text, assistant_reply, state.session_id)
+    return state, outputs + [templates.llm_turn(state, assistant_reply)]
+
+
+def next_phase(state, guide=True):
+    """``guide=False`` (unattended sessions) doesn't post the coordinator guide for the new phase."""
+    # run extraction and per-phase scoring on the conversation so far
+    conv_text = conversation_text(state.messages)
+    state.extracted.merge(extract_fields(conv_text), turn=len(state.messages))
+    agent = PHASES[state.phase]
+    # phases scored every turn have it ready (at most the evaluation started with the last reply to wait for)
+    tasks.wait(state.session_id, [f"evaluate:{state.phase}"])
+    if not (agent.evaluate_each_turn and "score" in (state.scores.get(state.phase) or {})):
+        summaries.store_score(state, state.phase, score_phase(state.phase, conv_text, agent.rubric))
+    outputs = []
+    if state.phase < len(PHASES):
+        summaries.close_phase(state, state.phase, PHASES[state.phase]["name"])
+        state.phase += 1
+        state.meta["phase_complete"] = None
+        state.messages.mark(f"phase:{state.phase}")
+        # guiding assistant message for the new phase (without calling LLM here)
+        phase = PHASES[state.phase]
+        if state.phase == SERVE_PHASE:
+            outputs.append(templates.serve(state, templates.SERVE_EXPLANATION))
+        elif guide:
+            outputs.append(templates.serve(state, f"(Guide) {phase['name']}: {phase['guide']}"))
+    return state, outputs
+
+
+def end_interview(state):
+    # earlier phases were extracted, scored and summarised on Next Phase: only the open one is left
+    conv_text = summaries.phase_text(state, state.phase)
+    state.extracted.merge(extract_fields(conv_text), turn=len(state.messages))
+    # score missing phases (the open one, unless its evaluator already did); unreached ones are only marked
+    tasks.wait(state.session_id, [f"evaluate:{pid}" for pid in PHASES])
+    summaries.score_missing(state, RUBRICS)
+    summaries.close_phase(state, state.phase, PHASES[state.phase]["name"])
+    try:
+        summary = summaries.final_summary(state, {pid: p["name"] for pid, p in PHASES.items()},
+                                          SUMMARY_INSTRUCTIONS)
+    except Exception:
+        summary = "Summary generation failed."
+    state.done = True
+    return state, [state.add("assistant", "[Coordinator Summary]\n\n" + summary)]
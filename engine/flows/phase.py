@@ -0,0 +1,158 @@
+# ---------------------------
+# Phase flow (5 phases, coordinator-driven) — backs screening_agent_phase.py
+# ---------------------------
+import textwrap
+
+from engine import completion, faq, llm, summaries, tasks, templates
+from engine.extraction import conversation_text, extract_fields
+from engine.profile import ExtractedProfile
+from engine.records import make_prefix
+from engine.state import ConversationState
+
+FLOW = "phase"
+
+SYSTEM_PROMPT = textwrap.dedent("""
+You are **Shiksha Mitra**, a warm, friendly, and supportive volunteer-screening assistant for SERVE.
+
+You must conduct the conversation strictly phase by phase, completing each phase before moving to the next.
+Always ask ONLY ONE question at a time.
+Never reveal the internal phases, rules, or scoring to the volunteer.
+Use warm, simple Indian English; be encouraging and calm.
+
+PHASE 1 — Greeting & Rapport:
+- Warm greeting, audio/video check, light small talk (location/day), reassurance "this is casual", first informal observation.
+
+PHASE 2 — Personal Intro:
+- Get background: work/studies/family, connection to children, reasons for volunteering, strengths, concerns.
+
+PHASE 3 — Explain SERVE:
+- Explain Smart-class setup (TV in school; volunteer remote), class duration (30–45 mins), frequency (1–2/wk),
+  support (textbooks, lesson plans, orientation), role clarity (connection & patience > expertise), how children respond.
+- Ask "Is that clear?" before moving on.
+
+PHASE 4 — Commitment & Availability:
+- Preferred days/times, how they will maintain consistency, how they handle sudden events, prior experience with kids (even informal),
+  and willingness to inform the team early if they cannot make a session.
+
+PHASE 5 — FAQ:
+- Answer their questions about syllabus, class flow, tech, orientation, missed sessions, matching to schools. Close warmly.
+
+GENERAL RULES:
+- Ask one thing at a time.
+- Be gentle for shy volunteers, grounded for confident ones, and politely redirect talkative volunteers.
+- Do not jump phases automatically; progress only when coordinator clicks Next Phase or when the assistant explicitly asks a phase-blocking question is complete.
+- Do not output JSON unless explicitly requested for extraction.
+""").strip()
+
+PHASES = [
+    {"id": 1, "name": "Greeting & Rapport"},
+    {"id": 2, "name": "Personal Intro"},
+    {"id": 3, "name": "Explain SERVE"},
+    {"id": 4, "name": "Commitment & Availability"},
+    {"id": 5, "name": "FAQs & Close"}
+]
+
+# volunteer questions in this phase are answered from the FAQ cache when possible
+FAQ_PHASE = 5
+# the SERVE explanation is served as a template on entering this phase
+SERVE_PHASE = 3
+
+PHASE_GUIDES = {
+    1: "Start by greeting, asking name, audio/video comfort, light small talk (where/ how's your day). Reassure: 'this is casual'. Ask one thing at a time.",
+    2: "Ask background: work/study/family, connection to kids, reasons for volunteering, strengths, concerns.",
+    3: "SERVE has just been explained in a fixed message (smart-class setup, 30-45min sessions, 1-2/wk, support provided, role clarity). Answer follow-up doubts briefly and check it is clear.",
+    4: "Ask preferred days/times, real consistency, handling sudden events, prior experience, willingness to inform early.",
+    5: "Invite volunteer questions; answer FAQs; close warmly with next steps."
+}
+
+# when a phase counts as done in unattended sessions (engine/completion.py)
+COMPLETION = {
+    1: completion.Phase(required=("name",), min_turns=2, max_turns=5),
+    2: completion.Phase(required=("experience", "motivation"), min_turns=2, max_turns=6),
+    3: completion.Phase(min_turns=1, max_turns=4, ends_on=("AFFIRM",)),
+    4: completion.Phase(required=("availability",), min_turns=2, max_turns=6),
+    5: completion.Phase(min_turns=1, max_turns=6, ends_on=("NEGATE",)),
+}
+
+OPENING = "🌼 {greeting}! I’m Shiksha Mitra — so nice to meet you. I’ll ask a few friendly questions to understand your background and availability. To start, may I know your name?"
+
+SUMMARY_INSTRUCTIONS = textwrap.dedent("""
+Create a short (3-5 lines) coordinator-facing summary from this conversation.
+Include: one-line volunteer background, availability, motivation, and a final recommendation label (Recommend / Hold / Not Recommended) with a one-line reason.
+""").strip()
+
+
+def new_state(session_id=None):
+    state = ConversationState(FLOW, session_id)
+    state.extracted = ExtractedProfile()
+    state.meta = {"file_prefix": make_prefix(), "saved": False}
+    # default behavior: only extract on Next Phase / End Interview to save tokens
+    state.options = {"auto_extract_on_message": False}
+    templates.serve(state, OPENING)
+    return state
+
+
+def step(state, user_text):
+    # extraction of the previous transcript is obsolete now
+    tasks.cancel(state.session_id, ["extract"])
+    state.add("user", user_text)
+    outputs = []
+    # unattended: move on once the phase is done; the new phase's guide goes into the system
+    # prompt only (the SERVE explanation answers the turn by itself)
+    if completion.ready(state, COMPLETION[state.phase], PHASE_GUIDES[state.phase], len(PHASES)):
+        _, outputs = next_phase(state, guide=False)
+        if state.phase == SERVE_PHASE:
+            return state, outputs
+    if state.phase == FAQ_PHASE:
+        cached = faq.reply(user_text, state.session_id)
+        if cached:
+            return state, outputs + [templates.serve(state, cached)]
+    messages_for_model = [{"role": "system", "content": SYSTEM_PROMPT + "\n\n" + f"Current phase: {state.phase}. Follow the phase guide carefully: {PHASE_GUIDES[state.phase]}"}]
+    messages_for_model.extend(state.messages.to_dicts())
+    try:
+        assistant_text = llm.chat(messages_for_model)
+    except Exception:
+        outputs.append(templates.serve(state, "Sorry — I couldn't reach the model right now. Please try again.", False))
+    else:
+        if state.phase == FAQ_PHASE:
+            faq.learn(user_text, assistant_text, state.session_id)
+        outputs.append(templates.llm_turn(state, assistant_text))
+
+    # optionally run extraction on every message (toggle in sidebar), in the
+    # background so the reply isn't held up by it
+    if state.options.get("auto_extract_on_message"):
+        turn = len(state.messages)
+        tasks.start(state.session_id, "extract", extract_fields, conversation_text(state.messages),
+                    apply=lambda fields: state.extracted.merge(fields, turn=turn))
+    return state, outputs
+
+
+def next_phase(state, guide=True):
+    """``guide=False`` (unattended sessions) doesn't post the coordinator guide for the new phase."""
+    # run extraction here to conserve tokens (it supersedes any auto-extraction still running)
+    tasks.cancel(state.session_id, ["extract"])
+    state.extracted.merge(extract_fields(conversation_text(state.messages)), turn=len(state.messages))
+    outputs = []
+    if state.phase < len(PHASES):
+        summaries.close_phase(state, state.phase, PHASES[state.phase - 1]["name"])
+        state.phase += 1
+        state.messages.mark(f"phase:{state.phase}")
+        # add a guiding assistant message for the new phase (fixed text, no LLM call)
+        if state.phase == SERVE_PHASE:
+            outputs.append(templates.serve(state, templates.SERVE_EXPLANATION))
+        elif guide:
+            outputs.append(templates.serve(state, PHASE_GUIDES[state.phase]))
+    return state, outputs
+
+
+def end_interview(state):
+    tasks.cancel(state.session_id, ["extract"])
+    # earlier phases were extracted and summarised on Next Phase: only the open one is left
+    summaries.close_phase(state, state.phase, PHASES[state.phase - 1]["name"])
+    state.extracted.merge(extract_fields(summaries.phase_text(state, state.phase)), turn=len(state.messages))
+    try:
+        summary = summaries.final_summary(state, {p["id"]: p["name"] for p in PHASES}, SUMMARY_INSTRUCTIONS)
+    except Exception:
+        summary = "Summary could not be generated at this time."
+    state.done = True
+    return state, [state.add("assistant", "[Coordinator Summary]\n\n" + summary)]
@@ -0,0 +1,182 @@
+# ---------------------------
+# Fixed question bank with LLM acknowledgements — backs screening_agent_app.py
+# ---------------------------
+import random
+
+from engine import llm, templates
+from engine.state import ConversationState
+
+FLOW = "question_bank"
+
+# ----------------------------
+# QUESTION BANK (SEQUENTIAL)
+# ----------------------------
+QUESTION_BANK = [
+    "Hi! I’m Shiksha Mitra from SERVE. What’s your name?",
+    "Nice to meet you! What inspired you to volunteer with children?",
+    "Have you taught or mentored before, formally or informally?",
+    "What subjects or topics do you feel most comfortable teaching?",
+    "How many years of experience do you have with children, if any?",
+    "Do you feel comfortable teaching online over video calls?",
+    "Are you okay committing to one short session per week?",
+    "Which age group do you feel most comfortable teaching?"
+]
+
+ORIENTATION_TEXT = (
+    "Before we wrap up, let me quickly share how SERVE sessions usually work.\n\n"
+    "• Each session is about 30–40 minutes\n"
+    "• You’ll teach simple, age-appropriate content\n"
+    "• Lesson plans and materials are shared well in advance\n"
+    "• A coordinator will always support you\n"
+    "• Any digital or tech help will also be provided\n\n"
+    "The most important thing is care and consistency — not perfection."
+)
+
+CLOSING_TEXT = (
+    "Thank you so much for taking the time to speak with me today 🌼\n\n"
+    "Based on this conversation, our team will review and get back to you shortly "
+    "with next steps. We truly appreciate your interest in supporting our children."
+)
+
+# ----------------------------
+# ACKNOWLEDGEMENT LIBRARY
+# ----------------------------
+ACK_LIBRARY = [
+    "Thanks for sharing.",
+    "That helps.",
+    "Appreciate you sharing.",
+    "Got it, thank you.",
+    "Thanks for being open."
+]
+
+NEGATIVE_ACKS = [
+    "That’s completely okay.",
+    "Thanks for sharing honestly.",
+    "No worries at all.",
+    "Appreciate your honesty."
+]
+
+SHOULD_ACK_PROMPT = """You are an internal decision system.
+
+Your job is to decide whether the assistant should add
+a brief, polite acknowledgement before asking the next question.
+You should mostly be adding a polite acknowledgement. You need to be warm, friendly and encouraging.
+
+Say YES if the volunteer reply:
+- Shares personal background or context
+- Expresses uncertainty, lack of experience, or hesitation
+- Gives a negative or limiting answer (e.g. “no experience”, “not sure”)
+
+Say NO if the reply is:
+- A simple factual answer
+- A single word (like a subject name)
+- Purely informational with no personal context
+
+Return ONLY one word: YES or NO.
+Do not explain."""
+
+ACK_PROMPT = (
+    "You are Shiksha Mitra, a polite and encouraging coordinator who is onboarding new volunteers on a remote education NGO.\n\n"
+    "Given the volunteer’s last reply and recent context, "
+    "write a SHORT, natural acknowledgement.\n\n"
+    "IMPORTANT:This is NOT a conversation opener.Do NOT ask questions, even on the first reply."
+    "Guidelines:\n"
+    "- 1 short line only (max 3 to 8 words)\n"
+    "- Polite, calm, encouraging Indian English\n"
+    "- If the reply is negative or shows lack of experience, respond reassuringly and be supportive and encouragin\n"
+    "- If the reply is factual or short, return a single dash\n"
+    "- Do NOT ask questions\n"
+    "- Do NOT give details you dont know\n"
+    "- Do NOT greet unless this is the first reply\n\n"
+    "Return ONLY the acknowledgement text.\n"
+    "If nothing appropriate fits, return a single dash: -\n\n"
+    "Conversation:\n"
+)
+
+
+def _render(messages):
+    return [f"{'Assistant' if m['role'] == 'assistant' else 'Volunteer'}: {m['content']}" for m in messages]
+
+
+def new_state(session_id=None):
+    state = ConversationState(FLOW, session_id)
+    state.stage = "questions"  # questions | orientation | closing
+    templates.serve(state, get_next_assistant_message(state))
+    return state
+
+
+# ----------------------------
+# LLM: SHOULD ACKNOWLEDGE?
+# ----------------------------
+def should_acknowledge_llm(state):
+    prompt = SHOULD_ACK_PROMPT + "\n".join(_render(state.messages[-8:]))
+    decision = llm.chat([{"role": "system", "content": prompt}], temperature=0).strip().upper()
+    return decision == "YES", prompt, decision
+
+
+# ----------------------------
+# PICK ACK (DETERMINISTIC)
+# ----------------------------
+def pick_ack(state, is_negative=False):
+    library = NEGATIVE_ACKS if is_negative else ACK_LIBRARY
+    choices = [a for a in library if a not in state.acks]
+    if not choices:
+        state.acks.clear()
+        choices = library.copy()
+    ack = random.choice(choices)
+    state.acks.add(ack)
+    return ack
+
+
+def generate_acknowledgement(state):
+    prompt = ACK_PROMPT + "\n".join(_render(state.messages[-1:]))
+    return llm.chat([{"role": "system", "content": prompt}], temperature=0.3).strip()
+
+
+# ----------------------------
+# GET NEXT ASSISTANT MESSAGE
+# ----------------------------
+def get_next_assistant_message(state):
+    # Phase 1: Questions
+    if state.stage == "questions":
+        if state.question_index < len(QUESTION_BANK):
+            q = QUESTION_BANK[state.question_index]
+            state.question_index += 1
+            return q
+        state.stage = "orientation"
+        return ORIENTATION_TEXT + "\n\nDoes this feel comfortable for you?"
+
+    # Phase 2: Orientation response handled → move to closing
+    if state.stage == "orientation":
+        state.stage = "closing"
+        state.done = True
+        return CLOSING_TEXT
+
+    return None
+
+
+def step(state, user_text):
+    state.add("user", user_text)
+
+    # Decide acknowledgement
+    ack_decision, ack_prompt, raw_decision = should_acknowledge_llm(state)
+    ack = generate_acknowledgement(state)
+
+    # store debug info
+    state.meta["last_ack_debug"] = {
+        "raw_decision": raw_decision,
+        "ack_added": bool(ack),
+        "ack_text": ack,
+        "prompt_sent": ack_prompt,
+        "last_user_message": user_text
+    }
+
+    outputs = []
+    next_msg = get_next_assistant_message(state)
+    if next_msg:
+        # questions, orientation and closing are fixed text; only the acknowledgement is generated
+        if ack:
+            outputs.append(templates.llm_turn(state, f"{ack}\n\n{next_msg}"))
+        else:
+            outputs.append(templates.serve(state, next_msg))
+    return state, outputs
@@ -0,0 +1,162 @@
+# ---------------------------
+# Phase flow with live extraction + scoring on every reply — backs screening_agent.py
+# ---------------------------
+import textwrap
+
+from engine import completion, faq, llm, summaries, templates
+from engine.extraction import compute_overall_recommendation, conversation_text, extract_fields, score_phase
+from engine.profile import ExtractedProfile
+from engine.records import make_prefix
+from engine.state import ConversationState
+
+FLOW = "scored"
+
+SYSTEM_PROMPT = textwrap.dedent("""
+You are **Shiksha Mitra**, a warm and friendly volunteer-screening assistant for SERVE.
+
+Follow the conversation strictly **phase-wise**.  
+You MUST complete each phase before moving to the next.  
+Always ask ONLY ONE question at a time.
+                                
+###PHASE RULES:
+PHASE 1 - aim is to set tone and develop rapport and covers the following -
+Basic greetings
+Sound/video check
+Small talk (location, day, etc.)
+Reassurance about the nature of the conversation
+First informal observation (confidence, comfort, clarity)
+                                
+PHASE 2 - aim is to get to know them and covers the following -
+Personal intro: work, student life, family
+Their connection to children
+Reasons for volunteering
+Their strengths/comfort areas
+Their concerns or fears (if any)
+                                
+PHASE 3 - aim to explain about how SERVE platform works, build enthusiasm and clarity, reduce fear of teaching
+covers the following - 
+Explain that it follows a Smart class setup (TV in rural school, where volunteer teacher is connected remote)
+Class timing (30 - 45mins, once/twice a week)
+Support given to volunteer teachers: textbooks, lesson plans, orientation
+Volunteer role: clarity, patience, connection more important than “teaching expertise”
+Need to connect with children and see how they respond
+                                
+PHASE 4 - aim is to understand the Commitment, Availability & Prior Experience of volunteer and Assess reliability
+Confirm realistic time availability, Understand routine and constraints, Check any past volunteering/teaching exposure, Understand how they handle scheduling changes
+Covers the following questions -
+Preferred days/times
+How they plan to maintain consistency
+How they handle sudden work/personal events
+Prior experience with kids (even informal)
+Communication responsibility (informing early)
+                                
+PHASE 5 - covers any questions asked by the volunteer
+""").strip()
+
+PHASES = [
+    {"id": 1, "name": "Welcome & Rapport"},
+    {"id": 2, "name": "Getting to Know (Background & Motivation)"},
+    {"id": 3, "name": "Program Explanation"},
+    {"id": 4, "name": "Commitment, Availability & Experience"},
+    {"id": 5, "name": "FAQs"},
+    {"id": 6, "name": "Closing & Internal Decision"}
+]
+
+# prompts per phase (agent will ask these as the main guide)
+PHASE_PROMPTS = {
+    1: "Hi! 👋 It’s so nice to meet you. I’m here to help you get started with your volunteer journey. Could you please tell me your name and how you are today?",
+    2: "Thanks, {name}! Could you tell me a little about yourself — work/study, and what brought you to volunteering with children?",
+    3: "Quickly, let me explain SERVE so you know what to expect: we connect volunteers to classrooms via a smart TV; sessions are short (30–45 min) and we provide lesson plans and orientation. Does that sound good?",
+    4: "What days/times usually work for you for a 30-minute session? Also, have you taught or volunteered before (even informal experiences)?",
+    5: "Do you have any questions for me about the program, technology, or the classroom setup?",
+    6: "Thank you so much. I’ll share next steps with you soon. Any last thing you want to tell me before we finish?"
+}
+
+# volunteer questions in this phase are answered from the FAQ cache when possible
+FAQ_PHASE = 5
+
+# scoring rubrics per phase (simple)
+PHASE_SCORE_PROMPTS = {
+    1: "Score comfort, clarity, and engagement in this phase on 1–5 where 5 excellent.",
+    2: "Score motivation, empathy, and stability on 1–5.",
+    3: "Score understanding of program and comfort with idea of teaching on 1–5.",
+    4: "Score availability consistency, reliability, and communication responsibility on 1–5.",
+    5: "Score clarity of questions and comfort asking doubts on 1–5.",
+    6: "Combine prior phase signals and give an overall recommendation score 1–5 and a short final note."
+}
+
+# when a phase counts as done in unattended sessions (engine/completion.py)
+COMPLETION = {
+    1: completion.Phase(required=("name",), min_turns=2, max_turns=5),
+    2: completion.Phase(required=("experience", "motivation"), min_turns=2, max_turns=6),
+    3: completion.Phase(min_turns=1, max_turns=4, ends_on=("AFFIRM",)),
+    4: completion.Phase(required=("availability",), min_turns=2, max_turns=6),
+    5: completion.Phase(min_turns=1, max_turns=6, ends_on=("NEGATE",)),
+    6: completion.Phase(min_turns=1, max_turns=2),
+}
+
+OPENING = "🌼 {greeting}! I’m Shiksha Mitra — so nice to meet you. I’ll ask a few simple questions to understand your background and availability so we can find the best volunteering match. Ready to begin? Can I have your name?"
+
+SUMMARY_INSTRUCTIONS = "Create a short coordinator-facing summary (3-6 lines) and next steps from this conversation. Also include a final recommendation label (Recommend / Hold / Not Recommended) and a one-line reason."
+
+
+def new_state(session_id=None):
+    state = ConversationState(FLOW, session_id)
+    state.extracted = ExtractedProfile()
+    state.meta = {"file_prefix": make_prefix()}
+    templates.serve(state, OPENING)
+    return state
+
+
+def overall_recommendation(state):
+    return compute_overall_recommendation(state.scores, [p["id"] for p in PHASES])
+
+
+def step(state, user_text):
+    # 1) store user message
+    state.add("user", user_text)
+    # unattended: move on once the phase is done; the next phase's prompt is the reply
+    if completion.ready(state, COMPLETION[state.phase], PHASES[state.phase - 1]["name"], len(PHASES)):
+        return next_phase(state)
+    # 2) known FAQ: answer from the cache; extraction/scoring catch up on the next turn
+    if state.phase == FAQ_PHASE:
+        cached = faq.reply(user_text, state.session_id)
+        if cached:
+            return state, [templates.serve(state, cached)]
+    # 3) call model to generate assistant reply (follow-up or friendly next Q)
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}] + state.messages.to_dicts()
+    outputs = [templates.llm_turn(state, llm.chat(messages))]
+    if state.phase == FAQ_PHASE:
+        faq.learn(user_text, outputs[0]["content"], state.session_id)
+    # 4) update extraction from conversation so far
+    conv_text = conversation_text(state.messages)
+    state.extracted.merge(extract_fields(conv_text), turn=len(state.messages))
+    # 5) run phase scoring for current phase
+    summaries.store_score(state, state.phase, score_phase(state.phase, conv_text, PHASE_SCORE_PROMPTS[state.phase]))
+    return state, outputs
+
+
+def next_phase(state):
+    outputs = []
+    if state.phase < len(PHASES):
+        state.phase += 1
+        state.messages.mark(f"phase:{state.phase}")
+        # push a guiding assistant message for the new phase (fixed text, no LLM call)
+        outputs.append(templates.serve(state, PHASE_PROMPTS[state.phase]))
+        # score the previous phase one last time using accumulated conversation
+        prev = state.phase - 1
+        summaries.store_score(state, prev, score_phase(prev, conversation_text(state.messages), PHASE_SCORE_PROMPTS[prev]))
+        summaries.close_phase(state, prev, PHASES[prev - 1]["name"])
+    return state, outputs
+
+
+def end_interview(state):
+    # ensure every reached phase is scored (the open one included); unreached ones are only marked
+    summaries.score_missing(state, PHASE_SCORE_PROMPTS)
+    # earlier phases were summarised on Next Phase; the open one is summarised now
+    summaries.close_phase(state, state.phase, PHASES[state.phase - 1]["name"])
+    state.scores["overall"] = overall_recommendation(state)
+    # final closing summary (not revealing internal tag), reduced from the per-phase summaries
+    summary = summaries.final_summary(state, {p["id"]: p["name"] for p in PHASES}, SUMMARY_INSTRUCTIONS)
+    state.done = True
+    return state, [state.add("assistant", "Interview complete. Summary (for coordinator):\n\n" + summary)]
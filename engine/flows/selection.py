@@ -0,0 +1,467 @@
+# ---------------------------
+# SIA selection flow — backs src/agents/selection/selection_agent.py
+# ---------------------------
+from engine import distill, faq, rules, templates
+from engine.context import select_context
+from engine.fsm import compile_fsm
+from engine.jsonparse import chat_json
+from engine.messages import WINDOW, as_dict
+from engine.profile import VolunteerProfile
+from engine.state import ConversationState
+from src.agents.selection.prompts.commitment import (WEEKLY_COMMITMENT_PROMPT, WEEKLY_COMMITMENT_QUESTION,
+                                                    WEEKLY_COMMITMENT_REASK)
+from src.agents.selection.prompts.orientation import ORIENTATION_INTENTS, ORIENTATION_REASK, ORIENTATION_TEXT
+
+FLOW = "selection"
+MAX_QUESTIONS = 30
+
+
+# -----------------------------
+# MASTER PROMPT
+# -----------------------------
+MASTER_SYSTEM_PROMPT = """You are SIA, a warm, respectful, purpose-driven conversational agent for Sunbird SERVE.
+
+Your role is to onboard volunteers through a single, natural WhatsApp conversation.
+
+You must sound human, encouraging, and calm — never procedural or robotic.
+
+Core principles:
+
+- Start with purpose before asking for details.
+
+- Convert intent -> interest through clarity, not pressure.
+
+- Never mention internal concepts like onboarding, registration, FSM, states, or selection.
+
+- Keep messages short (1–3 lines), WhatsApp-friendly.
+
+- Ask only one question at a time.
+
+- Be honest and transparent about non-negotiables.
+
+- If a volunteer cannot proceed, exit gracefully and share the SERVE community link.
+
+Non-negotiables:
+
+- Eligibility (18+, device + internet, voluntary role) must be met.
+
+- Phone number and email are required to proceed to classroom volunteering.
+
+- If a volunteer refuses required information, do not persuade beyond one gentle explanation.
+
+Tone:
+
+- Warm, respectful, optimistic
+
+- Never salesy or pushy
+
+- Emojis are allowed but minimal
+
+Context you will receive:
+
+- Current state
+
+- Known volunteer details (if any)
+
+- Previous messages (summary)
+
+- SERVE community link
+
+Never invent facts.
+
+Never assume consent.
+
+Never store or repeat sensitive information unnecessarily.
+
+You are guiding a human, not completing a form.."""
+
+STATE_PROMPTS = {
+
+    "KNOWING_VOLUNTEER":"""
+
+You are SIA, the Sunbird SERVE volunteer onboarding guide.
+
+Current state: KNOWING_VOLUNTEER.
+
+Context:
+- The volunteer has already completed eligibility, identity, and preference collection.
+- Basic onboarding steps are complete.
+- This step is to understand the volunteer as a person in a light, respectful way.
+- You are NOT evaluating or filtering the volunteer at this stage.
+- You are only understanding:
+  1) their background (in a general, non-personal way),
+  2) their motivation to volunteer, why they want to volunteer, what drew them to SERVE
+  3) any prior teaching / mentoring experience (formal or informal),
+  4) their comfort interacting with children or learners.
+  5) the subjects or topics they are comfortable teaching
+  6) the age group of the children they are comfortable interacting with
+  7) interst in teaching
+  
+- The orchestrator controls which question was last asked in this state via `last_agent_prompt`.
+
+Your goal:
+Classify the user's latest message and produce:
+- a single intent label,
+- a confidence score (0.0–1.0),
+- a short, warm WhatsApp-style acknowledgement ("tone_reply").
+
+Allowed intents:
+- MOTIVATION_SHARED   → explains why they want to volunteer / help / give back /
+- EXPERIENCE_SHARED   → mentions teaching, tutoring, mentoring, training, or helping others learn
+- NO_EXPERIENCE       → explicitly states no teaching or mentoring experience
+- COMFORT_SHARED      → expresses comfort or hesitation working with children or learners
+- QUERY               → asks a question instead of answering
+- AMBIGUOUS           → vague, off-topic, or unclear response
+- STOP                → stop / unsubscribe / leave
+
+Classification rules:
+- Do NOT judge or filter based on experience; beginners are welcome.
+- If the user explicitly says they have no experience → NO_EXPERIENCE.
+- Use `last_agent_prompt` to infer whether the response relates to motivation, experience, or comfort.
+- If the message does not clearly map to any category → AMBIGUOUS.
+- Do NOT infer or invent information not explicitly stated.
+
+Conversation boundaries:
+- Do NOT ask personal questions (email, phone number, family, marital status, children, health, finances, etc.).
+- Ask questions only around their work experience, teaching or mentoring experience, experience working with children, age group of the children they are comfortable with working , subjects they are comfortable with teaching
+
+Critical rule (very important):
+- Never mention onboarding steps, evaluation, selection, states, or internal processes.
+
+Tone rules:
+- 1–3 short lines.
+- Warm, calm, and human.
+- Reassuring, especially for NO_EXPERIENCE.
+- Never evaluative, formal, or procedural.
+
+Signal extraction rules:
+- Extract signals ONLY if the user explicitly mentions them.
+- Do NOT infer or guess.
+- If a signal is not mentioned, return null (or empty list for subjects).
+- Allowed values:
+  - has_teaching_experience: true / false / Null
+  - subjects: list of subjects explicitly mentioned (lowercase) or empty list
+  - teaching_interest: yes / no / maybe / Null
+  - children_age_comfort:
+      "primary"   → ages ~5–10
+      "middle"    → ages ~11–14
+      "secondary" → ages ~15–18
+      "unsure"    → expresses uncertainty or discomfort
+      Null
+    -motivation: Null/help/serve others/empower/uplift/bring joy/happiness/give
+
+Output ONLY valid JSON:
+  {
+  "intent": "<one of the allowed intents>",
+  "confidence": 0.0,
+  "tone_reply": "<short friendly acknowledgement along with a relevant question based on conversation boundaries>",
+
+  "signals": {
+    "has_teaching_experience": true | false |null,
+    "teaching_interest" : yes | no | maybe|null
+    "motivation":"help | looking to give back |serve | bring joy | uplift |outreach |null"
+    "subjects": []
+    "children_age_comfort": "primary" | "middle" | "secondary" | "unsure" | null
+  }
+}
+
+
+"""
+}
+
+STATE_PROMPTS["WEEKLY_COMMITMENT"] = WEEKLY_COMMITMENT_PROMPT
+
+FIRST_QUESTION = "Thank you completing the onboarding steps. Let us start with something simple, can you tell me a bit about yourself?"
+
+CLOSING = (
+    "Thank you so much for sharing 😊\n\n"
+    "Based on this conversation, our team will get in touch with you shortly."
+)
+
+# short acknowledgement before the next state's first (template) question
+TRANSITION_ACK = "Thank you so much for sharing 😊"
+
+KNOWING_VOLUNTEER_REASK = "Could you tell me a little more about that? 😊"
+
+# history tokens sent with each classifier call (see engine/context.py)
+CONTEXT_BUDGET = 120
+
+# distilled classifier must be at least this sure before the LLM call is skipped
+LOCAL_CONFIDENCE = 0.85
+
+# -----------------------------
+# FLOW DEFINITION
+# -----------------------------
+SELECTION_FSM = {
+    "initial": "KNOWING_VOLUNTEER",
+    "close": "CLOSE",
+    "max_total_questions": MAX_QUESTIONS,
+    "states": {
+        "KNOWING_VOLUNTEER": {
+            "prompt": STATE_PROMPTS["KNOWING_VOLUNTEER"],
+            "entry": FIRST_QUESTION,
+            "reask": KNOWING_VOLUNTEER_REASK,
+            "intents": ["MOTIVATION_SHARED", "EXPERIENCE_SHARED", "NO_EXPERIENCE", "COMFORT_SHARED",
+                        "QUERY", "AMBIGUOUS", "STOP"],
+            "transitions": {"STOP": "CLOSE"},
+            # the other intents need the LLM's signals and follow-up question
+            "local_intents": ["STOP", "AMBIGUOUS"],
+            "complete": "knowing_volunteer_complete",
+            "on_complete": "WEEKLY_COMMITMENT",
+            "on_exhausted": "WEEKLY_COMMITMENT",
+            # no minimum: the planner asks only for missing signals, so the
+            # state ends as soon as the profile is complete
+            "max_questions": 20,
+        },
+        "WEEKLY_COMMITMENT": {
+            "prompt": WEEKLY_COMMITMENT_PROMPT,
+            "entry": WEEKLY_COMMITMENT_QUESTION,
+            "reask": WEEKLY_COMMITMENT_REASK,
+            "intents": ["TIME_YES", "TIME_MAYBE", "TIME_NO", "QUERY", "AMBIGUOUS", "STOP"],
+            "transitions": {"TIME_YES": "ORIENTATION", "TIME_MAYBE": "ORIENTATION",
+                            "TIME_NO": "CLOSE", "STOP": "CLOSE"},
+            "local_intents": ["TIME_YES", "TIME_MAYBE", "TIME_NO", "AMBIGUOUS", "STOP"],
+            "on_exhausted": "ORIENTATION",
+            "max_questions": 3,
+        },
+        # deterministic: explained from a template, reply classified with rules
+        "ORIENTATION": {
+            "entry": ORIENTATION_TEXT,
+            "reask": ORIENTATION_REASK,
+            "intents": ORIENTATION_INTENTS,
+            "transitions": {"OK": "CLOSE", "NOT_OK": "CLOSE", "STOP": "CLOSE"},
+            "on_exhausted": "CLOSE",
+            "max_questions": 3,
+        },
+        "CLOSE": {"entry": CLOSING, "final": True},
+    },
+}
+
+# rule-based intents -> ORIENTATION intents
+ORIENTATION_RULE_INTENTS = {"AFFIRM": "OK", "NEGATE": "NOT_OK", "QUERY": "QUERY", "STOP": "STOP"}
+
+
+# -----------------------------
+# HELPERS
+# -----------------------------
+def knowing_volunteer_complete(profile):
+    # 4 of the 5 signals to be filled; has_teaching_experience=False counts as filled
+    return sum(profile.filled(s) for s in SIGNAL_TARGETS) >= 4
+
+
+# -----------------------------
+# QUESTION PLANNER
+# -----------------------------
+# signal -> (what the next question should find out, template question if the model doesn't ask one)
+SIGNAL_TARGETS = {
+    "motivation": ("what draws them to volunteering with SERVE",
+                   "What made you interested in volunteering with SERVE?"),
+    "has_teaching_experience": ("whether they have taught, tutored or mentored anyone before",
+                                "Have you ever taught or helped someone learn before?"),
+    "subjects": ("which subjects or topics they would be comfortable teaching",
+                 "Which subjects would you feel comfortable teaching?"),
+    "children_age_comfort": ("which age group of children they are most comfortable with",
+                             "Which age group of children would you be most comfortable with?"),
+    "teaching_interest": ("whether they would enjoy teaching children online",
+                          "Would you enjoy teaching children in online sessions?"),
+}
+USE_PLANNER = True
+
+# words that mark an earlier turn as relevant to a still-missing signal
+SIGNAL_KEYWORDS = {
+    "motivation": ("volunteer", "help", "give back", "serve", "motivat", "why", "joy", "society"),
+    "has_teaching_experience": ("teach", "taught", "tutor", "mentor", "train", "experience", "coach"),
+    "subjects": ("subject", "math", "english", "science", "hindi", "computer", "social", "art"),
+    "children_age_comfort": ("age", "children", "kids", "class", "grade", "primary", "school", "student"),
+    "teaching_interest": ("enjoy", "interest", "like", "love", "online", "teaching"),
+}
+
+
+def missing_signals(profile):
+    return [s for s in SIGNAL_TARGETS if not profile.filled(s)]
+
+
+def plan_next(profile):
+    """The signal the next question should target, or None when nothing is missing."""
+    missing = missing_signals(profile)
+    return missing[0] if missing else None
+
+
+def planner_message(profile):
+    missing = missing_signals(profile)
+    if not missing:
+        return None
+    known = [SIGNAL_TARGETS[s][0] for s in SIGNAL_TARGETS if s not in missing]
+    todo = "; ".join(f"{i}) {SIGNAL_TARGETS[s][0]}" for i, s in enumerate(missing, 1))
+    # the latest reply may answer the first item, so the model skips what it just extracted
+    content = (f"Next question: still to find out, in this order: {todo}. In tone_reply, ask ONE short "
+               "question about the first item the volunteer's latest message does not already answer.")
+    if known:
+        content += " Already known, do not ask again: " + "; ".join(known) + "."
+    return {"role": "system", "content": content}
+
+
+FSM = compile_fsm(SELECTION_FSM, {"knowing_volunteer_complete": knowing_volunteer_complete})
+STATE_ORDER = list(FSM.names)
+CLASSIFIER_SCHEMAS = [
+    {"intent": SELECTION_FSM["states"][name].get("intents", ()), "confidence": "number?",
+     "tone_reply": "string?", "signals": "dict?"}
+    for name in FSM.names
+]
+
+
+def new_state(session_id=None):
+    state = ConversationState(FLOW, session_id)
+    state.profile = VolunteerProfile()
+    state.state_index = FSM.initial
+    state.meta["state_turns"] = 0
+    templates.serve(state, FSM.entry[FSM.initial])
+    return state
+
+
+def current_state(state):
+    return FSM.name(state.state_index)
+
+
+# -----------------------------
+# CLASSIFIERS
+# -----------------------------
+def init_selection_flow(state, user_text, history):
+    """LLM classification + acknowledgement for the current state; merges signals into the profile."""
+    messages = [
+        {"role": "system", "content": MASTER_SYSTEM_PROMPT},
+        {"role": "system", "content": FSM.prompt[state.state_index]}
+    ]
+    planned = planner_message(state.profile) if USE_PLANNER and current_state(state) == "KNOWING_VOLUNTEER" else None
+    if planned:
+        messages.append(planned)
+    keywords = ()
+    if current_state(state) == "KNOWING_VOLUNTEER":
+        keywords = [k for s in missing_signals(state.profile) for k in SIGNAL_KEYWORDS[s]]
+    messages.extend(as_dict(m) for m in select_context(history, CONTEXT_BUDGET, keywords))
+    messages.append({"role": "user", "content": user_text})
+
+    json_llm_response, _ = chat_json(messages, CLASSIFIER_SCHEMAS[state.state_index], name="selection",
+                                     response_format={"type": "json_object"}, temperature=0.4)
+    if json_llm_response is None:
+        # unusable even after one retry: treat as unclear and re-ask
+        return {"raw_text": None, "intent": "AMBIGUOUS", "confidence": 0.0, "tone_reply": None, "signals": {}}
+
+    signals = json_llm_response.get("signals") or {}
+    state.profile.merge(signals, turn=state.question_index + 1, confidence=json_llm_response.get("confidence"))
+    distill.log_label(FSM.name(state.state_index), last_agent_prompt(history), user_text,
+                      json_llm_response.get("intent"))
+    reply = json_llm_response.get("tone_reply")
+    if planned and reply is not None and "?" not in reply:
+        # the model only acknowledged: add the planned question for the next missing signal
+        target = plan_next(state.profile)
+        if target is not None:
+            reply = f"{reply.strip()}\n\n{SIGNAL_TARGETS[target][1]}"
+    return {
+        "raw_text": reply,
+        "intent": json_llm_response.get("intent"),
+        "confidence": json_llm_response.get("confidence"),
+        "tone_reply": json_llm_response.get("tone_reply"),
+        "signals": signals,
+        "source": "llm"
+    }
+
+
+def last_agent_prompt(history):
+    for m in reversed(history):
+        if m["role"] == "assistant":
+            return m["content"]
+    return ""
+
+
+def classify_local(state, user_text, history):
+    """First tier: the distilled classifier, only for intents this state can act on without the LLM."""
+    model = distill.get_model()
+    if model is None:
+        return None
+    current = state.state_index
+    intent, p = model.predict(user_text, FSM.name(current), last_agent_prompt(history),
+                              allowed=SELECTION_FSM["states"][FSM.name(current)]["intents"])
+    if p < LOCAL_CONFIDENCE or intent not in FSM.local[current]:
+        distill.TIERS["llm"] += 1
+        return None
+    distill.TIERS["local"] += 1
+    return {"raw_text": None, "intent": intent, "confidence": p, "tone_reply": None, "signals": {}}
+
+
+def answer_from_faq(cached, history):
+    """QUERY answered from the FAQ cache, then the pending question asked again; no extra LLM call."""
+    question = last_agent_prompt(history).split("\n\n")[-1]
+    return {"raw_text": f"{cached}\n\n{question}", "intent": "QUERY", "confidence": 1.0,
+            "tone_reply": None, "signals": {}}
+
+
+def with_faq_answer(result, cached, history):
+    """
+    A volunteer question the FAQ cache knows: a pure question (QUERY) is
+    answered from the cache; when the message also answers the state ("Yes,
+    2 hours works. Do I get lesson plans?") the turn goes on as classified
+    and the cached answer is put in front of its reply.
+    """
+    if result.get("intent") == "QUERY":
+        return answer_from_faq(cached, history)
+    return dict(result, faq_answer=cached)
+
+
+def classify_with_rules(user_text):
+    """Template states: no LLM call, just the rule-based intent."""
+    intent, confidence = rules.classify(user_text)
+    return {
+        "raw_text": None,
+        "intent": ORIENTATION_RULE_INTENTS.get(intent, "AMBIGUOUS"),
+        "confidence": confidence,
+        "tone_reply": None,
+        "signals": {}
+    }
+
+
+# -----------------------------
+# TURN
+# -----------------------------
+def step(state, user_text):
+    # the resident tail: older turns are archived and never reach the classifier prompt anyway
+    history = state.messages.tail(WINDOW)
+    state.add("user", user_text)
+    current = state.state_index
+
+    if FSM.uses_llm[current]:
+        result = classify_local(state, user_text, history) or init_selection_flow(state, user_text, history)
+    else:
+        result = classify_with_rules(user_text)
+    cached = faq.answer(user_text)
+    if cached is not None:
+        result = with_faq_answer(result, cached, history)
+    # a known question asked alongside an answer: its cached answer leads the reply
+    lead = f"{result['faq_answer']}\n\n" if result.get("faq_answer") else ""
+    state.question_index += 1
+    state.meta["state_turns"] = state.meta.get("state_turns", 0) + 1
+
+    nxt, reason = FSM.advance(current, result.get("intent"), state.meta["state_turns"],
+                              state.question_index, state.profile)
+    state.meta["last_result"] = result
+    state.meta["outcome"] = reason
+
+    outputs = []
+    if nxt == current:
+        reply = result.get("raw_text")
+        if reply and result.get("source") == "llm":
+            outputs.append(templates.llm_turn(state, lead + reply))
+        else:
+            # FAQ answer, reask or the state's entry question: fixed text
+            reply = reply or SELECTION_FSM["states"][FSM.name(current)].get("reask") or FSM.entry[current]
+            outputs.append(templates.serve(state, lead + reply))
+        return state, outputs
+
+    state.state_index = nxt
+    state.meta["state_turns"] = 0
+    if FSM.final[nxt]:
+        state.done = True
+        outputs.append(templates.serve(state, lead + FSM.entry[nxt]))
+    else:
+        outputs.append(templates.serve(state, f"{lead}{TRANSITION_ACK}\n\n{FSM.entry[nxt]}"))
+    return state, outputs
@@ -0,0 +1,123 @@
+# ---------------------------
+# Declarative state machine, compiled once into lookup tables
+# ---------------------------
+# A flow is described as plain data:
+#
+#   {"initial": "A", "max_total_questions": 30, "states": {
+#       "A": {"prompt": "...",              # LLM classifier prompt (omit for rule/template states)
+#             "entry": "...",               # template served when entering the state
+#             "intents": ["YES", "NO", ...],
+#             "transitions": {"NO": "CLOSE"},   # unlisted intents stay in the state
+#             "complete": "profile",        # named completion predicate
+#             "on_complete": "B", "on_exhausted": "B",
+#             "min_questions": 5, "max_questions": 20,
+#             "local_intents": ["STOP"]},   # may be decided without the LLM
+#       "CLOSE": {"entry": "...", "final": True}}}
+#
+# ``compile_fsm`` turns names into integers and transitions into a
+# state x intent table, so each turn's decision is a couple of list lookups.
+
+STAY, INTENT, COMPLETE, EXHAUSTED, LIMIT = "stay", "intent", "complete", "exhausted", "limit"
+
+
+class CompiledFSM:
+
+    __slots__ = ("names", "index", "intents", "intent_index", "table", "prompt", "entry", "uses_llm",
+                 "final", "completion", "on_complete", "on_exhausted", "min_answers", "max_answers",
+                 "local", "initial", "close", "max_total")
+
+    def next_state(self, state, intent):
+        return self.table[state][self.intent_index.get(intent, 0)]
+
+    def advance(self, state, intent, answers_in_state, total_answers, context=None):
+        """
+        Decide where a turn goes. Returns (next_state, reason) with reason one of
+        STAY, INTENT (explicit transition), COMPLETE, EXHAUSTED, LIMIT.
+        """
+        target = self.table[state][self.intent_index.get(intent, 0)]
+        if target != state:
+            return target, INTENT
+        if self.max_total is not None and total_answers >= self.max_total:
+            return self.close, LIMIT
+        done = self.completion[state]
+        if done is not None and answers_in_state >= self.min_answers[state] and done(context):
+            return self.on_complete[state], COMPLETE
+        if answers_in_state >= self.max_answers[state]:
+            return self.on_exhausted[state], EXHAUSTED
+        return state, STAY
+
+    def name(self, state):
+        return self.names[state]
+
+
+def compile_fsm(definition, predicates=None):
+    """
+    Validate ``definition`` and build a CompiledFSM. ``predicates`` maps the
+    names used in ``"complete"`` to callables taking the turn context.
+    """
+    predicates = predicates or {}
+    states = definition["states"]
+    names = list(states)
+    index = {n: i for i, n in enumerate(names)}
+    # column 0 is "any intent not listed" (stays put)
+    intents = [None] + sorted({i for spec in states.values() for i in spec.get("intents", ())})
+    intent_index = {n: i for i, n in enumerate(intents) if n is not None}
+
+    def resolve(name, where):
+        if name not in index:
+            raise ValueError(f"{where}: unknown state {name!r}")
+        return index[name]
+
+    fsm = CompiledFSM()
+    fsm.names = tuple(names)
+    fsm.index = index
+    fsm.intents = tuple(intents)
+    fsm.intent_index = intent_index
+    fsm.initial = resolve(definition["initial"], "initial")
+    finals = [n for n, spec in states.items() if spec.get("final")]
+    if not finals:
+        raise ValueError("definition needs at least one final state")
+    fsm.close = resolve(definition.get("close", finals[0]), "close")
+    fsm.max_total = definition.get("max_total_questions")
+
+    table, prompt, entry, uses_llm, final, completion = [], [], [], [], [], []
+    on_complete, on_exhausted, min_answers, max_answers, local = [], [], [], [], []
+    for i, name in enumerate(names):
+        spec = states[name]
+        row = [i] * len(intents)
+        for intent, target in spec.get("transitions", {}).items():
+            if intent not in spec.get("intents", ()):
+                raise ValueError(f"{name}: transition on undeclared intent {intent!r}")
+            row[intent_index[intent]] = resolve(target, f"{name}.transitions")
+        table.append(tuple(row))
+        prompt.append(spec.get("prompt"))
+        entry.append(spec.get("entry"))
+        uses_llm.append(spec.get("prompt") is not None)
+        final.append(bool(spec.get("final")))
+        pred = spec.get("complete")
+        if pred is not None and pred not in predicates:
+            raise ValueError(f"{name}: unknown completion predicate {pred!r}")
+        completion.append(predicates.get(pred))
+        on_complete.append(resolve(spec.get("on_complete", name), f"{name}.on_complete"))
+        on_exhausted.append(resolve(spec.get("on_exhausted", names[fsm.close]), f"{name}.on_exhausted"))
+        # the state's own question counts as the first one asked, so after
+        # ``n - 1`` answers the volunteer has been asked ``n`` questions
+        min_answers.append(max(0, spec.get("min_questions", 1) - 1))
+        max_answers.append(max(1, spec.get("max_questions", 10 ** 9) - 1))
+        for intent in spec.get("local_intents", ()):
+            if intent not in spec.get("intents", ()):
+                raise ValueError(f"{name}: local intent {intent!r} is not declared")
+        local.append(frozenset(spec.get("local_intents", ())))
+
+    fsm.table = tuple(table)
+    fsm.prompt = tuple(prompt)
+    fsm.entry = tuple(entry)
+    fsm.uses_llm = tuple(uses_llm)
+    fsm.final = tuple(final)
+    fsm.completion = tuple(completion)
+    fsm.on_complete = tuple(on_complete)
+    fsm.on_exhausted = tuple(on_exhausted)
+    fsm.min_answers = tuple(min_answers)
+    fsm.max_answers = tuple(max_answers)
+    fsm.local = tuple(local)
+    return fsm
@@ -0,0 +1,269 @@
+# ---------------------------
+# Tolerant JSON parsing for model output
+# ---------------------------
+# The small model wraps JSON in ``` fences, adds prose around it, uses single
+# quotes / Python literals, leaves trailing or missing commas, or stops
+# mid-object. ``parse`` takes the first JSON object out of the text, repairs
+# those defects and validates it against a per-call schema; ``chat_json``
+# makes at most one targeted retry when that still fails.
+#
+# Schemas are plain dicts: {"score": "number", "notes": "string?"} where a
+# trailing "?" marks an optional key, and a list/tuple value is an enum.
+import json
+import re
+import threading
+from collections import Counter, defaultdict
+
+from engine import llm
+
+_FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)```", re.S)
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+_LITERALS = {"true": "true", "True": "true", "false": "false", "False": "false",
+             "null": "null", "Null": "null", "NULL": "null", "None": "null"}
+_VALUE_END = {"s", "w", "}", "]"}
+_VALUE_START = {"s", "w", "{", "["}
+
+# give up retrying a call site whose retries almost never parse
+RETRY_MIN_SAMPLES = 20
+RETRY_MIN_SUCCESS = 0.2
+
+_lock = threading.Lock()
+STATS = defaultdict(Counter)
+
+
+class ParseError(ValueError):
+    pass
+
+
+# ---------------------------
+# Extraction + repair
+# ---------------------------
+def extract_object(text):
+    """The first {...} in ``text`` (inside a code fence if there is one), closed off if truncated."""
+    fenced = _FENCE.search(text)
+    if fenced and "{" in fenced.group(1):
+        text = fenced.group(1)
+    start = text.find("{")
+    if start < 0:
+        return None
+    stack, quote, escaped = [], None, False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if quote:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == quote:
+                quote = None
+        elif ch == '"':
+            quote = ch
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+            if not stack:
+                return text[start:i + 1]
+    # truncated output: close the open string and brackets
+    return text[start:] + (quote or "") + "".join(reversed(stack))
+
+
+def _tokens(s):
+    i, n = 0, len(s)
+    while i < n:
+        ch = s[i]
+        if ch.isspace():
+            i += 1
+        elif ch in "{}[]:,":
+            yield ch, ch
+            i += 1
+        elif ch in "\"“”":
+            j, buf = i + 1, []
+            while j < n and s[j] not in "\"“”":
+                if s[j] == "\\" and j + 1 < n:
+                    buf.append(s[j:j + 2])
+                    j += 2
+                    continue
+                buf.append("\\n" if s[j] == "\n" else s[j])
+                j += 1
+            yield "s", '"' + "".join(buf) + '"'
+            i = j + 1
+        elif ch == "'":
+            # a closing quote is one followed by JSON punctuation, so "it's" survives
+            j = i + 1
+            while j < n and not (s[j] == "'" and re.match(r"\s*(?:[,:}\]]|$)", s[j + 1:])):
+                j += 1
+            yield "s", json.dumps(s[i + 1:j], ensure_ascii=False)
+            i = j + 1
+        elif ch == "/" and s.startswith("//", i):
+            i = s.find("\n", i) if "\n" in s[i:] else n
+        else:
+            # bare key or bare value: runs to the next structural character
+            j = i
+            while j < n and s[j] not in "{}[]:,\"\n":
+                j += 1
+            word = s[i:j].strip()
+            if word in _LITERALS:
+                yield "w", _LITERALS[word]
+            elif _NUMBER.fullmatch(word):
+                yield "w", word
+            else:
+                yield "s", json.dumps(word, ensure_ascii=False)
+            i = j
+
+
+def repair(s):
+    """Rewrite near-JSON into JSON: quotes, literals, trailing and missing commas, // comments."""
+    out, prev = [], None
+    tokens = list(_tokens(s))
+    for k, (kind, text) in enumerate(tokens):
+        nxt = tokens[k + 1][0] if k + 1 < len(tokens) else None
+        if kind == "," and (nxt in ("}", "]", ",") or nxt is None):
+            continue
+        if prev in _VALUE_END and kind in _VALUE_START:
+            out.append(",")
+        out.append(text)
+        prev = kind
+    return "".join(out)
+
+
+# ---------------------------
+# Schema validation
+# ---------------------------
+def _coerce(value, kind):
+    if isinstance(kind, (list, tuple)):
+        v = str(value).strip().upper() if value is not None else None
+        if v not in kind:
+            raise ParseError(f"expected one of {list(kind)}, got {value!r}")
+        return v
+    if kind == "number":
+        if isinstance(value, bool):
+            raise ParseError(f"expected number, got {value!r}")
+        if isinstance(value, (int, float)):
+            return float(value)
+        m = _NUMBER.search(str(value))
+        if not m:
+            raise ParseError(f"expected number, got {value!r}")
+        return float(m.group())
+    if kind == "string":
+        if isinstance(value, (dict, list)):
+            raise ParseError(f"expected string, got {type(value).__name__}")
+        return str(value)
+    if kind == "list":
+        if isinstance(value, str):
+            return [v.strip() for v in value.split(",") if v.strip()]
+        if not isinstance(value, list):
+            raise ParseError(f"expected list, got {value!r}")
+        return value
+    if kind == "dict":
+        if not isinstance(value, dict):
+            raise ParseError(f"expected object, got {value!r}")
+        return value
+    if kind == "bool":
+        if isinstance(value, bool):
+            return value
+        if str(value).strip().lower() in ("true", "yes"):
+            return True
+        if str(value).strip().lower() in ("false", "no"):
+            return False
+        raise ParseError(f"expected bool, got {value!r}")
+    raise ValueError(f"unknown schema type {kind!r}")
+
+
+def validate(obj, schema):
+    """Return a coerced copy of ``obj``; raise ParseError on missing/invalid keys."""
+    out = dict(obj)
+    for key, kind in schema.items():
+        optional = isinstance(kind, str) and kind.endswith("?")
+        if optional:
+            kind = kind[:-1]
+        value = obj.get(key)
+        if value is None:
+            if not optional:
+                raise ParseError(f"missing key {key!r}")
+            continue
+        out[key] = _coerce(value, kind)
+    return out
+
+
+def parse(text, schema=None):
+    """
+    Returns (obj, status, error): status is "ok" (valid as is), "repaired"
+    (needed extraction/repair) or "failed" (obj is None).
+    """
+    if not isinstance(text, str):
+        return None, "failed", "no text"
+    status = "ok"
+    try:
+        obj = json.loads(text)
+    except ValueError:
+        status = "repaired"
+        candidate = extract_object(text)
+        if candidate is None:
+            return None, "failed", "no JSON object found"
+        try:
+            obj = json.loads(candidate, strict=False)
+        except ValueError:
+            try:
+                obj = json.loads(repair(candidate), strict=False)
+            except ValueError as e:
+                return None, "failed", f"invalid JSON: {e}"
+    if not isinstance(obj, dict):
+        return None, "failed", f"expected an object, got {type(obj).__name__}"
+    if schema:
+        try:
+            obj = validate(obj, schema)
+        except ParseError as e:
+            return None, "failed", str(e)
+    return obj, status, None
+
+
+# ---------------------------
+# LLM calls
+# ---------------------------
+def _count(name, *keys):
+    with _lock:
+        for k in keys:
+            STATS[name][k] += 1
+
+
+def _retry_worthwhile(name):
+    c = STATS[name]
+    return c["retried"] < RETRY_MIN_SAMPLES or c["retry_ok"] / c["retried"] >= RETRY_MIN_SUCCESS
+
+
+def chat_json(messages, schema=None, name="json", retry=True, **kwargs):
+    """
+    ``llm.chat`` + ``parse``. On failure, re-asks once with the parse error
+    (unless retries for ``name`` have stopped paying off). Returns (obj, raw);
+    obj is None when nothing usable came back.
+    """
+    raw = llm.chat(messages, **kwargs)
+    obj, status, error = parse(raw, schema)
+    if obj is not None:
+        _count(name, "calls", status)
+        return obj, raw
+    if not retry or not _retry_worthwhile(name):
+        _count(name, "calls", "failed")
+        return None, raw
+    keys = f" with keys {', '.join(k for k in schema)}" if schema else ""
+    retry_messages = list(messages) + [
+        {"role": "assistant", "content": raw},
+        {"role": "user", "content": f"That reply could not be used ({error}). "
+                                    f"Reply again with ONLY the JSON object{keys}, no markdown or extra text."},
+    ]
+    raw = llm.chat(retry_messages, **kwargs)
+    obj, _, _ = parse(raw, schema)
+    _count(name, "calls", "retried", "retry_ok" if obj is not None else "failed")
+    return obj, raw
+
+
+def stats():
+    out = {}
+    with _lock:
+        for name, c in STATS.items():
+            calls = c["calls"] or 1
+            out[name] = dict(c, success_rate=round((c["ok"] + c["repaired"] + c["retry_ok"]) / calls, 3),
+                             repair_rate=round(c["repaired"] / calls, 3))
+    return out
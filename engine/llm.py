@@ -0,0 +1,163 @@
+# ---------------------------
+# LLM call path
+# ---------------------------
+# Every model call in the engine goes through ``chat`` so there is exactly one
+# place that knows about the OpenRouter client, the rate limiter and the
+# per-session scheduling context.
+import contextlib
+import contextvars
+import os
+
+from engine import tasks
+from engine.ratelimit import BACKGROUND, BATCH, INTERACTIVE, RateLimiter  # noqa: F401
+from engine.singleflight import SingleFlight, request_key
+
+MODEL = "meta-llama/llama-3.2-3b-instruct"
+BASE_URL = "https://openrouter.ai/api/v1"
+
+_settings = {"api_key": None, "base_url": BASE_URL}
+_client = None
+_backend = None
+_limiter = None
+_singleflight = SingleFlight()
+
+# who is calling (for fair scheduling) and the lowest priority allowed (batch jobs)
+_session = contextvars.ContextVar("llm_session", default=None)
+_priority_floor = contextvars.ContextVar("llm_priority_floor", default=INTERACTIVE)
+# calls made inside the innermost ``scope`` (what a turn cost)
+_usage = contextvars.ContextVar("llm_usage", default=None)
+
+
+def configure(api_key=None, base_url=None):
+    """Override the key/base url (e.g. from ``st.secrets``) before the first call."""
+    global _client
+    if api_key is not None:
+        _settings["api_key"] = api_key
+    if base_url is not None:
+        _settings["base_url"] = base_url
+    _client = None
+
+
+def get_client():
+    global _client
+    if _client is None:
+        from openai import OpenAI
+        _client = OpenAI(
+            base_url=_settings["base_url"],
+            api_key=_settings["api_key"] or os.getenv("OPENAI_API_KEY"),
+        )
+    return _client
+
+
+def set_backend(backend):
+    """
+    Replace the upstream call with ``backend(messages, model, **kwargs) -> str``.
+    Pass None to go back to the OpenRouter client.
+    """
+    global _backend
+    _backend = backend
+
+
+def set_rate_limits(rpm=None, tpm=None, **kwargs):
+    """Install the process-wide limiter (None/None removes it). Returns the limiter."""
+    global _limiter
+    _limiter = RateLimiter(rpm, tpm, **kwargs) if (rpm or tpm) else None
+    return _limiter
+
+
+def get_limiter():
+    return _limiter
+
+
+@contextlib.contextmanager
+def scope(session_id=None, priority=None):
+    """
+    Attribute the calls made inside to ``session_id``; ``priority`` demotes every
+    call to at least that class (e.g. BATCH for offline re-scoring). Yields
+    {"calls": n}, counting the ``chat`` calls made inside.
+    """
+    usage = {"calls": 0}
+    tokens = [_session.set(session_id) if session_id is not None else None,
+              _priority_floor.set(priority) if priority is not None else None]
+    usage_token = _usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage.reset(usage_token)
+        if tokens[1] is not None:
+            _priority_floor.reset(tokens[1])
+        if tokens[0] is not None:
+            _session.reset(tokens[0])
+
+
+def estimate_tokens(messages):
+    # ~4 characters per token is close enough for budgeting
+    return sum(len(m.get("content") or "") for m in messages) // 4 + 1
+
+
+def _openai_backend(messages, model, **kwargs):
+    client = get_client()
+    if _limiter is not None:
+        # the limiter owns 429 handling (shared pause + backoff); don't retry twice
+        client = client.with_options(max_retries=0)
+    token = tasks.current()
+    if token is None:
+        resp = client.chat.completions.create(model=model, messages=messages, **kwargs)
+        return resp.choices[0].message.content
+    # cancellable work streams, so a cancel closes the connection instead of paying for the rest
+    stream = client.chat.completions.create(model=model, messages=messages, stream=True, **kwargs)
+    parts = []
+    try:
+        for chunk in stream:
+            if token.cancelled:
+                tasks.record_cancelled_call(streamed=True)
+                raise tasks.Cancelled(token.reason)
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+    finally:
+        stream.close()
+    return "".join(parts)
+
+
+def chat(messages, model=MODEL, priority=INTERACTIVE, **kwargs):
+    """
+    messages: list of dicts {role, content}
+    priority: INTERACTIVE for volunteer-facing replies, BACKGROUND for extraction/scoring
+    returns: assistant text (str)
+    raises tasks.Cancelled inside cancelled work (see engine/tasks.py)
+    """
+    backend = _backend or _openai_backend
+    usage = _usage.get()
+    if usage is not None:
+        usage["calls"] += 1
+    token = tasks.current()
+
+    def send():
+        # checked again after the rate limiter: the wait may have made the call stale
+        if token is not None and token.cancelled:
+            tasks.record_cancelled_call(estimate_tokens(messages))
+            raise tasks.Cancelled(token.reason)
+        return backend(messages, model, **kwargs)
+
+    def upstream():
+        if _limiter is None:
+            return send()
+        out = _limiter.call(send, _session.get(), max(priority, _priority_floor.get()), estimate_tokens(messages))
+        _limiter.settle(len(out or "") // 4)
+        return out
+
+    if token is not None:
+        if token.cancelled:
+            send()  # raises Cancelled without queueing at the limiter
+        # not shared: cancelling this call must not fail identical callers
+        return upstream()
+    # identical concurrent requests (double clicks, reruns) share one upstream call
+    return _singleflight.do(request_key(model, messages, kwargs), upstream)
+
+
+def stats():
+    """Counters for the call path (coalescing, rate limiting)."""
+    data = {"singleflight": _singleflight.stats(), "tasks": tasks.stats()}
+    if _limiter is not None:
+        data["limiter"] = _limiter.stats()
+    return data
@@ -0,0 +1,237 @@
+# ---------------------------
+# Compact per-session message log
+# ---------------------------
+# ``ConversationState.messages`` used to be a list of {"role", "content"}
+# dicts. A ``MessageLog`` holds the same turns as slotted ``Message`` records
+# (which still answer ``m["role"]`` / ``m["content"]``), with
+#   * system prompts and template texts shared across sessions: system
+#     prompts are interned once per process and referenced by a stable id,
+#     template turns point at one copy of their text,
+#   * rendered views (conversation text, role-filtered text) cached and, the
+#     log being append-only, extended with just the new turns on the next read
+#     rather than rebuilt (the archived head as chunks are archived); phase
+#     slices via ``mark`` / ``since``,
+#   * everything but the last ``window`` messages archived as zlib'd JSON
+#     chunks; reading the full history inflates them on demand, reading the
+#     recent tail (what the flows send to the LLM) never does.
+import hashlib
+import json
+import sys
+import zlib
+
+# resident messages per session before older ones are archived, and the archive chunk size
+WINDOW = 48
+CHUNK = 16
+# distinct shared (template) texts kept per process; rendered templates carry names, so cap it
+MAX_SHARED = 4096
+
+_prompts = {}     # prompt id -> text
+_prompt_ids = {}  # text -> prompt id
+_shared = {}      # template text -> the one copy sessions point at
+
+
+def intern_prompt(text):
+    """Stable id (sha1 prefix) for a system prompt; the text is kept once per process."""
+    pid = _prompt_ids.get(text)
+    if pid is None:
+        pid = hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+        text = _prompts.setdefault(pid, text)
+        _prompt_ids[text] = pid
+    return pid
+
+
+def prompt_text(pid):
+    return _prompts[pid]
+
+
+class Message:
+    """One turn. Reads like the old dict (``m["content"]``, ``m.get("role")``)."""
+
+    __slots__ = ("role", "content", "prompt")
+
+    def __init__(self, role, content, prompt=None):
+        self.role = sys.intern(role)
+        self.content = content
+        self.prompt = prompt  # system prompt id when the content is a shared prompt
+
+    def __getitem__(self, key):
+        if key == "role":
+            return self.role
+        if key == "content":
+            return self.content
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        return self[key] if key in ("role", "content") else default
+
+    def to_dict(self):
+        return {"role": self.role, "content": self.content}
+
+    def __eq__(self, other):
+        if isinstance(other, (Message, dict)):
+            return self.role == other["role"] and self.content == other["content"]
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Message({self.role!r}, {self.content[:40]!r})"
+
+
+def as_dict(m):
+    """Plain {"role", "content"} dict for an LLM payload (accepts dicts too)."""
+    return {"role": m["role"], "content": m["content"]}
+
+
+def _make(role, content, shared=False):
+    if role == "system":
+        pid = intern_prompt(content)
+        return Message(role, _prompts[pid], pid)
+    if shared and len(_shared) < MAX_SHARED:
+        content = _shared.setdefault(content, content)
+    elif role == "assistant":
+        # rehydrated/archived turns pick up a copy that is already shared
+        content = _shared.get(content, content)
+    return Message(role, content)
+
+
+def _blocks(messages, roles):
+    return [f"{m.role}: {m.content}" for m in messages if m.role != "system" and (roles is None or m.role in roles)]
+
+
+def _join(text, more):
+    return f"{text}\n\n{more}" if text and more else text or more
+
+
+class MessageLog:
+    """Append-only message history with an archived head and cached views."""
+
+    __slots__ = ("window", "_archive", "_archived", "_recent", "_views", "_marks")
+
+    def __init__(self, messages=(), window=WINDOW, marks=None):
+        self.window = window
+        self._archive = []   # zlib'd JSON chunks, oldest first
+        self._archived = 0   # messages in the archive
+        self._recent = []    # resident Message records
+        self._views = {}
+        self._marks = dict(marks or {})  # label -> message index (e.g. where a phase started)
+        for m in messages:
+            self._recent.append(_make(m["role"], m["content"]))
+        self._compact()
+
+    # ---------------------------
+    # Writing
+    # ---------------------------
+    def append(self, role, content, shared=False):
+        """Add a turn; ``shared`` texts (fixed templates) are interned across sessions."""
+        msg = _make(role, content, shared)
+        self._recent.append(msg)
+        self._compact()
+        return msg
+
+    def mark(self, label):
+        """Remember that ``label`` (e.g. ``"phase:3"``) starts at the next message."""
+        self._marks[label] = len(self)
+
+    @property
+    def marks(self):
+        return dict(self._marks)
+
+    def _compact(self):
+        while len(self._recent) > self.window + CHUNK:
+            chunk, self._recent = self._recent[:CHUNK], self._recent[CHUNK:]
+            rows = [[m.role, m.content] for m in chunk]
+            self._archive.append(zlib.compress(json.dumps(rows, ensure_ascii=False).encode("utf-8")))
+            start, self._archived = self._archived, self._archived + len(chunk)
+            # archived text never changes: the chunk's text moves from the front of
+            # the cached resident view to the end of the cached head
+            for roles in {key[1] for key in self._views}:
+                text = "\n\n".join(_blocks(chunk, roles))
+                done, head = self._views.get(("head", roles), (0, ""))
+                if done == start:
+                    self._views[("head", roles)] = (self._archived, _join(head, text))
+                done, view = self._views.pop(("text", roles), (0, None))
+                if view is not None and done >= self._archived:
+                    self._views[("text", roles)] = (done, view[len(text):].removeprefix("\n\n"))
+
+    # ---------------------------
+    # Reading
+    # ---------------------------
+    def __len__(self):
+        return self._archived + len(self._recent)
+
+    def _inflate(self):
+        for blob in self._archive:
+            for role, content in json.loads(zlib.decompress(blob)):
+                yield _make(role, content)
+
+    def __iter__(self):
+        yield from self._inflate()
+        yield from self._recent
+
+    def __reversed__(self):
+        yield from reversed(self._recent)
+        if self._archive:
+            yield from reversed(list(self._inflate()))
+
+    def __getitem__(self, index):
+        n = len(self)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(n)
+            if start >= self._archived and step == 1:
+                return self._recent[start - self._archived:stop - self._archived]
+            return list(self)[index]
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("message index out of range")
+        if index >= self._archived:
+            return self._recent[index - self._archived]
+        return list(self._inflate())[index]
+
+    def tail(self, n):
+        """The last ``n`` messages (no inflation while ``n`` is within the resident window)."""
+        return self[max(0, len(self) - n):]
+
+    def since(self, label):
+        """Messages from ``mark(label)`` on (all of them if the label was never marked)."""
+        return self[self._marks.get(label, 0):]
+
+    def section(self, label, until):
+        """Messages from ``mark(label)`` up to ``mark(until)`` (or the end if not marked yet)."""
+        return self[self._marks.get(label, 0):self._marks.get(until, len(self))]
+
+    def to_dicts(self, start=0):
+        return [m.to_dict() for m in self[start:]]
+
+    def text(self, roles=None):
+        """
+        ``"role: content"`` blocks of the whole log (optionally only ``roles``).
+        Both parts are cached: the archived head is inflated once per
+        ``roles`` and then extended as chunks are archived, the resident
+        turns' text only renders the turns added since the last call.
+        """
+        key = ("text", roles)
+        done, view = self._views.get(key, (self._archived, ""))
+        if done < len(self):
+            view = _join(view, "\n\n".join(_blocks(self[done:], roles)))
+            self._views[key] = (len(self), view)
+        if not self._archived:
+            return view
+        key = ("head", roles)
+        done, head = self._views.get(key, (0, ""))
+        if done < self._archived:
+            blocks = [f"{role}: {content}" for blob in self._archive[done // CHUNK:]
+                      for role, content in json.loads(zlib.decompress(blob))
+                      if role != "system" and (roles is None or role in roles)]
+            head = _join(head, "\n\n".join(blocks))
+            self._views[key] = (self._archived, head)
+        return _join(head, view)
+
+    def nbytes(self):
+        """Rough resident size in bytes (records, contents not shared, archive, cached views)."""
+        size = 56 * len(self._recent) + sum(len(blob) for blob in self._archive)
+        size += sum(len(m.content) for m in self._recent
+                    if m.prompt is None and _shared.get(m.content) is not m.content)
+        return size + sum(len(v) for _, v in self._views.values())
+
+    def __repr__(self):
+        return f"MessageLog({len(self)} messages, {self._archived} archived)"
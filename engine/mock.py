@@ -0,0 +1,66 @@
+# ---------------------------
+# Mock LLM backend for benchmarks and local servers
+# ---------------------------
+# Answers every kind of call the flows make (classification JSON, extraction,
+# scoring, YES/NO decisions, free-text replies) without a network round trip.
+import itertools
+import json
+import threading
+import time
+
+from engine import tasks
+
+_SIGNAL_SEQUENCE = [
+    {"motivation": "help", "has_teaching_experience": None, "subjects": [], "teaching_interest": None, "children_age_comfort": None},
+    {"motivation": None, "has_teaching_experience": True, "subjects": ["maths"], "teaching_interest": None, "children_age_comfort": None},
+    {"motivation": None, "has_teaching_experience": None, "subjects": [], "teaching_interest": "yes", "children_age_comfort": None},
+    {"motivation": None, "has_teaching_experience": None, "subjects": ["english"], "teaching_interest": None, "children_age_comfort": "primary"},
+]
+
+
+class MockLLM:
+    """
+    ``MockLLM(latency=0.05)`` is a drop-in for ``llm.set_backend``.
+    ``latency`` seconds are slept per call to stand in for the upstream round trip;
+    inside cancellable work a cancel ends the wait like a closed stream would.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._turns = itertools.count()
+
+    def __call__(self, messages, model, **kwargs):
+        with self._lock:
+            self.calls += 1
+        token = tasks.current()
+        if token is not None and token.wait(self.latency):
+            tasks.record_cancelled_call(streamed=True)
+            raise tasks.Cancelled(token.reason)
+        if token is None and self.latency:
+            time.sleep(self.latency)
+        system = messages[0]["content"] if messages else ""
+        last = messages[-1]["content"] if messages else ""
+        if kwargs.get("response_format") and any("WEEKLY_COMMITMENT" in m["content"] for m in messages[:2]):
+            return json.dumps({"intent": "TIME_YES", "confidence": 0.9, "tone_reply": "Wonderful 😊"})
+        if kwargs.get("response_format") or '"intent"' in system:
+            signals = _SIGNAL_SEQUENCE[next(self._turns) % len(_SIGNAL_SEQUENCE)]
+            return json.dumps({
+                "intent": "EXPERIENCE_SHARED",
+                "confidence": 0.8,
+                "tone_reply": "That's lovely to hear 😊 What subjects would you enjoy teaching?",
+                "signals": signals,
+            })
+        if "evaluator" in system:
+            return json.dumps({"score": 4, "notes": "Engaged and clear."})
+        if "JSON extractor" in system or "extraction assistant" in system:
+            return json.dumps({"name": None, "experience": None, "languages": [], "subjects": [],
+                               "availability": None, "motivation": None, "concerns": None})
+        if "YES or NO" in system:
+            return "YES"
+        if "summarizer" in system:
+            return "Volunteer is motivated and available. Recommend — engaged throughout."
+        if "acknowledgement" in system:
+            return "Thanks for sharing."
+        return f"Thanks! ({len(last)} chars noted) Could you tell me a little more?"
@@ -0,0 +1,131 @@
+# ---------------------------
+# Phase-agent plugins for the multi-agent flow
+# ---------------------------
+# Each phase is a module in agents/ named ``phase<N>_<slug>.py`` (see
+# agents/__init__.py for the interface). The registry finds them by file name
+# and imports a phase's module the first time that phase is used, so a
+# session only loads the phases it reaches and each phase can be tuned
+# (prompt, model/generation profile, rubric, completion rule) on its own.
+#
+# A turn runs the phase's conversational agent; phases with
+# ``EVALUATE_EACH_TURN`` also start their rubric evaluator in the background
+# alongside it (engine.tasks), so the score is ready when the coordinator
+# moves on.
+import importlib
+import os
+import re
+from collections.abc import Mapping
+
+from engine import completion, llm, summaries, tasks
+from engine.extraction import score_phase
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AGENTS_PACKAGE = "agents"
+AGENTS_DIR = os.path.join(ROOT, AGENTS_PACKAGE)
+_MODULE = re.compile(r"^phase(\d+)_\w+\.py$")
+
+
+class PhaseAgent:
+    """One phase plugin. Reads like the old PHASES dict entries (``agent["name"]``, ``agent["guide"]``)."""
+
+    def __init__(self, module):
+        self.module = module
+        self.id = module.PHASE_ID
+        self.name = module.PHASE_NAME
+        self.guide = module.PHASE_PROMPT
+        self.rubric = getattr(module, "RUBRIC", None)
+        self.profile = dict(getattr(module, "PROFILE", {}))
+        self.evaluate_each_turn = getattr(module, "EVALUATE_EACH_TURN", False)
+        self.completion = completion.Phase(getattr(module, "REQUIRED_FIELDS", ()), getattr(module, "MIN_TURNS", 1),
+                                           getattr(module, "MAX_TURNS", 6), getattr(module, "ENDS_ON", ()))
+
+    def __getitem__(self, key):
+        if key == "name":
+            return self.name
+        if key == "guide":
+            return self.guide
+        raise KeyError(key)
+
+    def reply(self, messages):
+        """The agent's next message; a module's ``run_phase(messages, profile)`` replaces the default call."""
+        run_phase = getattr(self.module, "run_phase", None)
+        if run_phase is not None:
+            return run_phase(messages, self.profile)
+        return llm.chat(messages, **self.profile)
+
+    def is_complete(self, state, messages):
+        """The module's completion rule over this phase's ``messages``: True / False / None (can't tell)."""
+        rule = getattr(self.module, "is_complete", None)
+        return rule(state, messages) if rule is not None else None
+
+    def __repr__(self):
+        return f"PhaseAgent({self.id}, {self.name!r})"
+
+
+class Registry(Mapping):
+    """{phase_id: PhaseAgent} over the modules in ``path``, each imported on first access."""
+
+    def __init__(self, package=AGENTS_PACKAGE, path=AGENTS_DIR):
+        self.package = package
+        self.path = path
+        self._modules = None   # phase id -> module name, from file names only
+        self._agents = {}
+
+    def _discover(self):
+        if self._modules is None:
+            modules = {}
+            for filename in sorted(os.listdir(self.path)):
+                match = _MODULE.match(filename)
+                if match:
+                    modules[int(match.group(1))] = filename[:-len(".py")]
+            self._modules = modules
+        return self._modules
+
+    def __getitem__(self, phase_id):
+        agent = self._agents.get(phase_id)
+        if agent is None:
+            name = self._discover()[phase_id]
+            agent = self._agents[phase_id] = PhaseAgent(importlib.import_module(f"{self.package}.{name}"))
+        return agent
+
+    def __iter__(self):
+        return iter(sorted(self._discover()))
+
+    def __len__(self):
+        return len(self._discover())
+
+    def loaded(self):
+        return sorted(self._agents)
+
+
+class Rubrics(Mapping):
+    """{phase_id: rubric} view of a registry (for scoring and re-scoring)."""
+
+    def __init__(self, registry):
+        self.registry = registry
+
+    def __getitem__(self, phase_id):
+        return self.registry[phase_id].rubric
+
+    def __iter__(self):
+        return iter(self.registry)
+
+    def __len__(self):
+        return len(self.registry)
+
+
+def evaluate(agent, state):
+    """Score the phase so far in the background; a newer evaluation of the phase cancels this one."""
+    text = summaries.phase_text(state, agent.id)
+    return tasks.start(state.session_id, f"evaluate:{agent.id}", score_phase, agent.id, text, agent.rubric,
+                       apply=lambda score: summaries.store_score(state, agent.id, score))
+
+
+def run_turn(agent, state, messages):
+    """The agent's reply to ``messages``, with the phase evaluator running alongside when enabled."""
+    if agent.evaluate_each_turn and agent.rubric:
+        evaluate(agent, state)
+    reply = agent.reply(messages)
+    if not completion.enabled(state):  # unattended sessions already ran the full check (engine/completion.py)
+        state.meta["phase_complete"] = agent.is_complete(state, summaries.phase_messages(state, agent.id))
+    return reply
@@ -0,0 +1,202 @@
+# ---------------------------
+# Typed profiles with declared merge policies and provenance
+# ---------------------------
+# A profile type is a list of Fields compiled into a slotted class, so every
+# profile of a type has the same fixed footprint (sets are capped). Each
+# field keeps (turn, confidence) of the write that set it.
+#
+# Merge policies:
+#   "first"     first non-empty value wins
+#   "latest"    every non-empty value overwrites
+#   "confident" overwrite when the new confidence is at least the stored one
+#   "union"     set fields: add normalised items (deduplicated, capped)
+MAX_SET_ITEMS = 16
+_EMPTY_TEXT = {"", "none", "null", "n/a", "na", "unknown"}
+
+
+class Field:
+
+    __slots__ = ("name", "kind", "policy", "values", "aliases")
+
+    def __init__(self, name, kind="text", policy="latest", values=None, aliases=None):
+        if kind not in ("text", "bool", "enum", "set"):
+            raise ValueError(f"{name}: unknown kind {kind!r}")
+        if policy not in ("first", "latest", "confident", "union"):
+            raise ValueError(f"{name}: unknown policy {policy!r}")
+        if (kind == "set") != (policy == "union"):
+            raise ValueError(f"{name}: set fields (and only they) use the 'union' policy")
+        self.name = name
+        self.kind = kind
+        self.policy = policy
+        self.values = tuple(values or ())
+        self.aliases = {k.lower(): v for k, v in (aliases or {}).items()}
+
+    def normalize(self, value):
+        """Canonical value, or None when ``value`` carries nothing usable."""
+        if value is None:
+            return None
+        if self.kind == "set":
+            items = value.split(",") if isinstance(value, str) else value
+            if not isinstance(items, (list, tuple, set, frozenset)):
+                return None
+            out = set()
+            for item in items:
+                item = str(item).strip().lower()
+                if item and item not in _EMPTY_TEXT:
+                    out.add(self.aliases.get(item, item))
+            return out or None
+        if self.kind == "bool":
+            if isinstance(value, bool):
+                return value
+            v = str(value).strip().lower()
+            return True if v in ("true", "yes") else False if v in ("false", "no") else None
+        v = str(value).strip()
+        if v.lower() in _EMPTY_TEXT:
+            return None
+        if self.kind == "enum":
+            v = self.aliases.get(v.lower(), v.lower())
+            return v if v in self.values else None
+        return v
+
+
+class Profile:
+    """Base for the generated profile types; see ``profile_type``."""
+
+    __slots__ = ("_prov",)
+    FIELDS = ()
+    INDEX = {}
+    TYPE = None
+
+    def __init__(self):
+        for f in self.FIELDS:
+            setattr(self, f.name, set() if f.kind == "set" else None)
+        self._prov = [None] * len(self.FIELDS)
+
+    # dict-style read access, so callers can keep using profile["subjects"]
+    def __getitem__(self, name):
+        if name not in self.INDEX:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def get(self, name, default=None):
+        return getattr(self, name) if name in self.INDEX else default
+
+    def keys(self):
+        return [f.name for f in self.FIELDS]
+
+    def filled(self, name):
+        value = getattr(self, name)
+        return bool(value) if isinstance(value, set) else value is not None
+
+    def __bool__(self):
+        return any(self.filled(f.name) for f in self.FIELDS)
+
+    def merge(self, signals, turn=None, confidence=None):
+        """Apply each field's policy to ``signals``; returns the names that changed."""
+        changed = []
+        if not isinstance(signals, dict):
+            return changed
+        conf = float(confidence) if isinstance(confidence, (int, float)) else 0.0
+        for i, f in enumerate(self.FIELDS):
+            if f.name not in signals:
+                continue
+            value = f.normalize(signals[f.name])
+            if value is None:
+                continue
+            current = getattr(self, f.name)
+            if f.policy == "union":
+                room = MAX_SET_ITEMS - len(current)
+                new = sorted(value - current)[:max(0, room)]
+                if not new:
+                    continue
+                current.update(new)
+            elif f.policy == "first" and current is not None:
+                continue
+            elif f.policy == "confident" and current is not None and conf < (self._prov[i] or (None, 0.0))[1]:
+                continue
+            elif value == current:
+                continue
+            else:
+                setattr(self, f.name, value)
+            self._prov[i] = (turn, conf)
+            changed.append(f.name)
+        return changed
+
+    def to_dict(self):
+        return {f.name: sorted(getattr(self, f.name)) if f.kind == "set" else getattr(self, f.name)
+                for f in self.FIELDS}
+
+    def provenance(self):
+        return {f.name: {"turn": p[0], "confidence": p[1]}
+                for f, p in zip(self.FIELDS, self._prov) if p is not None}
+
+    def dump(self):
+        return {"__profile__": self.TYPE, "values": self.to_dict(), "provenance": self._prov}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+
+PROFILE_TYPES = {}
+
+
+def profile_type(type_name, fields):
+    """Build (and register) a slotted Profile subclass for ``fields``."""
+    cls = type(type_name, (Profile,), {
+        "__slots__": tuple(f.name for f in fields),
+        "FIELDS": tuple(fields),
+        "INDEX": {f.name: i for i, f in enumerate(fields)},
+        "TYPE": type_name,
+    })
+    PROFILE_TYPES[type_name] = cls
+    return cls
+
+
+def restore(data):
+    """Inverse of ``Profile.dump``; anything else is returned unchanged."""
+    if not isinstance(data, dict) or "__profile__" not in data:
+        return data
+    profile = PROFILE_TYPES[data["__profile__"]]()
+    for f in profile.FIELDS:
+        value = data["values"].get(f.name)
+        setattr(profile, f.name, set(value or ()) if f.kind == "set" else value)
+    profile._prov = [tuple(p) if p is not None else None for p in data.get("provenance") or profile._prov]
+    return profile
+
+
+# ---------------------------
+# Profile types
+# ---------------------------
+SUBJECT_ALIASES = {"math": "maths", "mathematics": "maths", "eng": "english", "sci": "science",
+                   "computers": "computer science", "cs": "computer science", "evs": "environmental studies"}
+
+VolunteerProfile = profile_type("VolunteerProfile", [
+    Field("motivation", "text", "confident"),
+    Field("has_teaching_experience", "bool", "confident"),
+    Field("children_age_comfort", "enum", "confident",
+          values=("primary", "middle", "secondary", "unsure"),
+          aliases={"5-10": "primary", "elementary": "primary", "lower primary": "primary",
+                   "11-14": "middle", "middle school": "middle",
+                   "15-18": "secondary", "high school": "secondary",
+                   "not sure": "unsure", "any": "unsure"}),
+    Field("teaching_interest", "enum", "confident",
+          values=("yes", "no", "maybe"),
+          aliases={"y": "yes", "yeah": "yes", "true": "yes", "n": "no", "false": "no",
+                   "not sure": "maybe", "unsure": "maybe"}),
+    Field("subjects", "set", "union", aliases=SUBJECT_ALIASES),
+])
+
+# backs state.extracted in the phase / multi-agent / scored screening flows;
+# extraction re-reads the whole conversation, so the latest answer wins
+ExtractedProfile = profile_type("ExtractedProfile", [
+    Field("name", "text", "latest"),
+    Field("experience", "text", "latest"),
+    Field("languages", "set", "union"),
+    Field("subjects", "set", "union", aliases=SUBJECT_ALIASES),
+    Field("availability", "text", "latest"),
+    Field("motivation", "text", "latest"),
+    Field("concerns", "text", "latest"),
+])
@@ -0,0 +1,211 @@
+# ---------------------------
+# Global LLM rate limiter + fair scheduler
+# ---------------------------
+# One RateLimiter per process, shared by every session. It enforces
+# requests/min and tokens/min with token buckets, and decides who goes next:
+#   - strict priority between classes (volunteer replies before background
+#     extraction/scoring, background before batch re-scoring);
+#   - weighted fair queueing between sessions inside a class, so a chatty
+#     session cannot starve the others.
+# Upstream 429s pause the whole limiter for Retry-After (or an exponential
+# backoff with jitter) before the call is retried.
+import collections
+import heapq
+import itertools
+import random
+import threading
+import time
+
+INTERACTIVE = 0   # volunteer-facing replies
+BACKGROUND = 1    # extraction, scoring, summaries
+BATCH = 2         # offline re-scoring jobs
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background", BATCH: "batch"}
+
+
+class TokenBucket:
+
+    def __init__(self, per_minute, burst=None, clock=time.monotonic):
+        self.rate = per_minute / 60.0
+        self.capacity = float(burst if burst is not None else per_minute)
+        self.level = self.capacity
+        self._clock = clock
+        self._stamp = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self.level = min(self.capacity, self.level + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def wait_time(self, amount):
+        """Seconds until ``amount`` is available (0 if it is now)."""
+        self._refill()
+        # a single request bigger than the bucket only has to wait for a full bucket
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount):
+        self._refill()
+        self.level -= amount
+
+
+class _Waiter:
+    __slots__ = ("session_id", "priority", "tokens", "event", "enqueued")
+
+    def __init__(self, session_id, priority, tokens, enqueued):
+        self.session_id = session_id
+        self.priority = priority
+        self.tokens = tokens
+        self.event = threading.Event()
+        self.enqueued = enqueued
+
+
+class RateLimited(Exception):
+    """Raised by a backend for an upstream 429; ``retry_after`` is in seconds (or None)."""
+
+    def __init__(self, retry_after=None):
+        super().__init__(f"rate limited (retry after {retry_after}s)")
+        self.retry_after = retry_after
+
+
+def retry_after_from(exc):
+    """Return (is_429, retry_after_seconds) for an exception raised by an upstream call."""
+    if isinstance(exc, RateLimited):
+        return True, exc.retry_after
+    if getattr(exc, "status_code", None) != 429:
+        return False, None
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return True, float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return True, None
+
+
+class RateLimiter:
+
+    def __init__(self, rpm=None, tpm=None, weights=None, clock=time.monotonic, max_retries=5,
+                 backoff_base=1.0, backoff_cap=60.0):
+        self.requests = TokenBucket(rpm, clock=clock) if rpm else None
+        self.tokens = TokenBucket(tpm, clock=clock) if tpm else None
+        self.weights = weights or {}
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._queues = {p: [] for p in PRIORITY_NAMES}   # heap of (finish_tag, seq, waiter)
+        self._finish = {}                                   # session_id -> last virtual finish tag
+        self._queued = collections.Counter()                # session_id -> waiters in queue
+        self._vtime = {p: 0.0 for p in PRIORITY_NAMES}
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+        self.metrics = {
+            "granted": collections.Counter(), "wait_seconds": collections.Counter(),
+            "max_wait_seconds": collections.Counter(), "throttled": 0, "retries": 0,
+        }
+
+    # ---------------------------
+    # Scheduling
+    # ---------------------------
+    def _next_waiter(self):
+        for p in sorted(self._queues):
+            if self._queues[p]:
+                return self._queues[p][0][2]
+        return None
+
+    def _pump(self):
+        """Grant as many head-of-line waiters as the buckets allow; returns the delay until the next try."""
+        while True:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return None
+            delay = max(0.0, self._paused_until - self._clock())
+            if self.requests is not None:
+                delay = max(delay, self.requests.wait_time(1))
+            if self.tokens is not None:
+                delay = max(delay, self.tokens.wait_time(waiter.tokens))
+            if delay > 0:
+                return delay
+            finish, _, _ = heapq.heappop(self._queues[waiter.priority])
+            self._vtime[waiter.priority] = finish
+            if self.requests is not None:
+                self.requests.take(1)
+            if self.tokens is not None:
+                self.tokens.take(waiter.tokens)
+            self._queued[waiter.session_id] -= 1
+            if not self._queued[waiter.session_id]:
+                # nothing left queued: its finish tag is now <= virtual time, so forget it
+                del self._queued[waiter.session_id]
+                del self._finish[waiter.session_id]
+            waiter.event.set()
+
+    def acquire(self, session_id=None, priority=INTERACTIVE, tokens=1):
+        """Block until this call may go upstream; returns the seconds spent waiting."""
+        session_id = session_id or "-"
+        with self._lock:
+            now = self._clock()
+            weight = self.weights.get(session_id, 1.0)
+            start = max(self._vtime[priority], self._finish.get(session_id, 0.0))
+            finish = start + tokens / weight
+            self._finish[session_id] = finish
+            self._queued[session_id] += 1
+            waiter = _Waiter(session_id, priority, tokens, now)
+            heapq.heappush(self._queues[priority], (finish, next(self._seq), waiter))
+            delay = self._pump()
+        while not waiter.event.is_set():
+            waiter.event.wait(delay if delay is not None else 0.05)
+            with self._lock:
+                delay = self._pump()
+        waited = self._clock() - waiter.enqueued
+        name = PRIORITY_NAMES[priority]
+        with self._lock:
+            self.metrics["granted"][name] += 1
+            self.metrics["wait_seconds"][name] += waited
+            self.metrics["max_wait_seconds"][name] = max(self.metrics["max_wait_seconds"][name], waited)
+        return waited
+
+    def settle(self, tokens):
+        """Charge tokens only known after the call (the completion) without blocking."""
+        if self.tokens is not None and tokens > 0:
+            with self._lock:
+                self.tokens.take(tokens)
+
+    def pause(self, seconds):
+        """Stop granting anyone for ``seconds`` (an upstream 429 applies to the whole key)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    def backoff(self, attempt, retry_after=None):
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        return max(delay, retry_after or 0.0)
+
+    def call(self, fn, session_id=None, priority=INTERACTIVE, tokens=1, sleep=time.sleep):
+        """Run ``fn()`` under the limiter, retrying 429s with Retry-After / backoff + jitter."""
+        for attempt in range(self.max_retries + 1):
+            self.acquire(session_id, priority, tokens)
+            try:
+                return fn()
+            except Exception as e:
+                is_429, retry_after = retry_after_from(e)
+                if not is_429 or attempt == self.max_retries:
+                    raise
+                delay = self.backoff(attempt, retry_after)
+                with self._lock:
+                    self.metrics["throttled"] += 1
+                    self.metrics["retries"] += 1
+                self.pause(delay)
+                sleep(delay)
+
+    def stats(self):
+        with self._lock:
+            depth = {PRIORITY_NAMES[p]: len(q) for p, q in self._queues.items()}
+            granted = dict(self.metrics["granted"])
+            return {
+                "queue_depth": depth,
+                "granted": granted,
+                "avg_wait_ms": {k: round(self.metrics["wait_seconds"][k] / n * 1000, 2) for k, n in granted.items()},
+                "max_wait_ms": {k: round(v * 1000, 2) for k, v in self.metrics["max_wait_seconds"].items()},
+                "throttled": self.metrics["throttled"],
+                "retries": self.metrics["retries"],
+            }
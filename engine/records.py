@@ -0,0 +1,168 @@
+# ---------------------------
+# Transcript + meta records
+# ---------------------------
+import datetime
+import json
+import os
+import uuid
+
+from engine.messages import MessageLog
+from engine.profile import ExtractedProfile, Profile, VolunteerProfile
+from engine.summaries import NOT_REACHED
+
+RECORDS_DIR = "records"
+# bump when the JSON layout changes; ``migrate_record`` upgrades older files
+RECORD_VERSION = 2
+_made_dirs = set()
+
+
+def now_ts():
+    return datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+def make_prefix():
+    return f"vol_{now_ts()}_{uuid.uuid4().hex[:6]}"
+
+
+def save_state(state, prefix=None, records_dir=RECORDS_DIR):
+    """Write ``<prefix>.txt`` (readable transcript) and ``<prefix>.json`` for a conversation."""
+    prefix = prefix or state.meta.get("file_prefix") or make_prefix()
+    if records_dir not in _made_dirs:
+        os.makedirs(records_dir, exist_ok=True)
+        _made_dirs.add(records_dir)
+    txt_path = os.path.join(records_dir, f"{prefix}.txt")
+    json_path = os.path.join(records_dir, f"{prefix}.json")
+    _write_transcript(txt_path, state.messages)
+    payload = {
+        "version": RECORD_VERSION,
+        "session_id": state.session_id,
+        "flow": state.flow,
+        "history": state.messages.to_dicts(),
+        "message_marks": state.messages.marks,
+        "phase": state.phase,
+        "extracted": state.extracted.to_dict() if isinstance(state.extracted, Profile) else state.extracted,
+        "scores": {str(k): v for k, v in state.scores.items()},
+        "meta": state.meta,
+        "saved_at": now_ts(),
+    }
+    if state.profile is not None:
+        payload["volunteer_profile"] = state.profile.to_dict()
+        payload["volunteer_profile_provenance"] = state.profile.provenance()
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2, default=str)
+    return txt_path, json_path
+
+
+def _write_transcript(path, messages):
+    with open(path, "w", encoding="utf-8") as f:
+        for m in messages:
+            f.write(f"{m['role'].upper()}: {m['content']}\n\n")
+
+
+# ---------------------------
+# Reading and migrating records
+# ---------------------------
+def _legacy_flow(data):
+    # the pre-engine apps didn't store the flow: scored kept "scores" next to a
+    # "timestamp", multi_agent kept them under meta, the phase app had none
+    if "scores" in data:
+        return "scored"
+    if "scores" in (data.get("meta") or {}):
+        return "multi_agent"
+    return "phase"
+
+
+def migrate_record(data, prefix=None):
+    """Bring a record (including the formats the apps wrote before the engine) to ``RECORD_VERSION``."""
+    if data.get("version", 0) >= RECORD_VERSION:
+        return data
+    meta = dict(data.get("meta") or {})
+    if prefix:
+        meta.setdefault("file_prefix", prefix)
+    scores = data.get("scores") if "scores" in data else meta.pop("scores", {})
+    extracted = data.get("extracted") or {}
+    if isinstance(extracted, dict) and "raw" not in extracted:
+        profile = ExtractedProfile()
+        profile.merge(extracted)
+        extracted = profile.to_dict()
+    migrated = dict(data)
+    migrated.pop("timestamp", None)
+    migrated.update({
+        "version": RECORD_VERSION,
+        "session_id": data.get("session_id") or meta.get("file_prefix") or uuid.uuid4().hex,
+        "flow": data.get("flow") or _legacy_flow(data),
+        # the old apps kept the system prompt as the first history entry
+        "history": [m for m in data.get("history") or [] if m.get("role") != "system"],
+        "extracted": extracted,
+        "scores": {str(k): v for k, v in (scores or {}).items()},
+        "meta": meta,
+        "saved_at": data.get("saved_at") or data.get("timestamp") or now_ts(),
+    })
+    return migrated
+
+
+def load_record(json_path):
+    with open(json_path, encoding="utf-8") as f:
+        data = json.load(f)
+    return migrate_record(data, os.path.splitext(os.path.basename(json_path))[0])
+
+
+def _reached_phase(scores, marks):
+    # records saved before "phase" was stored: every phase with a score or a
+    # start mark was reached (``close_phase`` notes the others as not reached)
+    reached = [1]
+    for pid, entry in scores.items():
+        if str(pid).isdigit() and isinstance(entry, dict) and entry.get("notes") != NOT_REACHED:
+            reached.append(int(pid))
+    for label in marks:
+        if label.startswith("phase:") and label[6:].isdigit():
+            reached.append(int(label[6:]))
+    return max(reached)
+
+
+def load_state(json_path):
+    """Rebuild a ``ConversationState`` from a saved record (any version)."""
+    from engine.state import ConversationState
+    data = load_record(json_path)
+    state = ConversationState(data["flow"], data["session_id"])
+    marks = data.get("message_marks") or {}
+    state.messages = MessageLog(data["history"], marks=marks)
+    state.phase = data.get("phase") or _reached_phase(data["scores"], marks)
+    state.meta = data["meta"]
+    state.extracted = ExtractedProfile()
+    if "raw" not in data["extracted"]:
+        state.extracted.merge(data["extracted"])
+    state.scores = {int(k) if str(k).isdigit() else k: v for k, v in data["scores"].items()}
+    if data.get("volunteer_profile") is not None:
+        state.profile = VolunteerProfile()
+        provenance = data.get("volunteer_profile_provenance") or {}
+        for name, value in data["volunteer_profile"].items():
+            source = provenance.get(name) or {}
+            state.profile.merge({name: value}, turn=source.get("turn"), confidence=source.get("confidence"))
+    return state
+
+
+def record_paths(records_dir=RECORDS_DIR):
+    """Saved interview records (``<prefix>.json``) directly under ``records_dir``."""
+    if not os.path.isdir(records_dir):
+        return []
+    return sorted(os.path.join(records_dir, name) for name in os.listdir(records_dir) if name.endswith(".json"))
+
+
+def migrate_records(records_dir=RECORDS_DIR, dry_run=False):
+    """Rewrite every older record (and its transcript) in place; returns {"migrated": n, "current": n}."""
+    counts = {"migrated": 0, "current": 0}
+    for json_path in record_paths(records_dir):
+        with open(json_path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version", 0) >= RECORD_VERSION:
+            counts["current"] += 1
+            continue
+        counts["migrated"] += 1
+        if dry_run:
+            continue
+        migrated = migrate_record(data, os.path.splitext(os.path.basename(json_path))[0])
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(migrated, f, ensure_ascii=False, indent=2, default=str)
+        _write_transcript(os.path.splitext(json_path)[0] + ".txt", migrated["history"])
+    return counts
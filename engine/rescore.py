@@ -0,0 +1,95 @@
+# ---------------------------
+# Batch re-scoring of saved interviews
+# ---------------------------
+# Re-runs the per-phase rubric scoring (and the overall recommendation for
+# the scored flow) over saved records, e.g. after a rubric or model change.
+# Calls run at BATCH priority so a shared rate limit still favours live
+# interviews.
+#
+#   python -m engine rescore --records-dir records --concurrency 4
+import argparse
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from engine import llm, records, summaries
+from engine.extraction import compute_overall_recommendation, conversation_text, score_phase
+
+log = logging.getLogger(__name__)
+
+
+def rubrics_for(flow_name):
+    """{phase_id: rubric} for flows that score phases, else None."""
+    if flow_name == "scored":
+        from engine.flows import scored
+        return scored.PHASE_SCORE_PROMPTS
+    if flow_name == "multi_agent":
+        from engine.flows import multi_agent
+        return multi_agent.RUBRICS
+    return None
+
+
+def rescore_record(json_path, write=True):
+    """Re-score one record; returns (status, state) with status "rescored" or "skipped"."""
+    state = records.load_state(json_path)
+    rubrics = rubrics_for(state.flow)
+    if rubrics is None:
+        return "skipped", state
+    conv_text = conversation_text(state.messages)
+    with llm.scope(state.session_id, priority=llm.BATCH):
+        for pid, rubric in rubrics.items():
+            if pid > state.phase:
+                # never reached: nothing to score, and it stays out of the overall recommendation
+                summaries.store_score(state, pid, {"notes": summaries.NOT_REACHED})
+                continue
+            # the phase summary doesn't depend on the rubric
+            summaries.store_score(state, pid, score_phase(pid, conv_text, rubric))
+    if state.flow == "scored":
+        state.scores["overall"] = compute_overall_recommendation(state.scores, list(rubrics))
+    if write:
+        records.save_state(state, records_dir=os.path.dirname(json_path) or ".")
+    return "rescored", state
+
+
+def rescore(paths, concurrency=4, write=True, flow=None):
+    """Re-score ``paths`` concurrently; returns {"rescored": n, "skipped": n, "failed": n}."""
+    counts = {"rescored": 0, "skipped": 0, "failed": 0}
+
+    def one(path):
+        try:
+            if flow is not None and records.load_record(path)["flow"] != flow:
+                return "skipped"
+            return rescore_record(path, write)[0]
+        except Exception:
+            log.exception("rescore failed for %s", path)
+            return "failed"
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        for status in pool.map(one, paths):
+            counts[status] += 1
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score saved interviews with the current rubrics.")
+    parser.add_argument("--records-dir", default=records.RECORDS_DIR)
+    parser.add_argument("--flow", default=None, help="only records of this flow (scored / multi_agent)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--dry-run", action="store_true", help="score but don't write the records back")
+    parser.add_argument("--rpm", type=float, default=None, help="LLM requests/min")
+    parser.add_argument("--tpm", type=float, default=None, help="LLM tokens/min")
+    parser.add_argument("--mock-llm", type=float, metavar="LATENCY", default=None,
+                        help="use the mock LLM with this per-call latency (seconds)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.mock_llm is not None:
+        from engine.mock import MockLLM
+        llm.set_backend(MockLLM(args.mock_llm))
+    llm.set_rate_limits(args.rpm, args.tpm)
+    counts = rescore(records.record_paths(args.records_dir), args.concurrency, not args.dry_run, args.flow)
+    print(f"rescore: {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+# ---------------------------
+# Rule-based intent + confidence from one compiled keyword pass
+# ---------------------------
+# Keyword packs map phrases to feature flags. All packs are merged into a
+# single regex (longest phrase first, word-bounded) at import, so one
+# ``finditer`` over the message yields every feature; ``RULES`` then turns the
+# feature set into (intent, confidence) — first matching row wins.
+#
+# Matches may overlap ("i am not" and "not able" in "I am not able to"), but
+# a phrase inside a longer match doesn't count: "pata nahi" / "not sure" are
+# HEDGE, not NEGATE, and "no problem" / "koi baat nahi" are AFFIRM.
+#
+# ``CLAUSES`` only count as a clause of their own: "I do." answers the
+# question but "I do not think so" doesn't, "no, stop" stops but "exit
+# strategy" and "I will leave it to you" don't.
+import re
+
+STOP, AFFIRM, STRONG, NEGATE, HEDGE, QUERY, INFO, DETAIL = (1 << i for i in range(8))
+FEATURES = {"STOP": STOP, "AFFIRM": AFFIRM, "STRONG": STRONG, "NEGATE": NEGATE,
+            "HEDGE": HEDGE, "QUERY": QUERY, "INFO": INFO, "DETAIL": DETAIL}
+
+KEYWORD_PACKS = {
+    "en": {
+        STOP: ["unsubscribe", "please stop", "stop messaging", "stop sending", "stop contacting",
+               "leave me alone", "i want to leave", "i want to quit", "i quit", "opt out", "remove me"],
+        AFFIRM: ["yes", "yeah", "yep", "sure", "ok", "okay", "fine",
+                 "no problem", "no issues", "not a problem", "sounds good", "works for me"],
+        AFFIRM | STRONG: ["absolutely", "definitely", "of course", "i can", "i will", "yes i can"],
+        NEGATE: ["no", "nope", "not really", "can't", "cannot", "won't", "don't", "don’t", "do not",
+                 "i can't", "i cannot", "i won't", "not possible", "i am not", "i'm not", "i’m not",
+                 "never", "unable", "not able", "not available"],
+        HEDGE: ["maybe", "not sure", "i am not sure", "i'm not sure", "depends", "might", "perhaps"],
+        QUERY: ["how", "what", "when", "where", "why", "can you", "is it", "do i"],
+        INFO: ["teacher", "teaching", "student", "engineer", "working", "experience", "background",
+               "volunteer", "profession", "mentor", "worked", "homemaker", "housewife"],
+        DETAIL: ["years", "hours", "week"],
+    },
+    "hinglish": {
+        STOP: ["band karo", "ruko", "rehne do"],
+        AFFIRM: ["haan", "haa", "han", "ji", "ji haan", "theek hai", "thik hai", "chalega",
+                 "ho jayega", "koi baat nahi", "koi dikkat nahi"],
+        AFFIRM | STRONG: ["bilkul", "zaroor", "zarur", "pakka"],
+        NEGATE: ["nahi", "nahin", "nai", "mat", "nahi ho payega", "mushkil hai"],
+        HEDGE: ["shayad", "pata nahi", "nahi pata", "dekhte hain"],
+        QUERY: ["kya", "kaise", "kab", "kahan", "kyun", "kyon", "kitna", "kitne", "kaun"],
+        INFO: ["padhaya", "padhati", "padhata", "naukri"],
+        DETAIL: ["saal", "ghante", "hafte"],
+    },
+    "hi": {
+        STOP: ["रुको", "बंद करो"],
+        AFFIRM: ["हाँ", "हां", "जी", "ठीक है", "कोई बात नहीं"],
+        AFFIRM | STRONG: ["बिल्कुल", "ज़रूर", "जरूर"],
+        NEGATE: ["नहीं", "नही", "मुश्किल है"],
+        HEDGE: ["शायद", "पता नहीं", "नहीं पता"],
+        QUERY: ["क्या", "कैसे", "कब", "कहाँ", "क्यों", "कितना"],
+        INFO: ["शिक्षक", "पढ़ाया", "नौकरी"],
+        DETAIL: ["साल", "घंटे", "हफ्ते"],
+    },
+}
+
+_CLAUSE = re.compile(r"[,.;:!?]")
+CLAUSES = {
+    STOP: ["stop", "exit", "leave", "quit", "cancel", "stop it"],
+    AFFIRM: ["i do", "i am", "i'm", "i’m"],
+}
+
+# (all_of, none_of, intent, confidence); first matching row wins
+RULES = [
+    (STOP, 0, "STOP", 0.95),
+    (HEDGE, 0, "AMBIGUOUS", 0.4),
+    (AFFIRM | NEGATE, 0, "AMBIGUOUS", 0.4),
+    (NEGATE, 0, "NEGATE", 0.9),
+    (AFFIRM | STRONG, 0, "AFFIRM", 0.9),
+    (AFFIRM, QUERY, "AFFIRM", 0.8),
+    (QUERY, 0, "QUERY", 0.6),
+    (AFFIRM, 0, "AFFIRM", 0.6),
+    (INFO, 0, "INFO", 0.7),
+    (DETAIL, 0, "AMBIGUOUS", 0.7),
+]
+DEFAULT = ("AMBIGUOUS", 0.5)
+EMPTY = ("AMBIGUOUS", 0.2)
+
+
+class KeywordMatcher:
+    """All packs compiled into one alternation; ``features(text)`` is a single pass."""
+
+    __slots__ = ("pattern", "lookup", "clause_lookup")
+
+    def __init__(self, packs=KEYWORD_PACKS, clauses=CLAUSES):
+        self.lookup = _lookup(packs.values())
+        self.clause_lookup = _lookup([clauses])
+        # apostrophes count as word characters so "i can" never matches inside "i can't"
+        alternation = "|".join(re.escape(k) for k in sorted(self.lookup, key=len, reverse=True))
+        self.pattern = re.compile(rf"(?<![\w'’])(?:{alternation})(?![\w'’])")
+
+    def _phrases(self, t):
+        for m in self.pattern.finditer(t):
+            yield m.group()
+            # a phrase starting inside this one that runs past it ("not able" in "i am not able")
+            end = m.end()
+            space = t.find(" ", m.start(), end)
+            while space != -1:
+                inner = self.pattern.match(t, space + 1)
+                if inner and inner.end() > end:
+                    yield inner.group()
+                    end = inner.end()
+                space = t.find(" ", space + 1, m.end())
+        for clause in _CLAUSE.split(t):
+            if clause.strip() in self.clause_lookup:
+                yield clause.strip()
+
+    def features(self, text):
+        # the scan of ``_phrases``, inlined: this runs on every message
+        t = text.lower()
+        mask = QUERY if "?" in t else 0
+        pattern, lookup = self.pattern, self.lookup
+        for m in pattern.finditer(t):
+            phrase = m.group()
+            mask |= lookup[phrase]
+            if " " in phrase:
+                end = m.end()
+                space = t.find(" ", m.start(), end)
+                while space != -1:
+                    inner = pattern.match(t, space + 1)
+                    if inner and inner.end() > end:
+                        mask |= lookup[inner.group()]
+                        end = inner.end()
+                    space = t.find(" ", space + 1, m.end())
+        clauses = self.clause_lookup
+        for clause in _CLAUSE.split(t):
+            mask |= clauses.get(clause.strip(), 0)
+        return mask
+
+    def matches(self, text):
+        return list(self._phrases(text.lower()))
+
+
+def _lookup(packs):
+    lookup = {}
+    for pack in packs:
+        for flags, phrases in pack.items():
+            for phrase in phrases:
+                key = phrase.lower()
+                lookup[key] = lookup.get(key, 0) | flags
+    return lookup
+
+
+MATCHER = KeywordMatcher()
+
+
+def decide(mask, rules=RULES):
+    for all_of, none_of, intent, confidence in rules:
+        if mask & all_of == all_of and not mask & none_of:
+            return intent, confidence
+    return DEFAULT
+
+
+def classify(text, matcher=MATCHER):
+    """Return (intent, confidence) for free-form text; intent is one of
+    STOP, AFFIRM, NEGATE, QUERY, INFO, AMBIGUOUS."""
+    if not text or not isinstance(text, str):
+        return EMPTY
+    mask = matcher.features(text)
+    if not mask and len(text.strip()) < 3:
+        return EMPTY
+    return decide(mask)
+
+
+def feature_names(mask):
+    return [name for name, bit in FEATURES.items() if mask & bit]
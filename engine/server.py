@@ -0,0 +1,341 @@
+# ---------------------------
+# Async webhook server (WhatsApp-style)
+# ---------------------------
+# POST /webhook  {"session_id" | "phone": "...", "text": "...", "flow": "selection"}
+#   -> {"session_id": "...", "replies": ["..."], "done": false}
+# GET  /healthz, GET /metrics
+#
+# One asyncio loop holds every live ConversationState. Turns for the same
+# session are serialised by a per-session FIFO lock, so replies always come
+# back in the order the messages arrived; different sessions run concurrently.
+# Flow steps are blocking (they call the LLM), so they run on a thread pool.
+# Conversations live in a bounded SessionStore that spills idle ones to disk,
+# or, with --processes N, in a WorkerPool of engine processes.
+#
+# With a quiet window (--quiet-window), messages a volunteer sends in a burst
+# ("hi", "I'm Priya", "I work in IT") are answered as one turn once the
+# session has been quiet that long: the last message of the burst gets the
+# replies, the earlier ones {"replies": [], "merged": true}. A reply still
+# being written when more input arrives is superseded: its LLM call is
+# aborted (engine/tasks.py), its turn rolled back and the new turn answers
+# all of it (worker pools only debounce).
+#
+# Nobody clicks "Next Phase" for a webhook session, so the phase flows move
+# on by themselves once a phase is complete (engine/completion.py);
+# --manual-phases turns that off.
+import argparse
+import asyncio
+import collections
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from engine import completion, faq, jsonparse, llm, tasks, templates
+from engine.flows import get_flow
+from engine.store import SessionStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLOW = "selection"
+MAX_BODY = 64 * 1024
+DEFAULT_QUIET_WINDOW = 1.5
+
+
+class _Burst:
+    """Messages from one session that will be answered as a single turn."""
+
+    __slots__ = ("flow_name", "texts", "waiters", "timer", "token", "llm_calls")
+
+    def __init__(self, flow_name):
+        self.flow_name = flow_name
+        self.texts = []
+        self.waiters = []    # one future per inbound message
+        self.timer = None
+        # cancelled when newer input supersedes the reply; the turn thread finish()es it to commit
+        self.token = tasks.CancelToken()
+        self.llm_calls = 0   # what answering it cost
+
+
+class ScreeningServer:
+
+    def __init__(self, default_flow=DEFAULT_FLOW, max_workers=512, store=None, sweep_interval=60.0, pool=None,
+                 quiet_window=0.0):
+        self.default_flow = default_flow
+        # with a WorkerPool the sessions live in the worker processes instead
+        self.pool = pool
+        self.store = store if store is not None or pool is not None else SessionStore()
+        self.sweep_interval = sweep_interval
+        # seconds of silence that end a burst; 0 answers every message on its own
+        self.quiet_window = quiet_window
+        self._locks = {}
+        self._waiting = collections.Counter()
+        self._bursts = {}    # session id -> burst still collecting messages
+        self._answering = {}  # session id -> burst whose turn has started
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="turn")
+        self.metrics = {"messages": 0, "turns": 0, "errors": 0, "turn_seconds_total": 0.0,
+                        "merged_messages": 0, "superseded_turns": 0,
+                        "llm_calls_saved": 0, "llm_calls_wasted": 0}
+
+    # ---------------------------
+    # Sessions
+    # ---------------------------
+    def _new_state(self, flow_name):
+        return lambda session_id: get_flow(flow_name or self.default_flow).new_state(session_id)
+
+    def _turn(self, session_id, text, flow_name, burst=None):
+        state = self.store.acquire(session_id, self._new_state(flow_name))
+        try:
+            if burst is None:
+                with llm.scope(session_id):
+                    _, outputs = get_flow(state.flow).step(state, text)
+            else:
+                if burst.token.cancelled:
+                    return None  # more input arrived while this turn was queued
+                snapshot = state.snapshot()
+                with llm.scope(session_id) as usage, tasks.use(burst.token):
+                    try:
+                        _, outputs = get_flow(state.flow).step(state, text)
+                    except tasks.Cancelled:
+                        pass
+                burst.llm_calls = usage["calls"]
+                if not burst.token.finish():
+                    # the volunteer kept typing: forget this reply, the next turn answers everything
+                    state.restore(snapshot)
+                    return None
+        finally:
+            self.store.release(state)
+        return {"session_id": state.session_id, "replies": [m["content"] for m in outputs], "done": state.done}
+
+    async def handle_message(self, session_id, text, flow_name=None):
+        """Answer a message for ``session_id``; returns {"session_id", "replies", "done"}."""
+        self.metrics["messages"] += 1
+        if not self.quiet_window:
+            return await self._run_turn(session_id, text, flow_name)
+        loop = asyncio.get_running_loop()
+        burst = self._bursts.get(session_id)
+        if burst is None:
+            burst = self._bursts[session_id] = _Burst(flow_name)
+            answering = self._answering.get(session_id)
+            if answering is not None and self.pool is None and answering.token.cancel():
+                burst.texts.extend(answering.texts)
+        else:
+            burst.timer.cancel()
+        burst.texts.append(text)
+        waiter = loop.create_future()
+        burst.waiters.append(waiter)
+        burst.timer = loop.call_later(self.quiet_window, self._close_burst, session_id, burst)
+        return await waiter
+
+    def _close_burst(self, session_id, burst):
+        del self._bursts[session_id]
+        self._answering[session_id] = burst
+        asyncio.ensure_future(self._answer_burst(session_id, burst))
+
+    async def _answer_burst(self, session_id, burst):
+        try:
+            result = await self._run_turn(session_id, "\n".join(burst.texts), burst.flow_name, burst)
+        except Exception as e:
+            for waiter in burst.waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+            return
+        finally:
+            if self._answering.get(session_id) is burst:
+                del self._answering[session_id]
+        merged = {"session_id": session_id, "replies": [], "done": False, "merged": True}
+        if result is None:
+            # superseded: the burst that took these messages over answers them
+            self.metrics["superseded_turns"] += 1
+            self.metrics["llm_calls_wasted"] += burst.llm_calls
+            result = merged
+        else:
+            # each merged message would have been a turn of its own
+            self.metrics["merged_messages"] += len(burst.texts) - 1
+            self.metrics["llm_calls_saved"] += (len(burst.texts) - 1) * burst.llm_calls
+            merged["done"] = result["done"]
+        for waiter in burst.waiters:
+            if not waiter.done():
+                waiter.set_result(result if waiter is burst.waiters[-1] else merged)
+
+    async def _run_turn(self, session_id, text, flow_name, burst=None):
+        """Run one turn, serialised per session; None if ``burst`` was superseded."""
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = self._locks[session_id] = asyncio.Lock()
+        self._waiting[session_id] += 1
+        try:
+            async with lock:
+                started = time.perf_counter()
+                try:
+                    if self.pool is not None:
+                        return await asyncio.wrap_future(self.pool.submit(session_id, text, flow_name))
+                    return await loop.run_in_executor(self._executor, self._turn, session_id, text, flow_name, burst)
+                except Exception:
+                    self.metrics["errors"] += 1
+                    raise
+                finally:
+                    self.metrics["turns"] += 1
+                    self.metrics["turn_seconds_total"] += time.perf_counter() - started
+        finally:
+            # drop the lock once nobody is queued on it, so idle sessions cost nothing here
+            self._waiting[session_id] -= 1
+            if not self._waiting[session_id]:
+                del self._waiting[session_id]
+                del self._locks[session_id]
+
+    async def _sweep_idle(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            evicted = await loop.run_in_executor(self._executor, self.store.evict_idle)
+            if evicted:
+                logger.info("spilled %d idle sessions", evicted)
+
+    # ---------------------------
+    # HTTP
+    # ---------------------------
+    async def _dispatch(self, method, path, body):
+        if method == "GET" and path == "/healthz":
+            return 200, {"ok": True}
+        if method == "GET" and path == "/metrics":
+            shared = {"llm": llm.stats(), "json": jsonparse.stats(), "faq": faq.stats(),
+                      "turns": templates.stats()}
+            if self.pool is not None:
+                return 200, dict(self.metrics, workers=dict(self.pool.metrics), **shared)
+            return 200, dict(self.metrics, store=self.store.stats(), completion=completion.stats(), **shared)
+        if method != "POST" or path != "/webhook":
+            return 404, {"error": "not found"}
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"error": "invalid JSON"}
+        session_id = payload.get("session_id") or payload.get("phone")
+        text = payload.get("text")
+        if not session_id or not isinstance(text, str):
+            return 400, {"error": "session_id (or phone) and text are required"}
+        try:
+            result = await self.handle_message(str(session_id), text, payload.get("flow"))
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        except Exception:
+            logger.exception("turn failed for %s", session_id)
+            return 500, {"error": "turn failed"}
+        return 200, result
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY:
+                    status, result = 413, {"error": "body too large"}
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, result = await self._dispatch(method, path.split("?", 1)[0], body)
+                data = json.dumps(result, ensure_ascii=False).encode("utf-8")
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'ERROR'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive or status == 413:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8080):
+        self._server = await asyncio.start_server(self._handle_connection, host, port, backlog=4096)
+        if self.store is not None and self.store.idle_ttl is not None:
+            self._sweeper = asyncio.ensure_future(self._sweep_idle())
+        return self._server
+
+    async def serve_forever(self, host="127.0.0.1", port=8080):
+        server = await self.start(host, port)
+        logger.info("listening on %s", ", ".join(str(s.getsockname()) for s in server.sockets))
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        if getattr(self, "_sweeper", None) is not None:
+            self._sweeper.cancel()
+        if getattr(self, "_server", None) is not None:
+            self._server.close()
+        self._executor.shutdown(wait=True)
+        if self.pool is not None:
+            self.pool.close()
+        else:
+            self.store.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the screening flows over an HTTP webhook.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--flow", default=DEFAULT_FLOW, help="flow for new sessions when the payload has none")
+    parser.add_argument("--workers", type=int, default=512, help="threads available for blocking turns")
+    parser.add_argument("--quiet-window", type=float, default=DEFAULT_QUIET_WINDOW,
+                        help="answer a burst of messages once the session is quiet this many seconds (0: every message)")
+    parser.add_argument("--spill-dir", default="records/sessions")
+    parser.add_argument("--max-sessions", type=int, default=None, help="resident session cap (LRU beyond it)")
+    parser.add_argument("--max-mb", type=float, default=None, help="approximate resident memory cap in MB")
+    parser.add_argument("--idle-ttl", type=float, default=None, help="spill sessions idle this many seconds")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="engine worker processes; sessions are routed to them by id")
+    parser.add_argument("--rpm", type=float, default=None, help="LLM requests/min for this process")
+    parser.add_argument("--tpm", type=float, default=None, help="LLM tokens/min for this process")
+    parser.add_argument("--manual-phases", action="store_true",
+                        help="leave phase changes to a coordinator instead of advancing completed phases")
+    parser.add_argument("--mock-llm", type=float, metavar="LATENCY", default=None,
+                        help="use the mock LLM with this per-call latency (seconds)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.mock_llm is not None:
+        from engine import distill
+        from engine.mock import MockLLM
+        llm.set_backend(MockLLM(args.mock_llm))
+        distill.LABEL_LOG = ""  # mock labels are not training data
+    llm.set_rate_limits(args.rpm, args.tpm)
+    # nobody clicks "Next Phase" for webhook sessions
+    completion.AUTO_ADVANCE = not args.manual_phases
+    max_bytes = int(args.max_mb * 1024 * 1024) if args.max_mb else None
+    if args.processes > 1:
+        from engine.workers import WorkerPool
+        # the key's limits are split evenly across the worker processes
+        pool = WorkerPool(args.processes, args.spill_dir, args.flow, threads=args.workers,
+                          mock_latency=args.mock_llm, max_sessions=args.max_sessions,
+                          max_bytes=max_bytes, idle_ttl=args.idle_ttl,
+                          rpm=args.rpm and args.rpm / args.processes,
+                          tpm=args.tpm and args.tpm / args.processes,
+                          auto_advance=completion.AUTO_ADVANCE)
+        server = ScreeningServer(args.flow, pool=pool, quiet_window=args.quiet_window)
+    else:
+        store = SessionStore(args.spill_dir, args.max_sessions, max_bytes, args.idle_ttl)
+        server = ScreeningServer(args.flow, args.workers, store, quiet_window=args.quiet_window)
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# ---------------------------
+# In-flight request coalescing
+# ---------------------------
+# Concurrent identical calls (double-clicked "Next Phase", a rerun firing the
+# same score_phase twice, ...) share one upstream call and its result. Nothing
+# is remembered once the call returns: this is not a cache.
+import hashlib
+import json
+import threading
+
+
+def request_key(model, messages, kwargs):
+    payload = json.dumps([model, messages, kwargs], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.metrics = {"calls": 0, "upstream": 0, "coalesced": 0}
+
+    def do(self, key, fn):
+        """Run ``fn()`` unless an identical call is in flight; either way return its result."""
+        with self._lock:
+            self.metrics["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.metrics["coalesced"] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.metrics["upstream"] += 1
+                leader = True
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            return dict(self.metrics, in_flight=len(self._calls))
@@ -0,0 +1,97 @@
+# ---------------------------
+# Conversation state
+# ---------------------------
+import copy
+import uuid
+
+from engine.messages import MessageLog
+from engine.profile import Profile, restore
+
+
+class ConversationState:
+    """
+    Everything one conversation needs between turns.
+
+    Not every flow uses every field: the phase flows use ``phase``/``scores``,
+    the question-bank flow uses ``stage``/``acks`` and the selection flow uses
+    ``state_index``/``question_index``/``profile``.
+    """
+
+    __slots__ = (
+        "session_id",
+        "flow",
+        "messages",         # MessageLog of {"role", "content"} turns (no system prompt)
+        "phase",            # phase id for the phase-based flows
+        "stage",            # named stage for the question-bank flow
+        "state_index",      # selection flow: index into STATE_ORDER
+        "question_index",   # selection flow: turns answered so far
+        "extracted",        # extracted fields (ExtractedProfile in the phase flows)
+        "scores",           # {phase_id: {"score":..., "notes":...}, "overall": ...}
+        "profile",          # selection flow VolunteerProfile
+        "acks",             # acknowledgements already used
+        "meta",             # file prefix, debug info, ...
+        "options",          # per-session switches (e.g. auto_extract)
+        "done",
+    )
+
+    def __init__(self, flow, session_id=None):
+        self.session_id = session_id or uuid.uuid4().hex
+        self.flow = flow
+        self.messages = MessageLog()
+        self.phase = 1
+        self.stage = None
+        self.state_index = 0
+        self.question_index = 0
+        self.extracted = {}
+        self.scores = {}
+        self.profile = None
+        self.acks = set()
+        self.meta = {}
+        self.options = {}
+        self.done = False
+
+    def add(self, role, content, shared=False):
+        """Append a turn; ``shared`` marks fixed text (templates) that sessions can share."""
+        return self.messages.append(role, content, shared)
+
+    def to_dict(self):
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["messages"] = self.messages.to_dicts()
+        data["message_marks"] = self.messages.marks
+        data["acks"] = sorted(self.acks)
+        # JSON object keys are strings; keep phase ids round-trippable
+        data["scores"] = {str(k): v for k, v in self.scores.items()}
+        for name in ("extracted", "profile"):
+            if isinstance(data[name], Profile):
+                data[name] = data[name].dump()
+        return data
+
+    def snapshot(self):
+        """Deep copy of ``to_dict()``, for ``restore`` after a turn that must not count."""
+        return copy.deepcopy(self.to_dict())
+
+    def restore(self, snapshot):
+        """Put this state back to ``snapshot`` in place (the store keeps holding this object)."""
+        old = type(self).from_dict(snapshot)
+        for name in self.__slots__:
+            setattr(self, name, getattr(old, name))
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls(data["flow"], data.get("session_id"))
+        for name in cls.__slots__:
+            if name in data:
+                setattr(state, name, data[name])
+        state.messages = MessageLog(data.get("messages") or (), marks=data.get("message_marks"))
+        state.acks = set(data.get("acks") or ())
+        state.extracted = restore(state.extracted)
+        state.profile = restore(state.profile)
+        state.scores = {
+            int(k) if str(k).isdigit() else k: v
+            for k, v in (data.get("scores") or {}).items()
+        }
+        return state
+
+    def __repr__(self):
+        return (f"ConversationState(flow={self.flow!r}, session_id={self.session_id!r}, "
+                f"messages={len(self.messages)}, done={self.done})")
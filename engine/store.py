@@ -0,0 +1,208 @@
+# ---------------------------
+# Bounded session store
+# ---------------------------
+# Keeps the hot conversations in memory (LRU order) and spills cold ones to
+# compact gzip'd JSON snapshots on disk. A session is evicted when it has been
+# idle longer than ``idle_ttl`` or when the resident set exceeds
+# ``max_sessions`` / ``max_bytes``; the next ``acquire`` rehydrates it
+# transparently. Sessions checked out by a running turn are never evicted.
+import collections
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+from engine.state import ConversationState
+
+# rough per-state overhead used by the size estimate (CPython, 64-bit)
+_STATE_OVERHEAD = 1200
+
+
+def estimate_size(state):
+    """Cheap resident-size estimate in bytes; good enough to enforce a memory cap."""
+    size = _STATE_OVERHEAD + state.messages.nbytes()
+    for part in (state.extracted, state.scores, state.profile, state.meta):
+        if part:
+            size += len(str(part)) * 2
+    return size
+
+
+class SessionStore:
+
+    def __init__(self, spill_dir="records/sessions", max_sessions=None, max_bytes=None,
+                 idle_ttl=None, clock=time.monotonic):
+        self.spill_dir = spill_dir
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.idle_ttl = idle_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # session_id -> [state, last_used, size]; ordered least -> most recently used
+        self._resident = collections.OrderedDict()
+        self._pinned = collections.Counter()
+        self._bytes = 0
+        self._rehydrate_ms = collections.deque(maxlen=1024)
+        self.metrics = {"evicted_lru": 0, "evicted_ttl": 0, "rehydrated": 0, "created": 0}
+        os.makedirs(spill_dir, exist_ok=True)
+
+    # ---------------------------
+    # Public API
+    # ---------------------------
+    def acquire(self, session_id, factory=None):
+        """
+        Check a session out for a turn, rehydrating it from disk if needed.
+        ``factory(session_id)`` builds a new state when the session is unknown;
+        without one, unknown sessions return None.
+        """
+        with self._lock:
+            entry = self._resident.get(session_id)
+            if entry is not None:
+                self._resident.move_to_end(session_id)
+                entry[1] = self._clock()
+                self._pinned[session_id] += 1
+                return entry[0]
+        state = self._load(session_id)
+        if state is None:
+            if factory is None:
+                return None
+            state = factory(session_id)
+            self.metrics["created"] += 1
+        with self._lock:
+            # another thread may have rehydrated it meanwhile
+            entry = self._resident.get(session_id)
+            if entry is not None:
+                state = entry[0]
+            else:
+                self._insert(session_id, state)
+            self._pinned[session_id] += 1
+        return state
+
+    def release(self, state):
+        """Return a checked-out session; re-measures it and enforces the caps."""
+        with self._lock:
+            sid = state.session_id
+            self._pinned[sid] -= 1
+            if self._pinned[sid] <= 0:
+                del self._pinned[sid]
+            entry = self._resident.get(sid)
+            if entry is not None:
+                size = estimate_size(state)
+                self._bytes += size - entry[2]
+                entry[2] = size
+                entry[1] = self._clock()
+            self._spill(self._pick_victims())
+
+    def get(self, session_id):
+        state = self.acquire(session_id)
+        if state is not None:
+            self.release(state)
+        return state
+
+    def put(self, state):
+        with self._lock:
+            if state.session_id not in self._resident:
+                self._insert(state.session_id, state)
+            self._pinned[state.session_id] += 1
+        self.release(state)
+
+    def evict_idle(self):
+        """Spill every unpinned session idle for longer than ``idle_ttl``; returns the count."""
+        if self.idle_ttl is None:
+            return 0
+        cutoff = self._clock() - self.idle_ttl
+        with self._lock:
+            victims = []
+            for sid, (state, last_used, _) in list(self._resident.items()):
+                if last_used > cutoff:
+                    break  # LRU order: everything after is fresher
+                if sid not in self._pinned:
+                    victims.append(self._pop(sid))
+            self.metrics["evicted_ttl"] += len(victims)
+            self._spill(victims)
+        return len(victims)
+
+    def flush(self):
+        """Spill every unpinned resident session (shutdown / drain)."""
+        with self._lock:
+            victims = [self._pop(sid) for sid in list(self._resident) if sid not in self._pinned]
+            self._spill(victims)
+        return len(victims)
+
+    def __contains__(self, session_id):
+        return session_id in self._resident or os.path.exists(self._path(session_id))
+
+    def __len__(self):
+        return len(self._resident)
+
+    def stats(self):
+        samples = sorted(self._rehydrate_ms)
+        return dict(
+            self.metrics,
+            resident=len(self._resident),
+            resident_bytes=self._bytes,
+            evicted=self.metrics["evicted_lru"] + self.metrics["evicted_ttl"],
+            rehydrate_ms_p50=round(samples[len(samples) // 2], 3) if samples else None,
+            rehydrate_ms_max=round(samples[-1], 3) if samples else None,
+        )
+
+    # ---------------------------
+    # Internals
+    # ---------------------------
+    def _path(self, session_id):
+        digest = hashlib.sha1(session_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.spill_dir, f"{digest}.json.gz")
+
+    def _insert(self, session_id, state):
+        size = estimate_size(state)
+        self._resident[session_id] = [state, self._clock(), size]
+        self._bytes += size
+
+    def _pop(self, session_id):
+        state, _, size = self._resident.pop(session_id)
+        self._bytes -= size
+        return state
+
+    def _over_cap(self):
+        return ((self.max_sessions is not None and len(self._resident) > self.max_sessions)
+                or (self.max_bytes is not None and self._bytes > self.max_bytes))
+
+    def _pick_victims(self):
+        victims = []
+        if not self._over_cap():
+            return victims
+        for sid in list(self._resident):
+            if sid in self._pinned:
+                continue
+            victims.append(self._pop(sid))
+            if not self._over_cap():
+                break
+        self.metrics["evicted_lru"] += len(victims)
+        return victims
+
+    def _spill(self, victims):
+        # called with the store lock held: victims are unpinned, so nothing is
+        # mutating them, and no other thread can rehydrate one mid-write
+        for state in victims:
+            path = self._path(state.session_id)
+            tmp = f"{path}.tmp"
+            data = json.dumps(state.to_dict(), ensure_ascii=False, separators=(",", ":"), default=str)
+            with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=1) as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+    def _load(self, session_id):
+        path = self._path(session_id)
+        started = time.perf_counter()
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        # the snapshot stays on disk until the next spill overwrites it, so a
+        # crash between rehydration and the next eviction loses nothing
+        state = ConversationState.from_dict(data)
+        self._rehydrate_ms.append((time.perf_counter() - started) * 1000)
+        self.metrics["rehydrated"] += 1
+        return state
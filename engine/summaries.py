@@ -0,0 +1,108 @@
+# ---------------------------
+# Map-reduce coordinator summary for the phase flows
+# ---------------------------
+# The End Interview summary used to be one prompt over the whole
+# conversation. Instead each phase gets a short summary in the background
+# when the coordinator moves on ("Next Phase"), stored next to that phase's
+# score as ``state.scores[pid]["summary"]``. End Interview then only
+# summarises the phase still open and reduces the per-phase notes plus the
+# extracted record, so its cost no longer grows with the interview.
+#
+# Phases are delimited by the ``phase:N`` marks the flows set on the message
+# log when a phase starts (phase 1 starts at the first message). Scores and
+# summaries share the phase's entry, so writers merge into it rather than
+# replace it.
+from engine import tasks
+from engine.extraction import conversation_text, phase_summary, score_phase, summary_from_notes
+from engine.profile import Profile
+
+NO_CONVERSATION = "No conversation in this phase."
+NOT_REACHED = "Not reached."
+
+
+def phase_messages(state, phase_id):
+    if phase_id > state.phase:
+        return []  # not reached
+    return state.messages.section(f"phase:{phase_id}", f"phase:{phase_id + 1}")
+
+
+def phase_text(state, phase_id):
+    return conversation_text(phase_messages(state, phase_id))
+
+
+def _has_replies(state, phase_id):
+    return any(m["role"] == "user" for m in phase_messages(state, phase_id))
+
+
+def summary_of(state, phase_id):
+    entry = state.scores.get(phase_id)
+    return entry.get("summary") if isinstance(entry, dict) else None
+
+
+def has_score(state, phase_id):
+    entry = state.scores.get(phase_id)
+    return isinstance(entry, dict) and ("score" in entry or "raw" in entry)
+
+
+def store_score(state, phase_id, score):
+    """Set the phase's score, keeping the summary already in its entry."""
+    entry = state.scores.get(phase_id)
+    if isinstance(entry, dict) and "summary" in entry:
+        score = dict(score, summary=entry["summary"])
+    state.scores[phase_id] = score
+
+
+def _store(state, phase_id, summary):
+    entry = state.scores.get(phase_id)
+    if isinstance(entry, dict):
+        entry["summary"] = summary  # next to the score and notes already there
+    else:
+        state.scores[phase_id] = {"summary": summary}
+
+
+def score_missing(state, rubrics):
+    """
+    Score the phases in ``rubrics`` ({phase_id: rubric}) that have no score
+    yet, each over its own messages. Phases never reached, or without a
+    volunteer reply, get a note instead of a score, which keeps them out of
+    the overall recommendation.
+    """
+    for pid, rubric in rubrics.items():
+        if has_score(state, pid):
+            continue
+        if pid > state.phase:
+            store_score(state, pid, {"notes": NOT_REACHED})
+        elif not _has_replies(state, pid):
+            store_score(state, pid, {"notes": NO_CONVERSATION})
+        else:
+            store_score(state, pid, score_phase(pid, phase_text(state, pid), rubric))
+
+
+def close_phase(state, phase_id, phase_name):
+    """Summarise ``phase_id`` in the background; the flow carries on meanwhile."""
+    if phase_id > state.phase:
+        _store(state, phase_id, NOT_REACHED)
+        return
+    if not _has_replies(state, phase_id):
+        _store(state, phase_id, NO_CONVERSATION)
+        return
+    tasks.start(state.session_id, f"summary:{phase_id}", phase_summary, phase_name, phase_text(state, phase_id),
+                apply=lambda summary: _store(state, phase_id, summary))
+
+
+def final_summary(state, phase_names, instructions):
+    """
+    Coordinator summary from the per-phase summaries (``phase_names`` is
+    {phase_id: name}). Phases without one yet — the open phase, or one whose
+    background summary failed — are summarised now, concurrently.
+    """
+    kinds = [f"summary:{pid}" for pid in phase_names]
+    tasks.wait(state.session_id, kinds)
+    for pid, name in phase_names.items():
+        if summary_of(state, pid) is None:
+            close_phase(state, pid, name)
+    tasks.wait(state.session_id, kinds)
+    notes = "\n".join(f"Phase {pid} ({name}): {summary_of(state, pid) or 'Summary unavailable.'}"
+                      for pid, name in phase_names.items())
+    extracted = state.extracted.to_dict() if isinstance(state.extracted, Profile) else state.extracted
+    return summary_from_notes(notes, extracted, instructions)
@@ -0,0 +1,182 @@
+# ---------------------------
+# Per-session background work and cancellation
+# ---------------------------
+# Background LLM work (auto-extraction after a message, a turn the server is
+# superseding) goes stale when the volunteer sends something new or the
+# coordinator clicks "Next Phase". Each piece of work carries a CancelToken:
+#   * ``llm.chat`` checks the token of the code calling it, so a cancelled
+#     call is never sent, and a streaming call in flight is closed;
+#   * the result is applied only through ``token.finish()``, which fails
+#     once the token is cancelled, so stale results never overwrite newer state.
+# ``start(session_id, kind, ...)`` runs work on a shared thread pool and
+# cancels the session's previous work of the same kind.
+import contextlib
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+
+MAX_WORKERS = 8
+
+_current = contextvars.ContextVar("cancel_token", default=None)
+_lock = threading.Lock()
+_running = {}   # (session_id, kind) -> CancelToken
+_futures = {}   # (session_id, kind) -> Future, until it is done
+_executor = None
+_metrics = {"started": 0, "completed": 0, "cancelled": 0, "discarded": 0, "failed": 0,
+            "llm_calls_cancelled": 0, "streams_aborted": 0, "tokens_saved": 0}
+
+
+class Cancelled(BaseException):
+    """Raised inside cancelled work. A BaseException (like asyncio.CancelledError) so the
+    flows' ``except Exception`` fallbacks don't turn it into a reply."""
+
+
+class CancelToken:
+
+    __slots__ = ("reason", "_lock", "_event", "_finished")
+
+    def __init__(self):
+        self.reason = None
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+        self._finished = False
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self, reason="superseded"):
+        """Cancel unless the work already finished; True if it is (now) cancelled."""
+        with self._lock:
+            if not self._finished and not self._event.is_set():
+                self.reason = reason
+                self._event.set()
+            return self._event.is_set()
+
+    def finish(self):
+        """Claim the right to apply the result; False if the work was cancelled first."""
+        with self._lock:
+            if not self._event.is_set():
+                self._finished = True
+            return self._finished
+
+    def wait(self, timeout):
+        """Sleep up to ``timeout`` seconds, waking early on cancel; True if cancelled."""
+        return self._event.wait(timeout)
+
+    def check(self):
+        if self._event.is_set():
+            raise Cancelled(self.reason)
+
+
+def current():
+    """Token of the work running in this context (None outside cancellable work)."""
+    return _current.get()
+
+
+@contextlib.contextmanager
+def use(token):
+    """Run the block as cancellable work: LLM calls inside honour ``token``."""
+    reset = _current.set(token)
+    try:
+        yield token
+    finally:
+        _current.reset(reset)
+
+
+def record_cancelled_call(prompt_tokens=0, streamed=False):
+    """Called by ``llm.chat`` for a call dropped (``prompt_tokens`` never sent) or a stream closed early."""
+    with _lock:
+        _metrics["llm_calls_cancelled"] += 1
+        _metrics["tokens_saved"] += prompt_tokens
+        if streamed:
+            _metrics["streams_aborted"] += 1
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="background")
+    return _executor
+
+
+def start(session_id, kind, fn, *args, apply=None):
+    """
+    Run ``fn(*args)`` in the background for ``session_id``, cancelling the
+    session's previous ``kind`` work; ``apply(result)`` runs only if this
+    work wasn't cancelled meanwhile. Returns (token, future).
+    """
+    token = CancelToken()
+    with _lock:
+        previous = _running.get((session_id, kind))
+        _running[(session_id, kind)] = token
+        _metrics["started"] += 1
+    if previous is not None and previous.cancel():
+        with _lock:
+            _metrics["cancelled"] += 1
+
+    def run():
+        try:
+            with use(token):
+                result = fn(*args)
+        except Cancelled:
+            return None
+        except Exception:
+            with _lock:
+                _metrics["failed"] += 1
+            raise
+        finally:
+            with _lock:
+                if _running.get((session_id, kind)) is token:
+                    del _running[(session_id, kind)]
+        if not token.finish():
+            with _lock:
+                _metrics["discarded"] += 1
+            return None
+        if apply is not None:
+            apply(result)
+        with _lock:
+            _metrics["completed"] += 1
+        return result
+
+    ctx = contextvars.copy_context()  # keep llm.scope (session, priority) for the calls
+    future = _get_executor().submit(ctx.run, run)
+    with _lock:
+        _futures[(session_id, kind)] = future
+
+    def forget(f, key=(session_id, kind)):
+        with _lock:
+            if _futures.get(key) is f:
+                del _futures[key]
+
+    future.add_done_callback(forget)
+    return token, future
+
+
+def cancel(session_id, kinds=None, reason="superseded"):
+    """Cancel the session's pending background work (only ``kinds`` if given); returns how many."""
+    with _lock:
+        keys = [k for k in _running if k[0] == session_id and (kinds is None or k[1] in kinds)]
+        tokens = [_running.pop(k) for k in keys]
+    n = sum(1 for t in tokens if t.cancel(reason))
+    with _lock:
+        _metrics["cancelled"] += n
+    return n
+
+
+def wait(session_id, kinds=None, timeout=None):
+    """Block until the session's background work (only ``kinds`` if given) is done, results applied."""
+    with _lock:
+        futures = [f for (sid, kind), f in _futures.items() if sid == session_id and (kinds is None or kind in kinds)]
+    wait_futures(futures, timeout)
+
+
+def pending(session_id):
+    with _lock:
+        return sorted(kind for sid, kind in _running if sid == session_id)
+
+
+def stats():
+    with _lock:
+        return dict(_metrics, running=len(_running))
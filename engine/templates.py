@@ -0,0 +1,108 @@
+# ---------------------------
+# Fixed-text turns served without the LLM
+# ---------------------------
+# Openings, phase prompts, orientation and closing texts are templates: they
+# are rendered locally (optional ``{name}`` / ``{greeting}``) and only sent
+# to the LLM for a rewrite when the session asks for paraphrasing
+# (``state.options["paraphrase_templates"]``). Every assistant turn is
+# counted as "template", "paraphrased" or "llm", per session in
+# ``state.meta["turns"]`` and process-wide in ``stats()``.
+import datetime
+import re
+import threading
+from collections import Counter
+
+from engine import llm
+
+PARAPHRASE_PROMPT = (
+    "Rephrase the assistant message below in warm, simple Indian English for a WhatsApp chat. "
+    "Keep every fact and any question exactly in meaning. Output only the rephrased message."
+)
+
+# the SERVE explanation is the same every interview; served once on entering that phase
+SERVE_EXPLANATION = (
+    "Let me quickly explain how SERVE works 😊 Schools (mostly rural) have a smart TV in the classroom, "
+    "and you teach remotely from your own device. Sessions are 30–45 minutes, usually 1–2 a week at times "
+    "that suit you. You'll get an orientation, lesson plans and textbooks, and a coordinator supports you "
+    "throughout. You don't need to be a trained teacher — connection with children and patience matter most. "
+    "Is this clear?"
+)
+
+PARAMS = ("name", "greeting")
+_PLACEHOLDER = re.compile(r"(,? ?)\{(\w+)\}")
+_lock = threading.Lock()
+TURNS = Counter()
+
+
+def greeting(now=None):
+    hour = (now or datetime.datetime.now()).hour
+    if hour < 12:
+        return "Good morning"
+    if hour < 17:
+        return "Good afternoon"
+    return "Good evening"
+
+
+def params_for(state):
+    """Default parameters: time-of-day greeting and the volunteer's name once it is known."""
+    params = {"greeting": greeting()}
+    name = state.extracted.get("name") if hasattr(state.extracted, "get") else None
+    if name:
+        params["name"] = name
+    return params
+
+
+def render(template, **params):
+    """Fill ``{param}`` placeholders; a missing one is dropped with its leading ", " or " "."""
+    def fill(m):
+        key = m.group(2)
+        if key not in params and key not in PARAMS:
+            return m.group(0)  # not a template parameter (e.g. braces in a learned FAQ answer)
+        value = params.get(key)
+        return f"{m.group(1)}{value}" if value else ""
+    return _PLACEHOLDER.sub(fill, template)
+
+
+def count(state, kind):
+    turns = state.meta.setdefault("turns", {})
+    turns[kind] = turns.get(kind, 0) + 1
+    with _lock:
+        TURNS[kind] += 1
+
+
+def paraphrase(text):
+    return llm.chat([
+        {"role": "system", "content": PARAPHRASE_PROMPT},
+        {"role": "user", "content": text},
+    ], temperature=0.5).strip()
+
+
+def serve(state, template, paraphrase_turn=None, **params):
+    """Add a fixed-text assistant turn; goes through the LLM only when paraphrasing is on."""
+    text = render(template, **{**params_for(state), **params})
+    if paraphrase_turn is None:
+        paraphrase_turn = state.options.get("paraphrase_templates", False)
+    if paraphrase_turn:
+        try:
+            text = paraphrase(text) or text
+            count(state, "paraphrased")
+            return state.add("assistant", text)
+        except Exception:
+            pass
+    count(state, "template")
+    # fixed text: one shared copy across sessions
+    return state.add("assistant", text, shared=True)
+
+
+def llm_turn(state, text):
+    """Add an assistant turn the LLM wrote."""
+    count(state, "llm")
+    return state.add("assistant", text)
+
+
+def stats():
+    with _lock:
+        turns = dict(TURNS)
+    total = sum(turns.values()) or 1
+    turns["template_share"] = round(turns.get("template", 0) / total, 3)
+    return turns
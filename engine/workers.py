@@ -0,0 +1,244 @@
+# ---------------------------
+# Multi-process worker pool with sticky session routing
+# ---------------------------
+# N engine worker processes, each with its own SessionStore spilling into a
+# shared directory. Every session is routed to one worker by rendezvous
+# hashing of its id, so its state stays resident in one process and its
+# turns run in arrival order there. Restarting a worker (or resizing the
+# pool) holds new messages for the affected sessions, lets the old worker
+# finish its queue and spill everything, then releases the held messages to
+# the new owner, which rehydrates from the shared spill directory.
+import collections
+import hashlib
+import itertools
+import logging
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+_DRAIN = "__drain__"
+
+
+def _weight(worker_id, session_id):
+    digest = hashlib.blake2b(f"{worker_id}:{session_id}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def route(session_id, worker_ids):
+    """Rendezvous (highest-random-weight) hashing: stable, and minimal movement on resize."""
+    return max(worker_ids, key=lambda w: _weight(w, session_id))
+
+
+# ---------------------------
+# Worker process
+# ---------------------------
+def _worker_main(worker_id, inbox, outbox, config):
+    from engine import completion, llm
+    from engine.flows import get_flow
+    from engine.store import SessionStore
+
+    if config.get("mock_latency") is not None:
+        from engine import distill
+        from engine.mock import MockLLM
+        llm.set_backend(MockLLM(config["mock_latency"]))
+        distill.LABEL_LOG = ""  # mock labels are not training data
+    llm.set_rate_limits(config.get("rpm"), config.get("tpm"))
+    completion.AUTO_ADVANCE = config.get("auto_advance", False)
+    store = SessionStore(config["spill_dir"], config.get("max_sessions"), config.get("max_bytes"), config.get("idle_ttl"))
+    default_flow = config.get("default_flow", "selection")
+    executor = ThreadPoolExecutor(max_workers=config.get("threads", 64), thread_name_prefix=f"w{worker_id}")
+    lock = threading.Lock()
+    pending = {}          # session_id -> deque of queued requests (head is running)
+    idle = threading.Condition(lock)
+
+    def run(req):
+        req_id, session_id, text, flow_name = req
+        try:
+            state = store.acquire(session_id, lambda sid: get_flow(flow_name or default_flow).new_state(sid))
+            try:
+                with llm.scope(session_id):
+                    _, outputs = get_flow(state.flow).step(state, text)
+            finally:
+                store.release(state)
+            outbox.put((req_id, True, {"session_id": session_id, "replies": [m["content"] for m in outputs],
+                                       "done": state.done, "worker": worker_id}))
+        except Exception as e:
+            logger.exception("turn failed for %s", session_id)
+            outbox.put((req_id, False, repr(e)))
+        with lock:
+            q = pending[session_id]
+            q.popleft()
+            if q:
+                executor.submit(run, q[0])
+            else:
+                del pending[session_id]
+                if not pending:
+                    idle.notify_all()
+
+    sweep = config.get("idle_ttl")
+    while True:
+        try:
+            req = inbox.get(timeout=sweep)
+        except queue.Empty:
+            store.evict_idle()
+            continue
+        if req == _DRAIN:
+            break
+        with lock:
+            q = pending.get(req[1])
+            if q is None:
+                q = pending[req[1]] = collections.deque()
+            q.append(req)
+            if len(q) == 1:
+                executor.submit(run, req)
+
+    with lock:
+        while pending:
+            idle.wait()
+    executor.shutdown(wait=True)
+    store.flush()
+    outbox.put((None, True, {"drained": worker_id}))
+
+
+# ---------------------------
+# Parent side
+# ---------------------------
+class WorkerPool:
+    """
+    ``pool.submit(session_id, text, flow=None)`` returns a Future resolving to
+    ``{"session_id", "replies", "done", "worker"}``.
+    """
+
+    def __init__(self, n_workers, spill_dir="records/sessions", default_flow="selection",
+                 threads=64, mock_latency=None, max_sessions=None, max_bytes=None, idle_ttl=None,
+                 rpm=None, tpm=None, auto_advance=False):
+        self._ctx = multiprocessing.get_context("spawn")
+        self.config = {"spill_dir": spill_dir, "default_flow": default_flow, "threads": threads,
+                       "mock_latency": mock_latency, "max_sessions": max_sessions,
+                       "max_bytes": max_bytes, "idle_ttl": idle_ttl, "rpm": rpm, "tpm": tpm,
+                       "auto_advance": auto_advance}
+        self._outbox = self._ctx.Queue()
+        self._lock = threading.Lock()
+        self._futures = {}
+        self._ids = itertools.count()
+        self._workers = {}         # worker_id -> (process, inbox)
+        self._held = None          # list of requests held while the pool is rebalancing
+        self._drained = {}         # worker_id -> threading.Event
+        self._generation = itertools.count()
+        self.metrics = collections.Counter()
+        for _ in range(n_workers):
+            self._spawn(f"w{next(self._generation)}")
+        self._collector = threading.Thread(target=self._collect, name="pool-collector", daemon=True)
+        self._collector.start()
+
+    @property
+    def worker_ids(self):
+        return sorted(self._workers)
+
+    def _spawn(self, worker_id):
+        inbox = self._ctx.Queue()
+        proc = self._ctx.Process(target=_worker_main, args=(worker_id, inbox, self._outbox, self.config),
+                                 name=f"screening-{worker_id}", daemon=True)
+        proc.start()
+        self._workers[worker_id] = (proc, inbox)
+
+    def _collect(self):
+        while True:
+            item = self._outbox.get()
+            if item is None:
+                return
+            req_id, ok, payload = item
+            if req_id is None:
+                self._drained[payload["drained"]].set()
+                continue
+            with self._lock:
+                fut, _ = self._futures.pop(req_id, (None, None))
+            if fut is None:
+                continue
+            if ok:
+                self.metrics[payload["worker"]] += 1
+                fut.set_result(payload)
+            else:
+                fut.set_exception(RuntimeError(payload))
+
+    def submit(self, session_id, text, flow=None):
+        fut = Future()
+        with self._lock:
+            req_id = next(self._ids)
+            self._futures[req_id] = (fut, None)
+            req = (req_id, session_id, text, flow)
+            if self._held is not None:
+                self._held.append(req)
+            else:
+                self._send(req)
+        return fut
+
+    def _send(self, req):
+        worker_id = route(req[1], self._workers)
+        self._futures[req[0]] = (self._futures[req[0]][0], worker_id)
+        self._workers[worker_id][1].put(req)
+
+    def _fail_inflight(self, worker_id):
+        with self._lock:
+            lost = [rid for rid, (_, wid) in self._futures.items() if wid == worker_id]
+            futures = [self._futures.pop(rid)[0] for rid in lost]
+        for fut in futures:
+            fut.set_exception(RuntimeError(f"worker {worker_id} was terminated"))
+
+    # ---------------------------
+    # Drain / restart / resize
+    # ---------------------------
+    def _drain(self, worker_ids, timeout):
+        events = {}
+        for wid in worker_ids:
+            events[wid] = self._drained[wid] = threading.Event()
+            self._workers[wid][1].put(_DRAIN)
+        for wid, event in events.items():
+            if not event.wait(timeout):
+                logger.warning("worker %s did not drain within %ss; terminating", wid, timeout)
+                self._workers[wid][0].terminate()
+                self._fail_inflight(wid)
+            proc, _ = self._workers.pop(wid)
+            proc.join()
+            del self._drained[wid]
+
+    def _rebalance(self, stop, start, timeout):
+        # hold everything while membership changes so per-session order survives the move
+        with self._lock:
+            self._held = []
+        try:
+            self._drain(stop, timeout)
+            for worker_id in start:
+                self._spawn(worker_id)
+        finally:
+            with self._lock:
+                held, self._held = self._held, None
+                for req in held:
+                    self._send(req)
+
+    def restart_worker(self, worker_id, timeout=60):
+        """
+        Drain ``worker_id`` (finish its queue, spill its sessions) and start a
+        fresh process under the same id, so routing does not change.
+        """
+        self._rebalance([worker_id], [worker_id], timeout)
+
+    def check_workers(self, timeout=5):
+        """Restart any worker process that died; its in-flight turns fail."""
+        dead = [wid for wid, (proc, _) in self._workers.items() if not proc.is_alive()]
+        for wid in dead:
+            logger.warning("worker %s died; restarting", wid)
+            self._rebalance([wid], [wid], timeout)
+        return dead
+
+    def resize(self, n_workers, timeout=60):
+        """Change the worker count; every worker drains so no session is resident in two places."""
+        self._rebalance(list(self._workers), [f"w{next(self._generation)}" for _ in range(n_workers)], timeout)
+
+    def close(self, timeout=60):
+        self._drain(list(self._workers), timeout)
+        self._outbox.put(None)
+        self._collector.join()
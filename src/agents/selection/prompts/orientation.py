@@ -0,0 +1,15 @@
+# ORIENTATION is served from fixed text: no LLM call is needed to explain how
+# sessions work, and the volunteer's reply is classified with rules.
+ORIENTATION_TEXT = (
+    "Just to share how it works 😊 Sessions run for about 30–40 minutes. "
+    "You’ll get lesson plans and subject content in advance, coordinator support, and help with tech if needed.\n\n"
+    "Does this feel comfortable for you?"
+)
+
+ORIENTATION_REASK = (
+    "Happy to help — our coordinator will walk you through every detail during orientation.\n\n"
+    "Does this feel comfortable for you?"
+)
+
+# Allowed intents for the reply: OK, NOT_OK, QUERY, STOP
+ORIENTATION_INTENTS = ["OK", "NOT_OK", "QUERY", "STOP"]
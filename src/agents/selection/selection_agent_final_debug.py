@@ -437,7 +437,7 @@ def advance_flow(intent, confidence):
         st.write("done with knowing volunteer")
         st.write("Final Extracted Criteria:")
         st.write(st.session_state.volunteer_profile)
-        return st.session_st
+        return st.session_state
     else:
         # Do NOT advance state
         if st.session_state.question_index >= MAX_QUESTIONS:
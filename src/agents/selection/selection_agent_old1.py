@@ -174,7 +174,7 @@ def advance_flow():
     ):
         st.session_state.state_index += 1
         st.session_state.question_index = 0
-        st.write("question index "+st.session_state.question_index)
+        st.write(f"question index {st.session_state.question_index}")
 
 
 def call_classifier(state_prompt, user_text):
@@ -203,24 +203,14 @@ def call_classifier(state_prompt, user_text):
 
 
 def call_speaker(tone_reply, question):
+    # the question is fixed text and the tone reply already came from the
+    # classifier: join them locally instead of another LLM round trip
     content = ""
     if tone_reply:
         content += tone_reply.strip() + "\n\n"
     if question:
         content += question
-
-    messages = [
-        {"role": "system", "content": MASTER_SYSTEM_PROMPT},
-        {"role": "assistant", "content": content}
-    ]
-
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=messages,
-        temperature=0.4
-    )
-
-    return response.choices[0].message.content
+    return content
 
 
 # ---------------------------------------------------------
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from engine import llm, records, rescore, summaries, tasks
+from engine.flows import scored
+from engine.mock import MockLLM
+
+
+@pytest.fixture(autouse=True)
+def mock_llm():
+    llm.set_backend(MockLLM())
+    yield
+    llm.set_backend(None)
+
+
+def saved_interview(tmp_path):
+    """A scored-flow interview stopped in phase 3, saved to ``tmp_path``."""
+    state = scored.new_state()
+    for phase in (1, 2, 3):
+        scored.step(state, f"I taught maths to children on weekends, phase {phase}.")
+        if phase < 3:
+            scored.next_phase(state)
+    tasks.wait(state.session_id)
+    _, json_path = records.save_state(state, records_dir=str(tmp_path))
+    return state, json_path
+
+
+def assert_rescored(state):
+    for pid in scored.PHASE_SCORE_PROMPTS:
+        if pid <= 3:
+            assert summaries.has_score(state, pid), pid
+        else:
+            assert state.scores[pid]["notes"] == summaries.NOT_REACHED
+
+
+def test_rescore_keeps_reached_phases(tmp_path):
+    saved, json_path = saved_interview(tmp_path)
+    loaded = records.load_state(json_path)
+    assert loaded.phase == 3
+    assert loaded.messages.marks == saved.messages.marks
+    status, state = rescore.rescore_record(json_path)
+    assert status == "rescored"
+    assert_rescored(state)
+    assert_rescored(records.load_state(json_path))
+
+
+def test_rescore_record_without_phase(tmp_path):
+    # records written before the phase and marks were saved
+    _, json_path = saved_interview(tmp_path)
+    with open(json_path, encoding="utf-8") as f:
+        data = json.load(f)
+    del data["phase"], data["message_marks"]
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    assert records.load_state(json_path).phase == 3
+    assert_rescored(rescore.rescore_record(json_path)[1])
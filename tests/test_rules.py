@@ -0,0 +1,39 @@
+import pytest
+
+from engine import rules
+
+
+@pytest.mark.parametrize("text", [
+    "I do not think so",
+    "I am not available",
+    "I am unable",
+    "I am not able to commit",
+    "I do not have any questions",
+])
+def test_negation_after_pronoun(text):
+    assert rules.classify(text)[0] == "NEGATE"
+
+
+@pytest.mark.parametrize("text", ["exit strategy", "I will leave it to you", "What if I cancel a class?"])
+def test_stop_words_inside_a_sentence(text):
+    assert rules.classify(text)[0] != "STOP"
+
+
+@pytest.mark.parametrize("text, intent", [
+    ("I do.", "AFFIRM"),
+    ("Yes, I am", "AFFIRM"),
+    ("stop", "STOP"),
+    ("no, stop", "STOP"),
+    ("Please stop messaging me", "STOP"),
+    ("koi baat nahi", "AFFIRM"),
+    ("no problem", "AFFIRM"),
+    ("I am not sure", "AMBIGUOUS"),
+    ("pata nahi", "AMBIGUOUS"),
+])
+def test_phrases(text, intent):
+    assert rules.classify(text)[0] == intent
+
+
+def test_overlapping_phrases():
+    assert rules.MATCHER.matches("I am not able to commit") == ["i am not", "not able"]
+    assert rules.MATCHER.matches("koi baat nahi") == ["koi baat nahi"]
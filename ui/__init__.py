@@ -0,0 +1,6 @@
+"""
+Shared Streamlit pieces for the screening apps.
+
+Unlike ``engine`` this package does import Streamlit; the apps use it to
+render the chat transcript incrementally.
+"""
@@ -0,0 +1,37 @@
+# ---------------------------
+# Append-only chat transcript
+# ---------------------------
+# ``st.chat_message`` in a loop re-sends every bubble on every rerun, so each
+# turn costs more than the one before. ``transcript`` is a small static
+# component instead: the browser keeps the bubbles it already has and each
+# run sends only the messages after the last one delivered. Apps render it
+# inside an ``st.fragment`` with the chat input, so a volunteer reply reruns
+# just the chat; the sidebar and controls rerun only when they change.
+from pathlib import Path
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+_component = components.declare_component("transcript", path=str(Path(__file__).parent / "frontend"))
+
+
+def transcript(messages, key="transcript", height=560):
+    """
+    Render ``messages`` ({"role", "content"} dicts, oldest first), sending
+    only those the browser doesn't have yet. If the frame was re-created
+    (it reports how many messages it holds), the missing tail is re-sent.
+    """
+    cursor_key, handled_key = f"{key}__cursor", f"{key}__resync"
+    cursor = min(st.session_state.get(cursor_key, 0), len(messages))
+    new = [{"role": m["role"], "content": m["content"]} for m in messages[cursor:]]
+    resync = _component(start=cursor, messages=new, height=height, key=key, default=None)
+    st.session_state[cursor_key] = len(messages)
+    if resync and resync.get("id") != st.session_state.get(handled_key):
+        st.session_state[handled_key] = resync["id"]
+        st.session_state[cursor_key] = resync["have"]
+        st.rerun(scope="fragment")
+
+
+def reset(key="transcript"):
+    """Forget what was delivered (e.g. when the conversation is replaced)."""
+    st.session_state.pop(f"{key}__cursor", None)
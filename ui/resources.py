@@ -0,0 +1,44 @@
+# ---------------------------
+# Per-process resources for the Streamlit apps
+# ---------------------------
+# Streamlit re-executes the app script on every rerun of every session, so
+# anything done at the top of it (reading .env, st.secrets, building a
+# client) is repeated per interaction. ``setup`` does that work once per
+# process through ``st.cache_resource``; engine modules (prompts, compiled
+# FSM, FAQ matrix) are already built once per process on first use.
+import os
+
+import streamlit as st
+
+
+def secret(name, default=None):
+    """``st.secrets[name]``, falling back to the environment when there is no secrets file."""
+    try:
+        return st.secrets[name]
+    except Exception:
+        # KeyError, or no/invalid secrets.toml (FileNotFoundError / StreamlitSecretNotFoundError)
+        return os.getenv(name, default)
+
+
+@st.cache_resource
+def setup():
+    """Load .env and configure the engine's LLM client; runs once per process."""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        pass
+    else:
+        load_dotenv()
+    from engine import llm
+    api_key = secret("OPENAI_API_KEY")
+    if api_key:
+        llm.configure(api_key=api_key)
+    return llm
+
+
+@st.cache_resource
+def openai_client(base_url, api_key_name="OPENAI_API_KEY"):
+    """One OpenAI client per process for the apps that call the API directly."""
+    setup()
+    from openai import OpenAI
+    return OpenAI(base_url=base_url, api_key=secret(api_key_name))